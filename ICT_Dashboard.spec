@@ -1,4 +1,6 @@
 # -*- mode: python ; coding: utf-8 -*-
+import os
+
 from PyInstaller.utils.hooks import collect_all
 
 datas = [('C:\\Users\\gagan\\Desktop\\ICT_Dashboard\\static', 'static'), ('C:\\Users\\gagan\\Desktop\\ICT_Dashboard\\config.py', '.'), ('C:\\Users\\gagan\\Desktop\\ICT_Dashboard\\data_feed.py', '.'), ('C:\\Users\\gagan\\Desktop\\ICT_Dashboard\\ict_engine.py', '.')]
@@ -11,7 +13,7 @@ datas += tmp_ret[0]; binaries += tmp_ret[1]; hiddenimports += tmp_ret[2]
 
 
 a = Analysis(
-    ['C:\\Users\\gagan\\Desktop\\ICT_Dashboard\\app.py'],
+    ['C:\\Users\\gagan\\Desktop\\ICT_Dashboard\\desktop.py'],
     pathex=[],
     binaries=binaries,
     datas=datas,
@@ -25,12 +27,16 @@ a = Analysis(
 )
 pyz = PYZ(a.pure)
 
+# ICT_IMPORTTIME=1 builds a bundle that prints -X importtime to stderr
+# (read by benchmarks/bench_startup.py --frozen)
+options = [('X importtime', None, 'OPTION')] if os.environ.get('ICT_IMPORTTIME') else []
+
 exe = EXE(
     pyz,
     a.scripts,
     a.binaries,
     a.datas,
-    [],
+    options,
     name='ICT_Dashboard',
     debug=False,
     bootloader_ignore_signals=False,
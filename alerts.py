@@ -0,0 +1,269 @@
+"""Level alerts: crossings and approaches from each new bar's high-low range.
+
+``AlertEngine`` keeps each symbol's active levels — previous day/week
+levels, key opens, session highs/lows and OTE fibs, as last computed by the
+engine — in one sorted array, rebuilt only when a level changes. Each new
+(or revised) bar is checked with two binary searches over its range widened
+by ``PROXIMITY_PCT``: O(log n + k) for k levels hit, however many levels a
+symbol has. A level inside the bar's range is a ``cross`` (direction from
+the previous close), one within ``PROXIMITY_PCT`` of it an ``approach``.
+
+The same level alerts again only after ``ALERT_COOLDOWN`` seconds of bar
+time (an approach also stays quiet after a cross), and each symbol has a
+token bucket of ``ALERT_BURST`` alerts refilled at ``ALERT_RATE`` a minute.
+Alerts get increasing ids, are appended to ``ALERT_LOG`` as JSON lines and
+the last ``ALERT_HISTORY`` are kept for ``/alerts``.
+"""
+
+import logging
+from collections import deque
+from pathlib import Path
+
+import numpy as np
+
+from bar_buffer import EMPTY, Bars, as_bars
+from config import (
+    ALERT_BURST,
+    ALERT_COOLDOWN,
+    ALERT_HISTORY,
+    ALERT_LOG,
+    ALERT_RATE,
+    OTE_TIMEFRAMES,
+    PROXIMITY_PCT,
+)
+from schema import Alert, TickerMetrics
+from serialization import dumps, encode, loads
+from subscriptions import Subscription
+
+logger = logging.getLogger(__name__)
+
+_NS = 10**9
+Level = tuple[float, str, str]      # (price, label, section)
+
+
+def ticker_levels(metrics: TickerMetrics) -> list[Level]:
+    """The alertable levels in one ticker's payload (whatever sections it has)."""
+    out: dict[str, Level] = {}
+    for key, lv in metrics.get("levels", {}).items():
+        if lv["value"] is not None:
+            out[key.upper()] = (lv["value"], key.upper(), "levels")
+    for ko in metrics.get("key_opens", []):
+        if ko["price"] is not None:
+            out[ko["label"]] = (ko["price"], ko["label"], "key_opens")
+    for sweep in metrics.get("liquidity", []):
+        if sweep["level"] is not None:
+            out.setdefault(sweep["label"], (sweep["level"], sweep["label"], "liquidity"))
+    otes = {OTE_TIMEFRAMES[0]: metrics.get("ote", {}), **metrics.get("ote_htf", {})}
+    for tf, ote in otes.items():
+        for fib, lv in ote.get("levels", {}).items() if ote.get("available") else ():
+            label = f"OTE {tf} {fib}"
+            out[label] = (lv["price"], label, "ote")
+    return list(out.values())
+
+
+class LevelIndex:
+    """One symbol's levels sorted by price, with the bar time each appeared at."""
+
+    __slots__ = ("prices", "labels", "sections", "born")
+
+    def __init__(self, levels: list[Level], born: list[int] | None = None):
+        order = sorted(range(len(levels)), key=lambda i: levels[i])
+        self.prices = np.array([levels[i][0] for i in order], dtype=np.float64)
+        self.labels = [levels[i][1] for i in order]
+        self.sections = [levels[i][2] for i in order]
+        self.born = [born[i] for i in order] if born is not None else [-1] * len(levels)
+
+    def __len__(self) -> int:
+        return len(self.prices)
+
+    def around(self, low: float, high: float, pct: float = PROXIMITY_PCT) -> range:
+        """Positions of levels inside ``[low, high]`` or within *pct* of it."""
+        i = int(self.prices.searchsorted(low / (1 + pct), "left"))
+        j = int(self.prices.searchsorted(high / (1 - pct), "right"))
+        return range(i, j)
+
+
+class AlertBatch:
+    """Alerts raised by one compute, encoded once per subscription and format."""
+
+    __slots__ = ("alerts", "_messages")
+
+    def __init__(self, alerts: list[Alert]):
+        self.alerts = alerts
+        self._messages: dict[tuple[Subscription, str], str | bytes | None] = {}
+
+    def message(self, sub: Subscription, fmt: str = "json") -> str | bytes | None:
+        """``{"type": "alert", "alerts": [...]}`` for *sub*, or ``None`` if none concern it."""
+        key = (sub, fmt)
+        if key not in self._messages:
+            mine = [a for a in self.alerts if a["symbol"] in sub.symbols and a["section"] in sub.sections]
+            msg = encode({"type": "alert", "alerts": mine}, fmt) if mine else None
+            self._messages[key] = msg.decode() if msg is not None and fmt == "json" else msg
+        return self._messages[key]
+
+
+class AlertEngine:
+
+    def __init__(
+        self,
+        cooldown: float = ALERT_COOLDOWN,
+        rate: float = ALERT_RATE,
+        burst: int = ALERT_BURST,
+        log: str | Path | None = ALERT_LOG or None,
+        history: int = ALERT_HISTORY,
+    ):
+        self.cooldown_ns = int(cooldown * _NS)
+        self.rate = rate
+        self.burst = burst
+        self.log = Path(log).expanduser() if log else None
+        self.history: deque[Alert] = deque(maxlen=history)
+        self.suppressed = 0      # repeats within the cooldown
+        self.limited = 0         # over a symbol's rate limit
+        self._index: dict[str, LevelIndex] = {}
+        self._levels: dict[str, list[Level]] = {}
+        self._last: dict[str, tuple[int, float, float]] = {}   # last checked bar: ts, low, high
+        # (symbol, label, price) → bar ts of the last cross / alert of any kind
+        self._crossed: dict[tuple[str, str, float], int] = {}
+        self._alerted: dict[tuple[str, str, float], int] = {}
+        self._tokens: dict[str, tuple[float, int]] = {}
+        self._next_id = self._last_logged_id() + 1
+
+    # ── levels ───────────────────────────────────────────────────────
+    def set_levels(self, symbol: str, levels: list[Level], as_of: int = -1) -> None:
+        """Replace *symbol*'s levels (re-sorted only if they changed).
+
+        Levels new since the last call only alert on bars after *as_of* (epoch
+        ns): a level set by the current bar — a key open, a forming session
+        high — does not cross itself.
+        """
+        if self._levels.get(symbol) == levels:
+            return
+        old = self._index.get(symbol)
+        known = dict(zip(zip(old.labels, old.prices.tolist()), old.born)) if old is not None else {}
+        born = [known.get((label, price), as_of) for price, label, _ in levels]
+        self._levels[symbol] = levels
+        self._index[symbol] = LevelIndex(levels, born)
+        live = {(symbol, label, price) for price, label, _ in levels}
+        for seen in (self._crossed, self._alerted):
+            for key in [k for k in seen if k[0] == symbol and k not in live]:
+                del seen[key]
+
+    def levels(self, symbol: str) -> LevelIndex | None:
+        return self._index.get(symbol)
+
+    # ── checking ─────────────────────────────────────────────────────
+    def check(self, symbol: str, bars: Bars) -> list[Alert]:
+        """Alerts from the bars of *symbol* not checked yet (the last checked one again if revised).
+
+        The first call for a symbol only checks its newest bar.
+        """
+        index = self._index.get(symbol)
+        if bars.empty:
+            return []
+        last = self._last.get(symbol)
+        if last is None:
+            start = len(bars) - 1
+        else:
+            start = int(bars.ts.searchsorted(last[0]))
+            # skip the last checked bar unless a refetch or new tick widened it
+            if start < len(bars) and int(bars.ts[start]) == last[0] \
+                    and (float(bars.low[start]), float(bars.high[start])) == last[1:]:
+                start += 1
+        self._last[symbol] = (int(bars.ts[-1]), float(bars.low[-1]), float(bars.high[-1]))
+        if index is None or not len(index):
+            return []
+        out: list[Alert] = []
+        for b in range(max(start, 0), len(bars)):
+            low, high, close = float(bars.low[b]), float(bars.high[b]), float(bars.close[b])
+            prev = float(bars.close[b - 1]) if b else float(bars.open[b])
+            ts = int(bars.ts[b])
+            for k in index.around(low, high):
+                if index.born[k] >= ts:
+                    continue
+                level = float(index.prices[k])
+                if low <= level <= high:
+                    kind = "cross"
+                    up = prev < level or (prev == level and close >= level)
+                else:
+                    kind = "approach"
+                    up = level > high
+                    if not (min(abs(low - level), abs(high - level)) <= PROXIMITY_PCT * abs(level)):
+                        continue
+                if self._admit(symbol, index.labels[k], level, kind, ts):
+                    out.append({
+                        "id": self._next_id,
+                        "ts": ts // 10**6,
+                        "symbol": symbol,
+                        "kind": kind,
+                        "direction": "up" if up else "down",
+                        "label": index.labels[k],
+                        "section": index.sections[k],
+                        "level": level,
+                        "price": close,
+                    })
+                    self._next_id += 1
+        return out
+
+    def _admit(self, symbol: str, label: str, level: float, kind: str, ts: int) -> bool:
+        """Dedupe and rate-limit one would-be alert."""
+        key = (symbol, label, level)
+        recent = self._crossed if kind == "cross" else self._alerted
+        if ts - recent.get(key, -self.cooldown_ns) < self.cooldown_ns:
+            self.suppressed += 1
+            return False
+        tokens, at = self._tokens.get(symbol, (float(self.burst), ts))
+        tokens = min(float(self.burst), tokens + (ts - at) / (60 * _NS) * self.rate)
+        if tokens < 1:
+            self._tokens[symbol] = (tokens, ts)
+            self.limited += 1
+            return False
+        self._tokens[symbol] = (tokens - 1, ts)
+        self._alerted[key] = ts
+        if kind == "cross":
+            self._crossed[key] = ts
+        return True
+
+    def run(self, intraday: dict, metrics: dict) -> AlertBatch | None:
+        """Refresh levels from *metrics*, check each ticker's new bars, log and keep the alerts."""
+        alerts: list[Alert] = []
+        for symbol, payload in metrics["tickers"].items():
+            bars = as_bars(intraday.get(symbol, EMPTY))
+            self.set_levels(symbol, ticker_levels(payload), int(bars.ts[-1]) if not bars.empty else -1)
+            alerts += self.check(symbol, bars)
+        if not alerts:
+            return None
+        self.history.extend(alerts)
+        self._append(alerts)
+        return AlertBatch(alerts)
+
+    def since(self, alert_id: int = 0) -> list[Alert]:
+        """Kept alerts newer than *alert_id*."""
+        # copied in one step: ``run`` extends the history from a worker thread
+        return [a for a in list(self.history) if a["id"] > alert_id]
+
+    # ── log ──────────────────────────────────────────────────────────
+    def _append(self, alerts: list[Alert]) -> None:
+        if self.log is None:
+            return
+        try:
+            self.log.parent.mkdir(parents=True, exist_ok=True)
+            with self.log.open("ab") as f:
+                f.write(b"".join(dumps(a) + b"\n" for a in alerts))
+        except OSError as e:
+            logger.warning("Could not append to alert log %s: %s", self.log, e)
+
+    def _last_logged_id(self) -> int:
+        """Highest id in the log, so ids keep increasing across restarts."""
+        if self.log is None:
+            return 0
+        try:
+            with self.log.open("rb") as f:
+                f.seek(0, 2)
+                f.seek(max(0, f.tell() - 4096))
+                tail = f.read().splitlines()
+            return int(loads(tail[-1])["id"]) if tail else 0
+        except FileNotFoundError:
+            return 0
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning("Could not read the last id from alert log %s: %s", self.log, e)
+            return 0
@@ -1,18 +1,44 @@
-"""ICT Trading Dashboard — FastAPI application."""
+"""ICT Trading Dashboard — FastAPI application.
+
+Only what serving needs is imported up front. The data feed and engine
+(pandas, yfinance, …) are imported on the first refresh, off the event
+loop, while clients are already being served the cached snapshot.
+"""
 
 import asyncio
 import json
 import logging
+import threading
+import time
 from contextlib import asynccontextmanager
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
-from fastapi.responses import FileResponse
+from fastapi import FastAPI, Request, Response, WebSocket, WebSocketDisconnect
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 
-from config import POLL_INTERVAL
-from data_feed import DataFeed
-from ict_engine import ICTEngine
+from config import (
+    ALERTS,
+    ENGINE_WORKERS,
+    FEED_MODE,
+    POLL_INTERVAL,
+    PROFILE_DUMP,
+    PROFILE_SAMPLING,
+    SNAPSHOT_CACHE,
+    STREAM_SIM_RATE,
+    STREAMING_ENGINE,
+)
+from fanout import Fanout, background
+from schema import Metrics
+from serialization import FORMATS
+from snapshot import SnapshotStore
+from subscriptions import Subscription
+from telemetry import REGISTRY, SamplingProfiler
+
+if TYPE_CHECKING:
+    from stream_feed import StreamingFeed
 
 logging.basicConfig(
     level=logging.INFO,
@@ -26,31 +52,136 @@ if getattr(sys, "frozen", False):
     BASE = Path(sys._MEIPASS)
 else:
     BASE = Path(__file__).parent
-feed = DataFeed()
-engine = ICTEngine()
-clients: set[WebSocket] = set()
+stream: "StreamingFeed | None" = None  # set in stream mode
+fanout = Fanout()
+profiler = SamplingProfiler() if PROFILE_SAMPLING else None
+
+
+# ── pipeline (deferred) ──────────────────────────────────────────────
+# ``feed``, ``engine``, ``alert_engine`` and ``history`` become module
+# globals once loaded; reading them as ``app.feed`` etc. from outside loads
+# them on demand.
+_pipeline_lock = threading.Lock()
+_PIPELINE = ("feed", "engine", "alert_engine", "history")
+
+
+def _load_pipeline() -> None:
+    """Import and build the data feed, engines and history store (idempotent, thread-safe)."""
+    global feed, engine, alert_engine, history
+    with _pipeline_lock:
+        if "engine" in globals():
+            return
+        with REGISTRY.time("ict_stage_seconds", stage="import"):
+            from alerts import AlertEngine
+            from data_feed import DataFeed
+            from history import HistoryStore
+            from ict_engine import ICTEngine
+            from ict_stream import StreamingICTEngine
+            from memo import METHODS
+            if ENGINE_WORKERS:
+                from engine_pool import EnginePool
+        alert_engine = AlertEngine() if ALERTS else None
+        history = HistoryStore()
+        feed = DataFeed()
+        if ENGINE_WORKERS:
+            engine = EnginePool()
+        else:
+            engine = StreamingICTEngine() if STREAMING_ENGINE else ICTEngine()
+        for method in METHODS:
+            REGISTRY.gauge("ict_engine_memo_hits", lambda m=method: engine.memo.hits[m], method=method)
+            REGISTRY.gauge("ict_engine_memo_misses", lambda m=method: engine.memo.misses[m], method=method)
+
+
+def __getattr__(name: str):
+    if name in _PIPELINE:
+        _load_pipeline()
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# Held by a refresh from its fetch through ``history.update``, and by a
+# /history top-up: in poll mode both append to the feed's intraday buffers,
+# which the engine and the history store read as views.
+_intraday_lock = asyncio.Lock()
+
+
+async def _compute_metrics() -> Metrics:
+    """Fetch and compute what connected clients subscribe to, and nothing else."""
+    if "engine" not in globals():
+        await asyncio.to_thread(_load_pipeline)
+    async with _intraday_lock:
+        demand = fanout.demand()
+        if stream is not None:
+            data = await stream.fetch_all(demand.symbols)
+            # the aggregator keeps writing ticks into its buffers while the engine runs
+            data["intraday"] = {t: bars.copy() for t, bars in data["intraday"].items()}
+            metrics = await _run_engine(data, demand, stream.now())
+        else:
+            with REGISTRY.time("ict_stage_seconds", stage="fetch"):
+                data = await asyncio.to_thread(feed.fetch_all, demand.symbols)
+            metrics = await _run_engine(data, demand)
+        if alert_engine is not None:
+            with REGISTRY.time("ict_stage_seconds", stage="alerts"):
+                batch = await asyncio.to_thread(alert_engine.run, data["intraday"], metrics)
+            if batch is not None:
+                fanout.alert(batch)
+        with REGISTRY.time("ict_stage_seconds", stage="history"):
+            await asyncio.to_thread(history.update, data["intraday"])
+        _history_fetched.update(dict.fromkeys(data["intraday"], time.monotonic()))
+        return metrics
+
+
+async def _run_engine(data: dict, demand: Subscription, now=None) -> Metrics:
+    """Compute off the event loop: on the engine workers, or in a thread."""
+    with REGISTRY.time("ict_stage_seconds", stage="compute"):
+        if ENGINE_WORKERS:
+            return await engine.compute(data, now, demand.symbols, demand.sections)
+        return await asyncio.to_thread(engine.compute, data, now, demand.symbols, demand.sections)
+
+
+snapshots = SnapshotStore(_compute_metrics, SNAPSHOT_CACHE or None)
+REGISTRY.gauge("ict_clients", lambda: len(fanout), "Connected WebSocket clients.")
+REGISTRY.gauge("ict_clients_evicted", lambda: fanout.evicted, "Clients evicted for lagging.")
+REGISTRY.gauge("ict_alerts_suppressed", lambda: alert_engine.suppressed if globals().get("alert_engine") else 0,
+               "Alerts dropped as repeats within ALERT_COOLDOWN.")
+REGISTRY.gauge("ict_alerts_rate_limited", lambda: alert_engine.limited if globals().get("alert_engine") else 0,
+               "Alerts dropped by the per-symbol rate limit.")
+REGISTRY.describe("ict_engine_memo_hits", "Engine sub-results served from the memo, per method.")
+REGISTRY.describe("ict_engine_memo_misses", "Engine sub-results computed (memo misses), per method.")
+REGISTRY.gauge("ict_snapshot_version", lambda: snapshots.latest.version if snapshots.latest else 0,
+               "Version of the latest published snapshot.")
 
 
 # ── background broadcaster ───────────────────────────────────────────
+async def _catch_up(sub: Subscription) -> None:
+    """Refresh now, rather than on the next poll, if the latest snapshot lacks part of *sub*."""
+    try:
+        for _ in range(2):  # a refresh already in flight may predate *sub*
+            snap = snapshots.latest
+            if snap is not None and not snap.metrics.get("stale") and sub.provided_by(snap.metrics):
+                return
+            fanout.broadcast(await snapshots.refresh())
+    except Exception:
+        logger.exception("Error refreshing for a new subscription")
+
+
 async def broadcast_loop():
     """Poll data and push to all connected WebSocket clients."""
+    await asyncio.to_thread(_load_pipeline)
     while True:
+        if not len(fanout):
+            # nothing to compute for; a connecting client triggers a refresh
+            await asyncio.sleep(POLL_INTERVAL)
+            continue
         try:
-            data = await asyncio.to_thread(feed.fetch_all)
-            metrics = engine.compute(data)
-            payload = json.dumps(metrics)
-
-            dead: set[WebSocket] = set()
-            for ws in clients:
-                try:
-                    await ws.send_text(payload)
-                except Exception:
-                    dead.add(ws)
-            clients.difference_update(dead)
+            snap = await snapshots.refresh()
+            metrics = snap.metrics
+
+            fanout.broadcast(snap)
 
             logger.info(
                 "Broadcast to %d client(s)  NQ=%s  ES=%s",
-                len(clients),
+                len(fanout),
                 metrics["tickers"].get("NQ=F", {}).get("price"),
                 metrics["tickers"].get("ES=F", {}).get("price"),
             )
@@ -60,10 +191,37 @@ async def broadcast_loop():
         await asyncio.sleep(POLL_INTERVAL)
 
 
+async def stream_loop():
+    """Consume pushed ticks; recompute and push on bar close or throttled ticks."""
+    global stream
+    await asyncio.to_thread(_load_pipeline)
+    from stream_feed import SimulatedTickSource, StreamingFeed
+
+    intraday = await asyncio.to_thread(feed.fetch_intraday)
+    source = SimulatedTickSource(
+        {t: float(bars.close[-1]) for t, bars in intraday.items()}, rate=STREAM_SIM_RATE
+    )
+    stream = StreamingFeed(source, poll_feed=feed)
+    stream.seed(intraday)
+    consumer = asyncio.create_task(stream.run())
+    try:
+        async for _ in stream.updates():
+            if not len(fanout):
+                continue
+            try:
+                fanout.broadcast(await snapshots.refresh())
+            except Exception:
+                logger.exception("Error in stream loop")
+    finally:
+        consumer.cancel()
+
+
 # ── lifespan ─────────────────────────────────────────────────────────
 @asynccontextmanager
 async def lifespan(_app: FastAPI):
-    task = asyncio.create_task(broadcast_loop())
+    if profiler is not None:
+        profiler.start()
+    task = asyncio.create_task(stream_loop() if FEED_MODE == "stream" else broadcast_loop())
     logger.info("Dashboard running at http://localhost:8000")
     yield
     task.cancel()
@@ -71,9 +229,21 @@ async def lifespan(_app: FastAPI):
         await task
     except asyncio.CancelledError:
         pass
+    await fanout.close_all()
+    snapshots.save()
+    if "history" in globals():
+        history.save()
+    if "feed" in globals():
+        feed.save()
+    if ENGINE_WORKERS and "engine" in globals():
+        engine.close()
+    if profiler is not None:
+        profiler.stop()
+        profiler.dump(PROFILE_DUMP)
 
 
 app = FastAPI(title="ICT Dashboard", lifespan=lifespan)
+app.add_middleware(GZipMiddleware, minimum_size=1024)
 
 
 # ── routes ───────────────────────────────────────────────────────────
@@ -82,72 +252,156 @@ async def index():
     return FileResponse(BASE / "static" / "index.html")
 
 
+@app.get("/clients")
+async def client_stats():
+    """Per-client queue depth, lag and delivery counters."""
+    return fanout.stats()
+
+
+@app.get("/alerts")
+async def recent_alerts(since: int = 0):
+    """Alerts with an id above *since*, oldest first (the last ``ALERT_HISTORY``)."""
+    if globals().get("alert_engine") is None:
+        return []
+    return alert_engine.since(since)
+
+
+# symbol → when /history last got its new bars (monotonic seconds)
+_history_fetched: dict[str, float] = {}
+
+
+def _history_due(symbol: str) -> bool:
+    return time.monotonic() - _history_fetched.get(symbol, float("-inf")) >= POLL_INTERVAL
+
+
+async def _top_up_history(symbol: str) -> None:
+    """Bring *symbol*'s history up to date unless a fetch did within ``POLL_INTERVAL``.
+
+    Refreshes only fetch what WebSocket clients subscribe to, so a symbol
+    only REST clients ask for is fetched here, on query.
+    """
+    if symbol not in history.tickers or not _history_due(symbol):
+        return
+    async with _intraday_lock:
+        if not _history_due(symbol):
+            return      # fetched by a refresh or another top-up while we waited
+        _history_fetched[symbol] = time.monotonic()     # a failed fetch waits for the next interval too
+        try:
+            if stream is not None:
+                intraday = {symbol: stream.aggregator.bars(symbol).copy()}
+            else:
+                intraday = await asyncio.to_thread(feed.fetch_intraday, [symbol])
+            with REGISTRY.time("ict_stage_seconds", stage="history"):
+                await asyncio.to_thread(history.update, intraday)
+        except Exception:
+            logger.exception("Error topping up history for %s", symbol)
+
+
+async def _history_response(request: Request, query: str, symbol: str, **params) -> Response:
+    """Run a ``HistoryStore`` query off the loop; 304 if the client's ETag is current."""
+    if "history" not in globals():
+        await asyncio.to_thread(_load_pipeline)
+    await _top_up_history(symbol)
+    try:
+        result = await asyncio.to_thread(
+            getattr(history, query), symbol, **params, if_none_match=request.headers.get("if-none-match")
+        )
+    except KeyError as e:
+        return JSONResponse({"error": e.args[0]}, status_code=404)
+    except ValueError as e:
+        return JSONResponse({"error": str(e)}, status_code=400)
+    headers = {"ETag": result.etag, "Cache-Control": "no-cache"}
+    if result.body is None:
+        return Response(status_code=304, headers=headers)
+    return StreamingResponse(result.body, media_type="application/json", headers=headers)
+
+
+@app.get("/history/bars")
+async def history_bars(
+    request: Request,
+    symbol: str,
+    interval: str = "1m",
+    start: str | None = None,
+    end: str | None = None,
+    points: int | None = None,
+    method: str = "minmax",
+):
+    """Bars in ``[start, end)`` (epoch ms or ISO 8601) at *interval*, downsampled to *points*."""
+    return await _history_response(
+        request, "bars", symbol, interval=interval, start=start, end=end, points=points, method=method
+    )
+
+
+@app.get("/history/levels")
+async def history_levels(request: Request, symbol: str, start: str | None = None, end: str | None = None):
+    """Per trade date in ``[start, end)``: previous day/week levels, session highs/lows and key opens."""
+    return await _history_response(request, "levels", symbol, start=start, end=end)
+
+
+@app.get("/metrics")
+async def prometheus_metrics():
+    """Per-stage latency summaries (p50/p95/p99) in Prometheus text format."""
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/debug/profile")
+async def profile_dump():
+    """Collapsed stacks from the sampling profiler (``PROFILE_SAMPLING``)."""
+    if profiler is None:
+        return PlainTextResponse("Sampling profiler is off (set PROFILE_SAMPLING in config.py)\n", status_code=404)
+    return PlainTextResponse(profiler.collapsed())
+
+
 app.mount("/static", StaticFiles(directory=BASE / "static"), name="static")
 
 
 @app.websocket("/ws")
 async def ws_endpoint(websocket: WebSocket):
     await websocket.accept()
-    clients.add(websocket)
-    logger.info("Client connected  (%d total)", len(clients))
+    fmt = websocket.query_params.get("format", "json")
+    if fmt not in FORMATS:
+        logger.warning("Client asked for format %r; sending JSON (available: %s)", fmt, ", ".join(FORMATS))
+        fmt = "json"
+    params = websocket.query_params
+    subscription = Subscription.parse(
+        params["symbols"].split(",") if "symbols" in params else None,
+        params["sections"].split(",") if "sections" in params else None,
+    )
+    client = fanout.add(websocket, params.get("mode") == "delta", fmt, subscription)
+    logger.info("Client connected  (%d total, %s)", len(fanout), fmt)
     try:
-        # Send initial data immediately
+        # Send the latest snapshot immediately
         try:
-            data = await asyncio.to_thread(feed.fetch_all)
-            metrics = engine.compute(data)
-            await websocket.send_text(json.dumps(metrics))
+            client.offer(await snapshots.get())
         except Exception:
             logger.exception("Error sending initial data")
+        background(_catch_up(subscription), "Refresh for a new subscription")
 
         while True:
-            await websocket.receive_text()  # keep-alive
+            text = await websocket.receive_text()  # keep-alive or control message
+            try:
+                request = json.loads(text)
+            except ValueError:
+                continue
+            if not isinstance(request, dict):
+                continue
+            kind = request.get("type")
+            if kind == "resync" and snapshots.latest:
+                client.offer(snapshots.latest, resync=True)
+            elif kind in ("subscribe", "unsubscribe"):
+                client.subscribe(client.subscription.apply(request))
+                if snapshots.latest:
+                    client.offer(snapshots.latest, resync=True)
+                background(_catch_up(client.subscription), "Refresh for a new subscription")
     except WebSocketDisconnect:
         pass
     finally:
-        clients.discard(websocket)
-        logger.info("Client disconnected  (%d total)", len(clients))
+        await fanout.remove(websocket)
+        logger.info("Client disconnected  (%d total)", len(fanout))
 
 
 # ── main ─────────────────────────────────────────────────────────────
-def _start_server():
-    """Run uvicorn in a background thread."""
-    import uvicorn
-    uvicorn.run(app, host="127.0.0.1", port=8000, log_level="info")
-
-
-def _wait_for_server(url="http://127.0.0.1:8000", timeout=30):
-    """Block until the server responds or timeout."""
-    import time
-    import urllib.request
-    import urllib.error
-
-    start = time.time()
-    while time.time() - start < timeout:
-        try:
-            urllib.request.urlopen(url, timeout=2)
-            return True
-        except (urllib.error.URLError, ConnectionError, OSError):
-            time.sleep(0.5)
-    return False
-
-
 if __name__ == "__main__":
-    import threading
-
-    # Start FastAPI server in a daemon thread
-    server_thread = threading.Thread(target=_start_server, daemon=True)
-    server_thread.start()
-
-    # Wait until server is actually responding
-    _wait_for_server()
-
-    # Open native desktop window
-    import webview  # pywebview
-    webview.create_window(
-        "ICT Dashboard \u2014 NQ & ES",
-        "http://127.0.0.1:8000",
-        width=1400,
-        height=900,
-        min_size=(900, 600),
-    )
-    webview.start()  # blocks until window is closed
+    import desktop
+
+    desktop.main(app)
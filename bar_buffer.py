@@ -0,0 +1,166 @@
+"""Fixed-capacity per-symbol bar storage with zero-copy NumPy views.
+
+``BarBuffer`` keeps int64 epoch-ns timestamps and float64 OHLCV columns in
+a ring. Every row is written twice, at ``i`` and ``i + capacity``, so the
+newest ``len`` rows are always one contiguous slice: appending is O(1),
+the oldest row is evicted automatically once full, and ``view()`` hands
+the engine plain array slices without copying anything.
+"""
+
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+COLUMNS = ("Open", "High", "Low", "Close", "Volume")
+
+
+class Bars(NamedTuple):
+    """Columnar 1-min bars; ``ts`` is epoch ns (UTC), prices are float64."""
+    ts: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+    @property
+    def empty(self) -> bool:
+        return len(self.ts) == 0
+
+    def copy(self, start: int = 0) -> "Bars":
+        """Owned copies of rows *start* on (detached from any ring buffer)."""
+        return Bars(*(a[start:].copy() for a in self))
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "Bars":
+        """Column views of a DatetimeIndex-ed OHLC(V) frame (no copy for float64 columns)."""
+        if df.empty:
+            return EMPTY
+        n = len(df)
+        vol = df["Volume"].to_numpy(dtype=np.float64) if "Volume" in df else np.zeros(n)
+        return cls(
+            df.index.as_unit("ns").asi8,
+            df["Open"].to_numpy(dtype=np.float64),
+            df["High"].to_numpy(dtype=np.float64),
+            df["Low"].to_numpy(dtype=np.float64),
+            df["Close"].to_numpy(dtype=np.float64),
+            vol,
+        )
+
+    def frame(self, tz=None) -> pd.DataFrame:
+        """Materialize as a DataFrame (copies); index in *tz* if given."""
+        idx = pd.to_datetime(self.ts, utc=True)
+        if tz is not None:
+            idx = idx.tz_convert(tz)
+        return pd.DataFrame(dict(zip(COLUMNS, self[1:])), index=idx)
+
+
+EMPTY = Bars(np.empty(0, np.int64), *(np.empty(0) for _ in COLUMNS))
+
+
+def as_bars(data) -> Bars:
+    """Accept a ``Bars``, ``BarBuffer`` or DataFrame and return ``Bars``."""
+    if isinstance(data, Bars):
+        return data
+    if isinstance(data, BarBuffer):
+        return data.view()
+    return Bars.from_frame(data)
+
+
+class BarBuffer:
+    """Ring of the newest *capacity* bars for one symbol.
+
+    Rows must arrive in time order. A row with the same timestamp as the
+    newest one replaces it (a forming bar being revised); older rows are
+    rejected.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._ts = np.zeros(2 * capacity, dtype=np.int64)
+        self._cols = np.zeros((5, 2 * capacity), dtype=np.float64)
+        self._end = 0      # ring position one past the newest row
+        self._len = 0
+
+    def __len__(self) -> int:
+        return self._len
+
+    @property
+    def last_ts(self) -> int | None:
+        return int(self._ts[self._end - 1 + self.capacity]) if self._len else None
+
+    def last(self) -> tuple[int, float, float, float, float, float]:
+        """The newest row as ``(ts, open, high, low, close, volume)``."""
+        i = self._end - 1 + self.capacity
+        return (int(self._ts[i]), *self._cols[:, i].tolist())
+
+    def append(self, ts: int, o: float, h: float, l: float, c: float, v: float = 0.0) -> bool:
+        """Add or revise the newest bar; returns False for an out-of-order row."""
+        cap = self.capacity
+        if self._len:
+            last = self._ts[self._end - 1 + cap]
+            if ts < last:
+                return False
+            if ts == last:
+                self._write(self._end - 1, ts, o, h, l, c, v)
+                return True
+        self._write(self._end, ts, o, h, l, c, v)
+        self._end = (self._end + 1) % cap
+        self._len = min(self._len + 1, cap)
+        return True
+
+    def _write(self, i: int, ts: int, o: float, h: float, l: float, c: float, v: float) -> None:
+        i %= self.capacity
+        j = i + self.capacity
+        self._ts[i] = self._ts[j] = ts
+        cols = self._cols
+        cols[0, i] = cols[0, j] = o
+        cols[1, i] = cols[1, j] = h
+        cols[2, i] = cols[2, j] = l
+        cols[3, i] = cols[3, j] = c
+        cols[4, i] = cols[4, j] = v
+
+    def extend(self, bars: Bars) -> None:
+        """Append *bars*; held rows at or after the first new timestamp are replaced."""
+        if bars.empty:
+            return
+        self.truncate(int(bars.ts[0]))
+        cap = self.capacity
+        if len(bars) > cap:
+            bars = Bars(*(a[-cap:] for a in bars))
+        n = len(bars)
+        pos = (self._end + np.arange(n)) % cap
+        for p in (pos, pos + cap):
+            self._ts[p] = bars.ts
+            self._cols[:, p] = bars[1:]
+        self._end = (self._end + n) % cap
+        self._len = min(self._len + n, cap)
+
+    def truncate(self, ts: int) -> None:
+        """Drop rows with timestamps at or after *ts* (a refetch replaces them)."""
+        keep = int(self.view().ts.searchsorted(ts))
+        drop = self._len - keep
+        if drop > 0:
+            self._end = (self._end - drop) % self.capacity
+            self._len = keep
+
+    def drop_before(self, ts: int) -> None:
+        """Evict rows older than *ts*."""
+        self._len -= int(self.view().ts.searchsorted(ts))
+
+    def view(self) -> Bars:
+        """Zero-copy, read-only views of the buffered rows, oldest first.
+
+        The views alias the ring, so they are only stable until the next write.
+        """
+        stop = self._end + self.capacity
+        start = stop - self._len
+        ts = self._ts[start:stop]
+        ts.flags.writeable = False
+        cols = self._cols[:, start:stop]
+        cols.flags.writeable = False
+        return Bars(ts, *cols)
@@ -0,0 +1,128 @@
+"""On-disk columnar bar cache (Arrow IPC files, memory-mapped on load).
+
+``load_bars`` hands back the columns as read-only NumPy views of the
+mapped file, so nothing is copied until the caller copies it (e.g. into a
+``BarBuffer``); ``load`` wraps the same views in a DataFrame.
+
+Optional: needs ``pyarrow``. Without it ``BarCache.enabled`` is False and
+every call is a no-op, so the feed simply fetches as before.
+"""
+
+import logging
+import os
+import re
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from bar_buffer import COLUMNS, Bars
+from config import BAR_CACHE_DIR, TIMEZONE
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+
+logger = logging.getLogger(__name__)
+
+# Bump when the on-disk layout changes; older files are discarded on load.
+SCHEMA_VERSION = 1
+
+
+class BarCache:
+    """Bars keyed by (ticker, interval), one Arrow IPC file each.
+
+    Files carry the schema version, the index timezone and the time the data
+    was fetched in their schema metadata. Writes go to a temp file in the
+    same directory and are moved into place atomically.
+    """
+
+    def __init__(self, root: str | os.PathLike | None = BAR_CACHE_DIR):
+        self.root = Path(os.path.expanduser(root)) if root else None
+        self.enabled = pa is not None and self.root is not None
+        if root and pa is None:
+            logger.info("pyarrow not installed; on-disk bar cache disabled")
+
+    def _path(self, ticker: str, interval: str) -> Path:
+        safe = re.sub(r"[^A-Za-z0-9_.-]", "_", ticker)
+        return self.root / f"{safe}_{interval}.arrow"
+
+    # ------------------------------------------------------------------
+    def _read(self, ticker: str, interval: str) -> tuple[dict[str, np.ndarray], dict[str, str]] | None:
+        """Column arrays (views of the memory-mapped file) and metadata, or ``None``."""
+        if not self.enabled:
+            return None
+        path = self._path(ticker, interval)
+        if not path.exists():
+            return None
+        try:
+            # the table's buffers keep the mapping alive once the file is closed
+            with pa.memory_map(str(path)) as src:
+                table = pa.ipc.open_file(src).read_all()
+            meta = {k.decode(): v.decode() for k, v in (table.schema.metadata or {}).items()}
+            if int(meta.get("schema_version", -1)) != SCHEMA_VERSION:
+                logger.info("Discarding %s (schema %s != %d)", path.name, meta.get("schema_version"), SCHEMA_VERSION)
+                path.unlink(missing_ok=True)
+                return None
+            cols = {
+                name: (col.chunk(0) if col.num_chunks == 1 else col.combine_chunks()).to_numpy(zero_copy_only=False)
+                for name, col in zip(table.column_names, table.columns)
+            }
+            return cols, meta
+        except Exception as e:
+            logger.warning("Bar cache read failed for %s: %s", path.name, e)
+            return None
+
+    def load(self, ticker: str, interval: str) -> tuple[pd.DataFrame | None, float | None]:
+        """Cached bars and their fetch time (epoch seconds), or ``(None, None)``."""
+        read = self._read(ticker, interval)
+        if read is None:
+            return None, None
+        cols, meta = read
+        idx = pd.to_datetime(cols.pop("ts"), utc=True).tz_convert(meta.get("tz") or "UTC")
+        return pd.DataFrame(cols, index=idx, copy=False), float(meta.get("fetched_at", 0))
+
+    def load_bars(self, ticker: str, interval: str) -> Bars | None:
+        """Cached bars as read-only views of the file's columns, or ``None``."""
+        read = self._read(ticker, interval)
+        if read is None:
+            return None
+        cols, _ = read
+        n = len(cols["ts"])
+        return Bars(cols["ts"], *(np.asarray(cols[c], np.float64) if c in cols else np.zeros(n) for c in COLUMNS))
+
+    def save(self, ticker: str, interval: str, df: pd.DataFrame | Bars, fetched_at: float | None = None) -> None:
+        if not self.enabled or df is None or df.empty:
+            return
+        path = self._path(ticker, interval)
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            if isinstance(df, Bars):
+                # straight from the buffer's arrays; intraday bars are shown in ET
+                table = pa.table(dict(zip(("ts", *COLUMNS), df)))
+                tz = TIMEZONE
+            else:
+                idx = df.index
+                table = pa.Table.from_pandas(df.reset_index(drop=True), preserve_index=False)
+                table = table.add_column(0, "ts", pa.array(idx.as_unit("ns").asi8, pa.int64()))
+                tz = str(idx.tz) if idx.tz is not None else ""
+            table = table.replace_schema_metadata({
+                "schema_version": str(SCHEMA_VERSION),
+                "interval": interval,
+                "tz": tz,
+                "fetched_at": str(fetched_at if fetched_at is not None else time.time()),
+            })
+            fd, tmp = tempfile.mkstemp(dir=self.root, prefix=path.name, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+                os.replace(tmp, path)
+            except BaseException:
+                os.unlink(tmp)
+                raise
+        except Exception as e:
+            logger.warning("Bar cache write failed for %s: %s", path.name, e)
@@ -0,0 +1,117 @@
+"""Alert checks per bar: sorted-level index vs scanning every level.
+
+Gives every symbol thousands of levels within ``--spread`` of its synthetic
+price and feeds the bars one at a time. ``indexed`` is ``AlertEngine.check``
+(binary search over the bar's range, O(log n + k), plus building the k
+alerts); ``index`` is the lookup alone; ``scan`` tests every level against
+the bar the way the per-level ``_near`` flags do; ``numpy`` is the same
+scan vectorized. All four must find the same crossings and
+approaches (cooldown and rate limit are off).
+
+    python -m benchmarks.bench_alerts --symbols 10 100 --levels 100 1000 5000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from alerts import AlertEngine
+from bar_buffer import Bars
+from benchmarks.bench_engine import _head
+from benchmarks.results import save
+from benchmarks.synthetic import intraday_bars
+from config import PROXIMITY_PCT
+
+
+def _inputs(n_symbols: int, n_levels: int, days: int, spread: float) -> tuple[dict[str, Bars], dict[str, list]]:
+    rng = np.random.default_rng(0)
+    bars, levels = {}, {}
+    for i in range(n_symbols):
+        sym = f"SYN{i:03d}"
+        b = bars[sym] = Bars.from_frame(intraday_bars(days, seed=i))
+        mid = float(b.close[-1])
+        prices = rng.uniform(mid * (1 - spread), mid * (1 + spread), n_levels).round(2)
+        levels[sym] = [(float(p), f"L{j}", "levels") for j, p in enumerate(prices)]
+    return bars, levels
+
+
+def _scan(levels: list, low: float, high: float) -> int:
+    hits = 0
+    for price, _, _ in levels:
+        if low <= price <= high or min(abs(low - price), abs(high - price)) <= PROXIMITY_PCT * abs(price):
+            hits += 1
+    return hits
+
+
+def _numpy_scan(prices: np.ndarray, low: float, high: float) -> int:
+    dist = np.minimum(np.abs(prices - low), np.abs(prices - high))
+    return int(np.count_nonzero(((prices >= low) & (prices <= high)) | (dist <= PROXIMITY_PCT * np.abs(prices))))
+
+
+def _lookup(index, low: float, high: float) -> int:
+    hits = 0
+    for k in index.around(low, high):
+        level = float(index.prices[k])
+        if low <= level <= high or min(abs(low - level), abs(high - level)) <= PROXIMITY_PCT * abs(level):
+            hits += 1
+    return hits
+
+
+def _run(mode: str, bars: dict, levels: dict, steps: int) -> tuple[float, int]:
+    engine = AlertEngine(cooldown=0, rate=1e12, burst=10**12, log=None)
+    arrays = {s: np.array([p for p, _, _ in lv]) for s, lv in levels.items()}
+    for sym, lv in levels.items():
+        engine.set_levels(sym, lv)
+    n = min(len(b) for b in bars.values())
+    if mode == "indexed":
+        for sym, b in bars.items():     # start each symbol's cursor just before the timed bars
+            engine.check(sym, _head(b, n - steps))
+    hits = 0
+    t0 = time.perf_counter()
+    for end in range(n - steps + 1, n + 1):
+        for sym, b in bars.items():
+            if mode == "indexed":
+                hits += len(engine.check(sym, _head(b, end)))
+                continue
+            low, high = float(b.low[end - 1]), float(b.high[end - 1])
+            if mode == "index":
+                hits += _lookup(engine.levels(sym), low, high)
+            elif mode == "numpy":
+                hits += _numpy_scan(arrays[sym], low, high)
+            else:
+                hits += _scan(levels[sym], low, high)
+    elapsed = time.perf_counter() - t0
+    return elapsed / steps, hits
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--symbols", type=int, nargs="+", default=[10, 100])
+    ap.add_argument("--levels", type=int, nargs="+", default=[100, 1000, 5000], help="levels per symbol")
+    ap.add_argument("--days", type=int, default=3)
+    ap.add_argument("--spread", type=float, default=0.1, help="levels lie within this fraction of the last close")
+    ap.add_argument("--steps", type=int, default=200, help="bars fed per symbol")
+    ap.add_argument("--out", help="JSON path (default: benchmarks/results/alerts-<time>.json)")
+    args = ap.parse_args()
+
+    rows = []
+    print(f"{'case':<22} {'us/bar (all symbols)':>21} {'us/symbol':>10} {'alerts':>8}")
+    for n_sym in args.symbols:
+        for n_lv in args.levels:
+            bars, levels = _inputs(n_sym, n_lv, args.days, args.spread)
+            counts = {}
+            for mode in ("indexed", "index", "numpy", "scan"):
+                per_bar, hits = _run(mode, bars, levels, args.steps)
+                counts[mode] = hits
+                case = f"{mode}/{n_sym}sym/{n_lv}lv"
+                print(f"{case:<22} {per_bar * 1e6:>21.1f} {per_bar / n_sym * 1e6:>10.2f} {hits:>8}")
+                rows.append({"case": case, "mode": mode, "symbols": n_sym, "levels": n_lv,
+                             "us_per_bar": round(per_bar * 1e6, 2), "alerts": hits})
+            if len(set(counts.values())) != 1:
+                raise SystemExit(f"hit counts differ: {counts}")
+    save("alerts", rows, vars(args), args.out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""Intraday bar storage: ``BarBuffer`` rings vs. the per-poll DataFrame store.
+
+Simulates an 8-hour session polled every ``POLL_INTERVAL`` seconds. Both
+paths receive identical yfinance-shaped frames (with the Dividends and
+Stock Splits columns) and run the engine after every poll. Reports time
+per poll, peak traced memory, gen-0 garbage collections and the size of
+what each path keeps per symbol.
+
+    python -m benchmarks.bench_bars --symbols 20 --hours 8
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+from datetime import timedelta
+
+import pandas as pd
+
+from benchmarks.synthetic import intraday_bars
+from config import INTRADAY_OVERLAP_MIN, INTRADAY_WINDOW_DAYS, POLL_INTERVAL, TIMEZONE
+from data_feed import DataFeed
+from ict_engine import ICTEngine
+
+
+class _SessionBackend:
+    """Serves each symbol's bars up to a simulated clock, yfinance style."""
+
+    def __init__(self, symbols: int, days: int):
+        # anchored to the wall clock so the feed treats held bars as fresh
+        start = (pd.Timestamp.now(tz=TIMEZONE) - timedelta(days=days)).floor("min").tz_localize(None)
+        self.bars = {}
+        for i in range(symbols):
+            df = intraday_bars(days, seed=i, start=start)
+            df["Dividends"] = 0.0
+            df["Stock Splits"] = 0.0
+            self.bars[f"SYM{i}"] = df
+        first = next(iter(self.bars.values()))
+        self.now = first.index[0] + timedelta(days=days - 1)
+
+    def history(self, ticker, interval, period=None, start=None, prepost=False) -> pd.DataFrame:
+        df = self.bars[ticker]
+        lo = df.index.searchsorted(start) if start is not None else df.index.searchsorted(self.now - timedelta(days=5))
+        hi = df.index.searchsorted(self.now, "right")
+        return df.iloc[lo:hi].copy()
+
+
+class _FrameStore:
+    """The DataFrame path ``BarBuffer`` replaced: concat + trim on every poll."""
+
+    def __init__(self, backend: _SessionBackend):
+        self.backend = backend
+        self.store: dict[str, pd.DataFrame] = {}
+
+    def fetch_intraday(self) -> dict[str, pd.DataFrame]:
+        out = {}
+        for ticker in self.backend.bars:
+            held = self.store.get(ticker)
+            if held is None:
+                df = self.backend.history(ticker, "1m", period="5d")
+            else:
+                since = held.index[-1] - timedelta(minutes=INTRADAY_OVERLAP_MIN)
+                new = self.backend.history(ticker, "1m", start=since)
+                keep = held.iloc[: held.index.searchsorted(new.index[0])]
+                df = pd.concat([keep, new[held.columns.intersection(new.columns)]])
+            cutoff = df.index[-1] - timedelta(days=INTRADAY_WINDOW_DAYS)
+            start = df.index.searchsorted(cutoff)
+            out[ticker] = self.store[ticker] = df.iloc[start:] if start else df
+        return out
+
+
+def _run(name: str, make_feed, symbols: int, hours: float) -> dict:
+    backend = _SessionBackend(symbols, INTRADAY_WINDOW_DAYS)
+    feed = make_feed(backend)
+    engine = ICTEngine()
+    tickers = list(backend.bars)
+    polls = int(hours * 3600 / POLL_INTERVAL)
+
+    feed.fetch_intraday()  # warm-up fetch outside the measurement
+    gc.collect()
+    gen0 = gc.get_stats()[0]["collections"]
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    for _ in range(polls):
+        backend.now += timedelta(seconds=POLL_INTERVAL)
+        intraday = feed.fetch_intraday()
+        for ticker in tickers:
+            engine._compute_ticker(ticker, intraday[ticker], pd.DataFrame(), pd.DataFrame(), backend.now)
+    elapsed = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    collections = gc.get_stats()[0]["collections"] - gen0
+
+    if isinstance(feed, _FrameStore):
+        held = sum(df.memory_usage(deep=True).sum() for df in feed.store.values())
+    else:
+        held = sum(buf._ts.nbytes + buf._cols.nbytes for buf in feed._intraday_store.values())
+    return {
+        "path": name,
+        "polls": polls,
+        "ms_per_poll": round(elapsed / polls * 1e3, 2),
+        "peak_mb": round(peak / 2**20, 1),
+        "gen0_gcs": collections,
+        "held_kb_per_symbol": round(held / symbols / 1024),
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--symbols", type=int, default=2)
+    ap.add_argument("--hours", type=float, default=8.0)
+    args = ap.parse_args()
+
+    rows = [
+        _run("dataframe", _FrameStore, args.symbols, args.hours),
+        _run("ring", lambda b: DataFeed(backend=b, workers=1, cache=_NoCache(), tickers=list(b.bars)),
+             args.symbols, args.hours),
+    ]
+    print(pd.DataFrame(rows).to_string(index=False))
+
+
+class _NoCache:
+    enabled = False
+
+    def load(self, ticker, interval):
+        return None, None
+
+    def load_bars(self, ticker, interval):
+        return None
+
+    def save(self, *args, **kwargs):
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""Full vs. delta WebSocket payload sizes over a replayed session."""
+
+import copy
+import json
+
+import pandas as pd
+
+import delta
+from benchmarks.synthetic import intraday_bars
+from config import TICKERS
+from ict_stream import StreamingICTEngine
+
+
+def main(days: int = 5, step_min: int = 1) -> None:
+    bars = {t: intraday_bars(days, seed=i) for i, t in enumerate(TICKERS)}
+    engine = StreamingICTEngine()
+    index = bars[TICKERS[0]].index
+    session = index[index >= index[-1].normalize() - pd.Timedelta(hours=6)][::step_min]
+
+    prev = None
+    full_bytes = patch_bytes = ticks = 0
+    for ts in session:
+        data = {"intraday": {t: df.loc[:ts] for t, df in bars.items()}, "daily": {}, "weekly": {}}
+        metrics = engine.compute(data, now=(ts + pd.Timedelta(seconds=30)).to_pydatetime())
+        full = json.dumps(metrics)
+        if prev is not None:
+            ops = delta.diff(prev, metrics)
+            assert delta.apply(copy.deepcopy(prev), ops) == metrics
+            full_bytes += len(full)
+            patch_bytes += len(json.dumps({"type": "patch", "version": ticks + 1, "base": ticks, "ops": ops}))
+            ticks += 1
+        prev = metrics
+
+    print(f"ticks replayed     {ticks}")
+    print(f"full   avg bytes   {full_bytes / ticks:,.0f}")
+    print(f"delta  avg bytes   {patch_bytes / ticks:,.0f}")
+    print(f"reduction          {full_bytes / patch_bytes:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
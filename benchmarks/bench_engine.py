@@ -0,0 +1,167 @@
+"""ICTEngine per-method timings across window lengths and ticker counts.
+
+Times every engine method on 1, 5, 30 and 365 days of synthetic 1-min
+bars (with the memo off, plus the memoized methods answered from it), then ``compute`` for 2, 10 and 50 tickers — cold (fresh engine) and
+steady state (one new bar per ticker per call) for both the batch and the
+streaming engine. Results are printed and saved as JSON.
+
+    python -m benchmarks.bench_engine --days 1 5 30 365 --tickers 2 10 50
+"""
+
+import argparse
+import statistics
+import time
+from datetime import datetime
+
+from bar_buffer import Bars
+from benchmarks.results import save
+from benchmarks.synthetic import intraday_bars, periodic_bars
+from config import OTE_TIMEFRAMES
+from ict_engine import ET, ICTEngine
+from ict_stream import StreamingICTEngine
+from memo import Memo
+from session_index import SessionIndex
+
+
+def _now(bars: Bars) -> datetime:
+    return datetime.fromtimestamp(int(bars.ts[-1]) / 1e9, ET)
+
+
+def _head(bars: Bars, end: int | None) -> Bars:
+    return Bars(*(a[:end] for a in bars))
+
+
+def _inputs(days: int, seed: int = 0) -> tuple[Bars, object, object, datetime]:
+    df = intraday_bars(days, seed=seed)
+    bars = Bars.from_frame(df)
+    return bars, periodic_bars(df, "1d"), periodic_bars(df, "1w"), _now(bars)
+
+
+def _time(fn, repeat: int) -> dict:
+    fn()    # warm caches and lazy imports
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return {
+        "ms_p50": round(statistics.median(samples) * 1e3, 4),
+        "ms_min": round(min(samples) * 1e3, 4),
+        "calls": repeat,
+    }
+
+
+def _row(case: str, stats: dict, **params) -> dict:
+    row = {"case": case, **params, **stats}
+    print(f"{case:<40} {stats['ms_p50']:>10.3f} ms   (min {stats['ms_min']:.3f})")
+    return row
+
+
+# ── per method ───────────────────────────────────────────────────────
+def bench_methods(days: int, repeat: int) -> list[dict]:
+    intra, daily, weekly, now = _inputs(days)
+    eng = ICTEngine(["SYN"])
+    eng.memo = Memo(0)      # time the methods themselves
+    cached = ICTEngine(["SYN"])
+    price = float(intra.close[-1])
+    sidx = SessionIndex(intra.ts)
+    levels = eng._key_levels(daily, weekly, now)
+    tf_bars = eng._timeframe_bars("SYN", intra)
+    eng._fvg_zones("SYN", tf_bars, price)
+
+    # stateful methods: a second engine takes the last bars one at a time
+    inc = ICTEngine(["SYN"])
+    warm = len(intra) - repeat - 2    # _time calls fn repeat + 1 times
+    inc._fvg_zones("SYN", inc._timeframe_bars("SYN", _head(intra, warm)), price)
+    ends = iter(range(warm + 1, len(intra) + 1))
+
+    def incremental():
+        inc._fvg_zones("SYN", inc._timeframe_bars("SYN", _head(intra, next(ends))), price)
+
+    cases = {
+        "key_levels": lambda: eng._key_levels(daily, weekly, now),
+        "prev_day_close": lambda: eng._prev_day_close(daily, now),
+        "session_index": lambda: SessionIndex(intra.ts),
+        "liquidity_sweeps": lambda: eng._liquidity_sweeps(intra, levels, now, sidx),
+        "key_opens": lambda: eng._key_opens(intra, price, now, sidx),
+        "power_of_3": lambda: eng._power_of_3(intra, now, sidx),
+        "kill_zones": lambda: eng._kill_zones(now),
+        "macros": lambda: eng._macros(now),
+        "key_levels_memo_hit": lambda: cached._key_levels(daily, weekly, now),
+        "prev_day_close_memo_hit": lambda: cached._prev_day_close(daily, now),
+        "kill_zones_memo_hit": lambda: cached._kill_zones(now),
+        "macros_memo_hit": lambda: cached._macros(now),
+        "timeframe_bars_cold": lambda: ICTEngine(["SYN"])._timeframe_bars("SYN", intra),
+        "timeframe_bars+fvg_zones_per_bar": incremental,
+        "fvg_zones_payload": lambda: eng._zones["SYN"].payload(price),
+        **{f"ote_{tf}": (lambda tf=tf: eng._ote(tf_bars[tf], price, now)) for tf in OTE_TIMEFRAMES},
+    }
+    print(f"\n{days} day(s): {len(intra)} 1-min bars")
+    return [
+        _row(f"{name}/{days}d", _time(fn, repeat), method=name, days=days, bars=len(intra))
+        for name, fn in cases.items()
+    ]
+
+
+# ── compute ──────────────────────────────────────────────────────────
+def bench_compute(n_tickers: int, days: int, steps: int) -> list[dict]:
+    tickers = [f"SYN{i:02d}" for i in range(n_tickers)]
+    frames = {t: intraday_bars(days, seed=i) for i, t in enumerate(tickers)}
+    bars = {t: Bars.from_frame(df) for t, df in frames.items()}
+    daily = {t: periodic_bars(df, "1d") for t, df in frames.items()}
+    weekly = {t: periodic_bars(df, "1w") for t, df in frames.items()}
+    warm = min(len(b) for b in bars.values()) - steps
+
+    def data(end: int) -> tuple[dict, datetime]:
+        intra = {t: _head(b, end) for t, b in bars.items()}
+        return {"intraday": intra, "daily": daily, "weekly": weekly}, _now(intra[tickers[0]])
+
+    print(f"\n{n_tickers} tickers, {days} day(s), {steps} steady-state steps")
+    rows = []
+    full, now = data(None)
+    for kind, cls in (("batch", ICTEngine), ("stream", StreamingICTEngine)):
+        rows.append(_row(
+            f"compute_{kind}_cold/{n_tickers}t", _time(lambda: cls(tickers).compute(full, now), 3),
+            method=f"compute_{kind}_cold", tickers=n_tickers, days=days,
+        ))
+        eng = cls(tickers)
+        eng.compute(*data(warm))
+        samples = []
+        for end in range(warm + 1, warm + steps + 1):
+            d, now_i = data(end)
+            t0 = time.perf_counter()
+            eng.compute(d, now_i)
+            samples.append(time.perf_counter() - t0)
+        stats = {
+            "ms_p50": round(statistics.median(samples) * 1e3, 4),
+            "ms_min": round(min(samples) * 1e3, 4),
+            "calls": steps,
+            "ms_per_ticker": round(statistics.median(samples) * 1e3 / n_tickers, 4),
+        }
+        rows.append(_row(
+            f"compute_{kind}_steady/{n_tickers}t", stats,
+            method=f"compute_{kind}_steady", tickers=n_tickers, days=days,
+        ))
+    return rows
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--days", type=int, nargs="+", default=[1, 5, 30, 365])
+    ap.add_argument("--tickers", type=int, nargs="+", default=[2, 10, 50])
+    ap.add_argument("--compute-days", type=int, default=5)
+    ap.add_argument("--repeat", type=int, default=20)
+    ap.add_argument("--steps", type=int, default=30)
+    ap.add_argument("--out", help="JSON path (default: benchmarks/results/engine-<time>.json)")
+    args = ap.parse_args()
+
+    rows = []
+    for days in args.days:
+        rows += bench_methods(days, args.repeat)
+    for n in args.tickers:
+        rows += bench_compute(n, args.compute_days, args.steps)
+    save("engine", rows, vars(args), args.out)
+
+
+if __name__ == "__main__":
+    main()
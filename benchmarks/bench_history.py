@@ -0,0 +1,103 @@
+"""Historical REST queries over a year of 1-min bars.
+
+Loads one symbol's synthetic year into a ``HistoryStore`` and requests it
+through the app's ``/history`` routes (in-process ASGI, no network): raw
+1-min ranges, roll-ups, min-max and LTTB downsampling, per-day levels and
+a conditional request answered 304. ``store ms`` is the query and body
+alone; ``http ms`` adds routing and the streamed response; ``gzip`` is the
+body size with ``Accept-Encoding: gzip``. ``pandas`` is the same full-year
+1h roll-up done with ``DataFrame.resample`` and ``to_json``, for scale.
+
+    python -m benchmarks.bench_history --days 365 --points 1000
+"""
+
+import argparse
+import logging
+import time
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+import app as dashboard
+from bar_buffer import Bars
+from bar_cache import BarCache
+from benchmarks.results import save
+from benchmarks.synthetic import intraday_bars
+from history import HistoryStore
+
+SYMBOL = "NQ=F"
+
+
+def _timed(fn, repeat: int) -> tuple[float, object]:
+    times, out = [], None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        times.append(time.perf_counter() - t0)
+    return float(np.median(times)), out
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--days", type=int, default=365)
+    ap.add_argument("--points", type=int, default=1000)
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--out", help="JSON path (default: benchmarks/results/history-<time>.json)")
+    args = ap.parse_args()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    df = intraday_bars(args.days)
+    bars = Bars.from_frame(df)
+    store = HistoryStore(days=args.days + 1, cache=BarCache(None), tickers=[SYMBOL])
+    store.update({SYMBOL: bars})
+    dashboard.history = store
+    dashboard._history_fetched[SYMBOL] = float("inf")     # serve the store as loaded, never top it up
+    client = TestClient(dashboard.app)
+    last = int(bars.ts[-1]) // 10**6
+    week, month = str(last - 7 * 86_400_000), str(last - 30 * 86_400_000)
+    print(f"{len(bars)} bars over {args.days} days")
+
+    p = args.points
+    cases = [
+        ("raw/1w", "bars", {"start": week}),
+        ("raw/1y", "bars", {}),
+        ("1h/1y", "bars", {"interval": "1h"}),
+        ("1d/1y", "bars", {"interval": "1d"}),
+        (f"minmax{p}/1mo", "bars", {"start": month, "points": p}),
+        (f"minmax{p}/1y", "bars", {"points": p}),
+        (f"lttb{p}/1y", "bars", {"points": p, "method": "lttb"}),
+        ("levels/1y", "levels", {}),
+    ]
+    rows = []
+    print(f"{'case':<18} {'store ms':>9} {'http ms':>9} {'bytes':>11} {'gzip':>9} {'304 ms':>7}")
+    for case, route, params in cases:
+        repeat = max(1, args.repeat // 2) if case == "raw/1y" else args.repeat
+        query = getattr(store, route)
+        store_s, _ = _timed(lambda: b"".join(query(SYMBOL, **params).body), repeat)
+        url = f"/history/{route}"
+        qs = {"symbol": SYMBOL, **params}
+        http_s, resp = _timed(lambda: client.get(url, params=qs, headers={"Accept-Encoding": "identity"}), repeat)
+        if resp.status_code != 200:
+            raise SystemExit(f"{case}: HTTP {resp.status_code} {resp.text[:200]}")
+        gz = client.get(url, params=qs, headers={"Accept-Encoding": "gzip"})
+        etag = resp.headers["etag"]
+        cond_s, cond = _timed(lambda: client.get(url, params=qs, headers={"If-None-Match": etag}), args.repeat)
+        if cond.status_code != 304:
+            raise SystemExit(f"{case}: conditional request got HTTP {cond.status_code}")
+        print(f"{case:<18} {store_s * 1e3:>9.1f} {http_s * 1e3:>9.1f} {len(resp.content):>11,} "
+              f"{gz.num_bytes_downloaded:>9,} {cond_s * 1e3:>7.2f}")
+        rows.append({"case": case, "store_ms": round(store_s * 1e3, 2), "http_ms": round(http_s * 1e3, 2),
+                     "bytes": len(resp.content), "gzip_bytes": gz.num_bytes_downloaded,
+                     "not_modified_ms": round(cond_s * 1e3, 3)})
+
+    def resample_json():
+        return df.resample("1h").agg({"Open": "first", "High": "max", "Low": "min", "Close": "last",
+                                      "Volume": "sum"}).dropna().to_json(orient="split")
+    pandas_s, out = _timed(resample_json, args.repeat)
+    print(f"{'pandas 1h/1y':<18} {pandas_s * 1e3:>9.1f} {'':>9} {len(out):>11,}")
+    rows.append({"case": "pandas/1h/1y", "store_ms": round(pandas_s * 1e3, 2), "bytes": len(out)})
+    save("history", rows, vars(args), args.out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""Swing-pivot detection: vectorized ``swing_pivots`` vs. the old Python loop."""
+
+import timeit
+
+from benchmarks.synthetic import intraday_bars
+from config import SWING_LOOKBACK
+from ict_engine import swing_pivots
+
+
+def _loop_pivots(highs, lows, n):
+    swing_highs, swing_lows = [], []
+    for i in range(n, len(highs) - n):
+        if highs[i] == max(highs[i - n : i + n + 1]):
+            swing_highs.append(i)
+        if lows[i] == min(lows[i - n : i + n + 1]):
+            swing_lows.append(i)
+    return swing_highs, swing_lows
+
+
+def main(days_list=(5, 30, 60), repeat: int = 5) -> None:
+    n = SWING_LOOKBACK
+    print(f"{'days':>5} {'5m bars':>8} {'loop ms':>9} {'vector ms':>10} {'speedup':>8}")
+    for days in days_list:
+        df5 = (
+            intraday_bars(days)
+            .resample("5min")
+            .agg({"High": "max", "Low": "min"})
+            .dropna()
+        )
+        highs = df5["High"].to_numpy()
+        lows = df5["Low"].to_numpy()
+
+        fast_hi, fast_lo = swing_pivots(highs, lows, n)
+        slow_hi, slow_lo = _loop_pivots(highs, lows, n)
+        assert list(fast_hi) == slow_hi and list(fast_lo) == slow_lo
+
+        loop = min(timeit.repeat(lambda: _loop_pivots(highs, lows, n), number=1, repeat=repeat))
+        vec = min(timeit.repeat(lambda: swing_pivots(highs, lows, n), number=1, repeat=repeat))
+        print(f"{days:>5} {len(highs):>8} {loop * 1e3:>9.2f} {vec * 1e3:>10.2f} {loop / vec:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""Event-loop lag and tick latency with the engine on the loop, in a thread or on workers.
+
+Each step appends one synthetic 1-min bar per symbol and awaits a compute
+while a probe task on the same loop sleeps 1 ms at a time: how late it
+wakes is the loop lag every WebSocket client and HTTP request would see.
+Tick latency is bar in → metrics out. Modes:
+
+* ``loop``   — ``engine.compute`` called on the event loop (the old path)
+* ``thread`` — ``asyncio.to_thread(engine.compute, …)`` (``ENGINE_WORKERS = 0``)
+* ``pool``   — ``EnginePool`` with ``--workers`` processes
+
+    python -m benchmarks.bench_pool --symbols 2 20 100 --workers 4
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+from bar_buffer import Bars
+from benchmarks.bench_engine import _head, _now
+from benchmarks.results import save
+from benchmarks.synthetic import intraday_bars, periodic_bars
+from engine_pool import EnginePool
+from ict_stream import StreamingICTEngine
+
+_PROBE = 0.001   # seconds
+
+
+def _inputs(n: int, days: int) -> tuple[list[str], dict, dict, dict]:
+    tickers = [f"SYN{i:03d}" for i in range(n)]
+    frames = {t: intraday_bars(days, seed=i) for i, t in enumerate(tickers)}
+    bars = {t: Bars.from_frame(df) for t, df in frames.items()}
+    daily = {t: periodic_bars(df, "1d") for t, df in frames.items()}
+    weekly = {t: periodic_bars(df, "1w") for t, df in frames.items()}
+    return tickers, bars, daily, weekly
+
+
+async def _probe(lags: list[float], stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        t0 = time.perf_counter()
+        await asyncio.sleep(_PROBE)
+        lags.append(time.perf_counter() - t0 - _PROBE)
+
+
+async def _run(mode: str, tickers: list[str], bars: dict, daily: dict, weekly: dict,
+               steps: int, warmup: int, workers: int) -> dict:
+    if mode == "pool":
+        pool = EnginePool(tickers, workers=workers)
+        compute = pool.compute
+    else:
+        engine = StreamingICTEngine(tickers)
+        if mode == "loop":
+            async def compute(data, now):
+                return engine.compute(data, now)
+        else:
+            async def compute(data, now):
+                return await asyncio.to_thread(engine.compute, data, now)
+
+    n = min(len(b) for b in bars.values())
+    ends = range(n - steps - warmup + 1, n + 1)
+    latencies, lags = [], []
+    try:
+        for k, end in enumerate(ends):
+            measured = k >= warmup
+            stop = asyncio.Event()
+            step_lags: list[float] = []
+            probe = asyncio.create_task(_probe(step_lags, stop)) if measured else None
+            await asyncio.sleep(0)
+            intraday = {t: _head(b, end) for t, b in bars.items()}
+            t0 = time.perf_counter()
+            await compute({"intraday": intraday, "daily": daily, "weekly": weekly}, _now(intraday[tickers[0]]))
+            if measured:
+                latencies.append(time.perf_counter() - t0)
+                stop.set()
+                await probe
+                lags.extend(step_lags)
+    finally:
+        if mode == "pool":
+            pool.close()
+
+    lags.sort()
+    return {
+        "tick_ms_p50": round(statistics.median(latencies) * 1e3, 3),
+        "tick_ms_p95": round(statistics.quantiles(latencies, n=20)[-1] * 1e3, 3),
+        "lag_ms_p50": round(lags[len(lags) // 2] * 1e3, 3),
+        "lag_ms_p99": round(lags[int(len(lags) * 0.99)] * 1e3, 3),
+        "lag_ms_max": round(lags[-1] * 1e3, 3),
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--symbols", type=int, nargs="+", default=[2, 20, 100])
+    ap.add_argument("--modes", nargs="+", default=["loop", "thread", "pool"], choices=["loop", "thread", "pool"])
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--days", type=int, default=5, help="days of 1-min bars per symbol")
+    ap.add_argument("--steps", type=int, default=30, help="bars measured")
+    ap.add_argument("--warmup", type=int, default=3, help="bars computed before measuring")
+    ap.add_argument("--out", help="JSON path (default: benchmarks/results/pool-<time>.json)")
+    args = ap.parse_args()
+
+    rows = []
+    print(f"{'case':<16} {'tick p50':>9} {'tick p95':>9} {'lag p50':>8} {'lag p99':>8} {'lag max':>8}   (ms)")
+    for n in args.symbols:
+        inputs = _inputs(n, args.days)
+        for mode in args.modes:
+            stats = asyncio.run(_run(mode, *inputs, args.steps, args.warmup, args.workers))
+            case = f"{mode}/{n}sym"
+            print(
+                f"{case:<16} {stats['tick_ms_p50']:>9.2f} {stats['tick_ms_p95']:>9.2f}"
+                f" {stats['lag_ms_p50']:>8.2f} {stats['lag_ms_p99']:>8.2f} {stats['lag_ms_max']:>8.2f}"
+            )
+            rows.append({"case": case, "mode": mode, "symbols": n,
+                         "workers": args.workers if mode == "pool" else 0, **stats})
+    save("pool", rows, vars(args), args.out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Snapshot encode time and size for every installed JSON / MessagePack encoder.
+
+Replays a synthetic session through the engine to get a realistic run of
+metrics payloads and patches, then encodes each with every encoder in
+``serialization.ENCODERS`` plus the previous ``json.dumps`` path.
+
+    python -m benchmarks.bench_serialize --tickers 2 10
+"""
+
+import argparse
+import json
+import statistics
+import time
+
+import pandas as pd
+
+import delta
+from benchmarks.results import save
+from benchmarks.synthetic import intraday_bars, periodic_bars
+from ict_stream import StreamingICTEngine
+from serialization import ENCODERS
+
+
+def _session(n_tickers: int, days: int, steps: int) -> tuple[list[dict], list[dict]]:
+    tickers = [f"SYN{i:02d}" for i in range(n_tickers)]
+    frames = {t: intraday_bars(days, seed=i) for i, t in enumerate(tickers)}
+    daily = {t: periodic_bars(df, "1d") for t, df in frames.items()}
+    weekly = {t: periodic_bars(df, "1w") for t, df in frames.items()}
+    engine = StreamingICTEngine(tickers)
+    index = frames[tickers[0]].index
+    payloads, patches = [], []
+    for ts in index[-steps:]:
+        data = {"intraday": {t: df.loc[:ts] for t, df in frames.items()}, "daily": daily, "weekly": weekly}
+        metrics = engine.compute(data, now=(ts + pd.Timedelta(seconds=30)).to_pydatetime())
+        if payloads:
+            ops = delta.diff(payloads[-1], metrics)
+            patches.append({"type": "patch", "version": len(payloads), "base": len(payloads) - 1, "ops": ops})
+        payloads.append(metrics)
+    return payloads, patches
+
+
+def _bench(encode, docs: list[dict], repeat: int) -> tuple[float, float]:
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for d in docs:
+            encode(d)
+        samples.append((time.perf_counter() - t0) / len(docs))
+    size = statistics.fmean(len(encode(d)) for d in docs)
+    return min(samples), size
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--tickers", type=int, nargs="+", default=[2, 10])
+    ap.add_argument("--days", type=int, default=5)
+    ap.add_argument("--steps", type=int, default=120, help="bars replayed (payloads encoded)")
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--out", help="JSON path (default: benchmarks/results/serialize-<time>.json)")
+    args = ap.parse_args()
+
+    encoders = {("json", "json.dumps (str)"): json.dumps}
+    encoders.update({(fmt, name): fn for fmt, impls in ENCODERS.items() for name, fn in impls.items()})
+    rows = []
+    for n in args.tickers:
+        payloads, patches = _session(n, args.days, args.steps)
+        print(f"\n{n} tickers, {len(payloads)} payloads")
+        print(f"{'format':<8} {'encoder':<18} {'payload us':>11} {'bytes':>8} {'patch us':>9} {'bytes':>7}")
+        base = None
+        for (fmt, name), fn in encoders.items():
+            t_full, b_full = _bench(fn, payloads, args.repeat)
+            t_patch, b_patch = _bench(fn, patches, args.repeat)
+            base = base or t_full
+            print(
+                f"{fmt:<8} {name:<18} {t_full * 1e6:>11.1f} {b_full:>8.0f} {t_patch * 1e6:>9.1f} {b_patch:>7.0f}"
+                f"   {base / t_full:4.1f}x"
+            )
+            rows.append({
+                "case": f"{fmt}/{name}/{n}t",
+                "format": fmt,
+                "encoder": name,
+                "tickers": n,
+                "payload_us": round(t_full * 1e6, 2),
+                "payload_bytes": round(b_full),
+                "patch_us": round(t_patch * 1e6, 2),
+                "patch_bytes": round(b_patch),
+            })
+    save("serialize", rows, vars(args), args.out)
+
+
+if __name__ == "__main__":
+    main()
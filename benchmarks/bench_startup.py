@@ -0,0 +1,183 @@
+"""Cold-start time: process spawn → server ready → first snapshot → first live data.
+
+Each run starts a fresh interpreter under ``-X importtime`` that imports the
+app, starts uvicorn on a free port (readiness via the same event the
+desktop launcher waits on) and connects one WebSocket client, with the
+synthetic backend swapped in when the pipeline loads. One set of runs has
+no snapshot cache (first launch), the next a warm one (every launch
+after). Reports the median of each milestone and the slowest imports.
+
+``--frozen EXE`` times a PyInstaller bundle instead (port 8000, real data
+feed); build it with ``ICT_IMPORTTIME=1`` to get its import breakdown.
+
+    python -m benchmarks.bench_startup --runs 5
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+
+import websockets
+
+from benchmarks.load_clients import _free_port
+from benchmarks.results import save
+
+ROOT = Path(__file__).resolve().parent.parent
+
+_CHILD = """
+import json, sys, threading, time
+t0 = float(sys.argv[1])
+marks = {}
+def mark(name):
+    marks[name] = round(time.time() - t0, 4)
+mark("interpreter")
+
+import config
+config.SNAPSHOT_CACHE = sys.argv[2]
+config.BAR_CACHE_DIR = ""
+config.ALERT_LOG = ""
+import app
+mark("import_app")
+
+load = app._load_pipeline
+def load_synthetic():
+    load()
+    from benchmarks.synthetic import SyntheticBackend
+    app.feed.backend = SyntheticBackend()
+app._load_pipeline = load_synthetic
+
+import desktop
+ready = threading.Event()
+port = int(sys.argv[3])
+threading.Thread(target=desktop.serve, args=(ready, app.app, "127.0.0.1", port), daemon=True).start()
+ready.wait(60)
+mark("server_ready")
+
+import asyncio, websockets
+async def client():
+    async with websockets.connect(f"ws://127.0.0.1:{port}/ws", max_size=None) as ws:
+        while True:
+            msg = json.loads(await ws.recv())
+            if "first_snapshot" not in marks:
+                mark("first_snapshot")
+                marks["first_was_cached"] = bool(msg.get("stale"))
+            if not msg.get("stale"):
+                mark("first_live")
+                return
+asyncio.run(client())
+app.snapshots.save()
+print(json.dumps(marks), flush=True)
+"""
+
+
+def _importtime(stderr: str, top: int) -> list[dict]:
+    """Slowest top-level-ish imports from ``-X importtime`` output (cumulative us)."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        head, cum, name = line.split("|", 2)
+        try:
+            self_us, cum_us = int(head.split(":", 1)[1]), int(cum)
+        except ValueError:
+            continue    # the column header
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append({"module": name.strip(), "depth": depth, "self_ms": self_us / 1e3, "cum_ms": cum_us / 1e3})
+    shallow = [r for r in rows if r["depth"] <= 1]
+    return sorted(shallow, key=lambda r: -r["cum_ms"])[:top]
+
+
+def _source_run(cache: str) -> tuple[dict, str]:
+    port = _free_port()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _CHILD, repr(time.time()), cache, str(port)],
+        cwd=ROOT, capture_output=True, text=True, timeout=120,
+    )
+    lines = [line for line in proc.stdout.splitlines() if line.startswith("{")]
+    if proc.returncode or not lines:
+        raise RuntimeError(f"startup run failed:\n{proc.stderr[-2000:]}")
+    return json.loads(lines[-1]), proc.stderr
+
+
+async def _first_message(url: str) -> None:
+    async with websockets.connect(url, max_size=None) as ws:
+        await ws.recv()
+
+
+def _frozen_run(exe: str) -> tuple[dict, str]:
+    t0 = time.time()
+    proc = subprocess.Popen([exe], stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    marks = {}
+    try:
+        # outside the bundle there is no event to wait on: probe the port
+        while time.time() - t0 < 60:
+            try:
+                urllib.request.urlopen("http://127.0.0.1:8000/clients", timeout=1)
+                break
+            except OSError:
+                time.sleep(0.02)
+        marks["server_ready"] = round(time.time() - t0, 4)
+        asyncio.run(_first_message("ws://127.0.0.1:8000/ws"))
+        marks["first_snapshot"] = round(time.time() - t0, 4)
+    finally:
+        proc.terminate()
+        _, stderr = proc.communicate(timeout=30)
+    return marks, stderr
+
+
+def _summary(runs: list[dict]) -> dict:
+    keys = [k for k in runs[0] if isinstance(runs[0][k], float)]
+    return {f"{k}_s": round(statistics.median(r[k] for r in runs), 4) for k in keys}
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--runs", type=int, default=5)
+    ap.add_argument("--top", type=int, default=15, help="imports listed")
+    ap.add_argument("--frozen", metavar="EXE", help="time a PyInstaller bundle instead")
+    ap.add_argument("--out", help="JSON path (default: benchmarks/results/startup-<time>.json)")
+    args = ap.parse_args()
+
+    rows, stderr = [], ""
+    if args.frozen:
+        runs = []
+        for _ in range(args.runs):
+            marks, stderr = _frozen_run(args.frozen)
+            runs.append(marks)
+        rows.append({"case": "frozen", **_summary(runs)})
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = os.path.join(tmp, "snapshot.json")
+            for case in ("no_cache", "cached"):
+                runs = []
+                for _ in range(args.runs):
+                    if case == "no_cache" and os.path.exists(cache):
+                        os.remove(cache)
+                    marks, stderr = _source_run(cache)
+                    runs.append(marks)
+                row = {"case": case, **_summary(runs), "first_was_cached": runs[-1]["first_was_cached"]}
+                rows.append(row)
+
+    for row in rows:
+        print(f"\n{row['case']}")
+        for k, v in row.items():
+            if k.endswith("_s"):
+                print(f"  {k[:-2]:<16} {v * 1e3:8.0f} ms")
+    imports = _importtime(stderr, args.top)
+    if imports:
+        print("\nslowest imports, last run (data_feed / ict_* load in the background after the server is up)")
+        for r in imports:
+            print(f"  {r['cum_ms']:8.1f} ms  {'  ' * r['depth']}{r['module']}")
+    save("startup", rows, {**vars(args), "imports": imports}, args.out)
+
+
+if __name__ == "__main__":
+    main()
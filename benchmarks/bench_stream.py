@@ -0,0 +1,72 @@
+"""Streaming pipeline throughput: replayed ticks → 1-min bars → engine.
+
+Replays synthetic bars as ticks as fast as possible through
+``StreamingFeed`` and recomputes with ``StreamingICTEngine`` on every
+update, reporting tick throughput and recompute latency.
+
+    python -m benchmarks.bench_stream --days 2 --ticks-per-bar 60
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from bar_cache import BarCache
+from benchmarks.synthetic import SyntheticBackend, intraday_bars
+from config import TICKERS
+from data_feed import DataFeed
+from ict_stream import StreamingICTEngine
+from stream_feed import ReplayTickSource, StreamingFeed
+
+
+async def _run(days: int, ticks_per_bar: int, throttle: float) -> dict:
+    bars = {t: intraday_bars(days + 5, seed=i) for i, t in enumerate(TICKERS)}
+    warm = {t: df.iloc[: len(df) * 5 // (days + 5)] for t, df in bars.items()}
+    live = {t: df.iloc[len(warm[t]):] for t, df in bars.items()}
+
+    feed = StreamingFeed(
+        ReplayTickSource(live, ticks_per_bar=ticks_per_bar),
+        # synthetic bars must not reach the user's bar cache
+        poll_feed=DataFeed(backend=SyntheticBackend(), cache=BarCache(None)),
+        throttle=throttle,
+    )
+    feed.seed(warm)
+    engine = StreamingICTEngine()
+    latencies: list[float] = []
+
+    async def recompute() -> None:
+        async for _ in feed.updates():
+            t0 = time.perf_counter()
+            engine.compute(await feed.fetch_all(), now=feed.now())
+            latencies.append(time.perf_counter() - t0)
+
+    updater = asyncio.create_task(recompute())
+    t0 = time.perf_counter()
+    await feed.run()
+    elapsed = time.perf_counter() - t0
+    updater.cancel()
+
+    return {
+        "ticks": feed.ticks,
+        "ticks_per_s": round(feed.ticks / elapsed),
+        "bars": sum(len(df) for df in live.values()),
+        "recomputes": len(latencies),
+        "recompute_ms_p50": round(statistics.median(latencies) * 1e3, 2),
+        "recompute_ms_p95": round(statistics.quantiles(latencies, n=20)[-1] * 1e3, 2),
+        "elapsed_s": round(elapsed, 2),
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--days", type=int, default=1)
+    ap.add_argument("--ticks-per-bar", type=int, default=60)
+    ap.add_argument("--throttle", type=float, default=0.05)
+    args = ap.parse_args()
+    for k, v in asyncio.run(_run(args.days, args.ticks_per_bar, args.throttle)).items():
+        print(f"{k:<18} {v}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""Parameter-sweep scaling: the same grid on 1 worker vs a full process pool.
+
+    python -m benchmarks.bench_sweep --days 30 --workers 8
+"""
+
+import argparse
+import os
+import time
+
+from benchmarks.synthetic import intraday_bars
+from config import OTE_FIBS, PROXIMITY_PCT, TICKERS
+from sweep import param_grid, sweep
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--days", type=int, default=30)
+    ap.add_argument("--workers", type=int, default=os.cpu_count())
+    args = ap.parse_args()
+
+    bars = {t: intraday_bars(args.days, seed=i) for i, t in enumerate(TICKERS)}
+    grid = param_grid([3, 5, 8], [OTE_FIBS], [PROXIMITY_PCT], [0, 15])
+    n_bars = sum(len(df) for df in bars.values()) * len(grid)
+
+    timings = {}
+    for workers in sorted({1, args.workers}):
+        t0 = time.perf_counter()
+        sweep(bars, grid, days_per_shard=5, workers=workers)
+        timings[workers] = time.perf_counter() - t0
+        print(f"workers={workers:<3} {timings[workers]:6.1f}s  {n_bars / timings[workers]:9.0f} bars/s")
+    if len(timings) > 1:
+        print(f"speedup ×{timings[1] / timings[args.workers]:.1f} on {args.workers} workers")
+
+
+if __name__ == "__main__":
+    main()
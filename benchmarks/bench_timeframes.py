@@ -0,0 +1,51 @@
+"""Multi-timeframe bars: incremental ``TimeframeBars`` vs. resampling every bar.
+
+Appends one 1-min bar at a time to a 5-day ring and, after each, brings
+every timeframe in ``TIMEFRAMES`` up to date — either by resampling the
+whole window (the old ``_ote`` path, once per timeframe) or with
+``TimeframeBars.update``.
+"""
+
+import time
+
+import pandas as pd
+
+from bar_buffer import BarBuffer, Bars
+from benchmarks.synthetic import intraday_bars
+from config import INTRADAY_WINDOW_DAYS, TIMEFRAMES
+from timeframes import TimeframeBars
+
+_AGG = {"Open": "first", "High": "max", "Low": "min", "Close": "last", "Volume": "sum"}
+
+
+def _resample_all(bars: Bars) -> None:
+    df = bars.frame("US/Eastern")
+    for minutes in TIMEFRAMES.values():
+        df.resample(f"{minutes}min", offset="2h" if minutes == 240 else None).agg(_AGG).dropna()
+
+
+def main(days: int = 5, steps: int = 300) -> None:
+    df = intraday_bars(days + 1)
+    bars = Bars.from_frame(df)
+    warm = len(bars) - steps
+    print(f"{len(TIMEFRAMES)} timeframes over {days} days of 1-min bars, {steps} appends")
+    print(f"{'path':>12} {'us/bar':>10}")
+
+    for name in ("resample", "incremental"):
+        buf = BarBuffer(INTRADAY_WINDOW_DAYS * 1440)
+        buf.extend(Bars(*(a[:warm] for a in bars)))
+        tf_bars = TimeframeBars()
+        tf_bars.update(buf.view())
+        t0 = time.perf_counter()
+        for i in range(warm, len(bars)):
+            buf.append(*(a[i] for a in bars))
+            if name == "resample":
+                _resample_all(buf.view())
+            else:
+                tf_bars.update(buf.view())
+        elapsed = time.perf_counter() - t0
+        print(f"{name:>12} {elapsed / steps * 1e6:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""WebSocket throughput and publish → receive latency against a local server.
+
+Starts the dashboard under uvicorn with the synthetic backend and a short
+poll interval, then for each client count connects that many sockets for
+*seconds* and measures messages/s, bytes/s and the time from
+``SnapshotStore.publish`` to each client receiving that version. Clients
+run in one event loop, so at high counts their own scheduling is part of
+the measured latency.
+
+    python -m benchmarks.bench_ws --clients 1 10 100 --seconds 10
+"""
+
+import argparse
+import asyncio
+import logging
+import re
+import time
+
+import numpy as np
+import websockets
+
+import config
+
+# synthetic bars must not reach the user's bar cache, snapshot or alert log
+config.SNAPSHOT_CACHE = ""
+config.BAR_CACHE_DIR = ""
+config.ALERT_LOG = ""
+
+import app as dashboard
+from benchmarks.load_clients import _free_port, _serve
+from benchmarks.results import save
+from benchmarks.synthetic import SyntheticBackend
+
+_VERSION = re.compile(r'\{"type": ?"\w+", ?"version": ?(\d+)')
+
+
+def _record_publishes() -> dict:
+    """Wrap ``publish`` to note when each snapshot became available.
+
+    Keyed by version for delta messages and by payload for full-protocol
+    messages, which carry no version.
+    """
+    published: dict = {}
+    publish = dashboard.snapshots.publish
+
+    def timed_publish(metrics):
+        snap = publish(metrics)
+        published[snap.version] = published[snap.payload] = time.monotonic()
+        return snap
+
+    dashboard.snapshots.publish = timed_publish
+    return published
+
+
+async def _client(url: str, seconds: float, latencies: list[float], published: dict) -> tuple[int, int]:
+    messages = size = 0
+    deadline = time.monotonic() + seconds
+    async with websockets.connect(url, max_size=None) as ws:
+        while True:
+            try:
+                raw = await asyncio.wait_for(ws.recv(), deadline - time.monotonic())
+            except (asyncio.TimeoutError, websockets.ConnectionClosed, ValueError):
+                break
+            now = time.monotonic()
+            messages += 1
+            size += len(raw)
+            if messages == 1:
+                continue    # the cached snapshot sent on connect
+            m = _VERSION.match(raw, 0, 80) if raw.startswith('{"type"') else None
+            t = published.get(int(m.group(1)) if m else raw)
+            if t is not None:
+                latencies.append(now - t)
+    return messages, size
+
+
+async def _run(port: int, clients: int, mode: str, seconds: float, published: dict) -> dict:
+    url = f"ws://127.0.0.1:{port}/ws?mode={mode}"
+    latencies: list[float] = []
+    t0 = time.monotonic()
+    counts = await asyncio.gather(
+        *(_client(url, seconds, latencies, published) for _ in range(clients)), return_exceptions=True
+    )
+    elapsed = time.monotonic() - t0
+    ok = [c for c in counts if not isinstance(c, BaseException)]
+    messages = sum(m for m, _ in ok)
+    size = sum(b for _, b in ok)
+    lat = np.array(latencies) * 1e3
+    row = {
+        "case": f"{mode}/{clients}c",
+        "mode": mode,
+        "clients": clients,
+        "errors": len(counts) - len(ok),
+        "messages": messages,
+        "msgs_per_s": round(messages / elapsed, 1),
+        "bytes_per_s": round(size / elapsed),
+        "avg_msg_bytes": round(size / messages) if messages else 0,
+    }
+    for q in (50, 95, 99):
+        row[f"latency_ms_p{q}"] = round(float(np.percentile(lat, q)), 2) if len(lat) else None
+    return row
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--clients", type=int, nargs="+", default=[1, 10, 100])
+    ap.add_argument("--modes", nargs="+", default=["delta", "full"], choices=["delta", "full"])
+    ap.add_argument("--seconds", type=float, default=10)
+    ap.add_argument("--poll", type=float, default=0.2, help="server poll interval")
+    ap.add_argument("--out", help="JSON path (default: benchmarks/results/ws-<time>.json)")
+    args = ap.parse_args()
+
+    for name in ("app", "fanout"):
+        logging.getLogger(name).setLevel(logging.WARNING)
+    dashboard.feed.backend = SyntheticBackend()
+    dashboard.POLL_INTERVAL = args.poll
+    published = _record_publishes()
+    port = _free_port()
+    server = _serve(port)
+    rows = []
+    try:
+        for mode in args.modes:
+            for n in args.clients:
+                row = asyncio.run(_run(port, n, mode, args.seconds, published))
+                print(
+                    f"{row['case']:<12} {row['msgs_per_s']:>8} msg/s {row['bytes_per_s'] / 1e3:>10.1f} kB/s"
+                    f"   latency p50 {row['latency_ms_p50']} p95 {row['latency_ms_p95']} p99 {row['latency_ms_p99']} ms"
+                    f"   errors {row['errors']}"
+                )
+                rows.append(row)
+    finally:
+        server.should_exit = True
+    save("ws", rows, vars(args), args.out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""FVG / order-block tracking: incremental ``ZoneTracker`` vs. rescanning every bar.
+
+Feeds 5-min bars one at a time. The rescan path re-detects every zone on
+the whole window and re-checks mitigation for each; the tracker only looks
+at the new bar. Also times "zones near price" against a linear scan over
+the active zones.
+"""
+
+import time
+
+import numpy as np
+
+from bar_buffer import Bars
+from benchmarks.synthetic import intraday_bars
+from config import PROXIMITY_PCT
+from timeframes import aggregate
+from zones import ZoneTracker, detect
+
+
+def _rescan(bars: Bars) -> int:
+    at, found = detect(Bars(*(a[:-1] for a in bars)), "5m")
+    after_lo = np.fmin.accumulate(bars.low[::-1])[::-1]
+    after_hi = np.fmax.accumulate(bars.high[::-1])[::-1]
+    active = 0
+    for k, z in zip(at.tolist(), found):
+        if z.direction == "bullish":
+            active += not after_lo[k + 1] < z.bottom
+        else:
+            active += not after_hi[k + 1] > z.top
+    return active
+
+
+def main(days: int = 30, steps: int = 500, queries: int = 20000) -> None:
+    bars = aggregate(Bars.from_frame(intraday_bars(days)), 5)
+    warm = len(bars) - steps
+    print(f"{len(bars)} 5-min bars, {steps} appended one at a time")
+
+    tracker = ZoneTracker("5m")
+    tracker.update(Bars(*(a[:warm] for a in bars)))
+    t0 = time.perf_counter()
+    for i in range(warm, len(bars)):
+        tracker.update(Bars(*(a[: i + 1] for a in bars)))
+    inc = (time.perf_counter() - t0) / steps
+
+    t0 = time.perf_counter()
+    for i in range(warm, len(bars)):
+        _rescan(Bars(*(a[: i + 1] for a in bars)))
+    full = (time.perf_counter() - t0) / steps
+    print(f"{'update':>8}  rescan {full * 1e6:8.0f} us   incremental {inc * 1e6:8.0f} us   {full / inc:5.1f}x")
+
+    zones = tracker.zones
+    prices = np.random.default_rng(0).uniform(bars.low.min(), bars.high.max(), queries).tolist()
+    t0 = time.perf_counter()
+    for p in prices:
+        tol = p * PROXIMITY_PCT
+        [z for z in zones if z.bottom - tol <= p <= z.top + tol]
+    scan = (time.perf_counter() - t0) / queries
+    t0 = time.perf_counter()
+    for p in prices:
+        tracker.near(p)
+    idx = (time.perf_counter() - t0) / queries
+    print(f"{'near':>8}  scan   {scan * 1e6:8.1f} us   indexed     {idx * 1e6:8.1f} us   ({len(zones)} active zones)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Compare two saved benchmark runs.
+
+Rows are matched on their ``case`` field; every numeric field that differs
+between the runs (i.e. the measurements, not the shared parameters) is
+printed with the new/old ratio.
+
+    python -m benchmarks.compare benchmarks/results/engine-A.json benchmarks/results/engine-B.json
+"""
+
+import argparse
+
+from benchmarks.results import load
+
+
+def compare(old: dict, new: dict) -> list[tuple[str, str, float, float]]:
+    before = {r["case"]: r for r in old["results"]}
+    out = []
+    for row in new["results"]:
+        prev = before.get(row["case"])
+        if prev is None:
+            continue
+        for key, v in row.items():
+            p = prev.get(key)
+            if key == "case" or isinstance(v, bool) or not isinstance(v, (int, float)) or not isinstance(p, (int, float)):
+                continue
+            if p == v:
+                continue
+            out.append((row["case"], key, p, v))
+    return out
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("old")
+    ap.add_argument("new")
+    args = ap.parse_args()
+    old, new = load(args.old), load(args.new)
+    print(f"{old['env'].get('commit')} → {new['env'].get('commit')}  ({old['benchmark']})")
+    for case, key, p, v in compare(old, new):
+        ratio = f"{v / p:6.2f}x" if p else "     -"
+        print(f"{case:<36} {key:<18} {p:>12.4g} {v:>12.4g}  {ratio}")
+
+
+if __name__ == "__main__":
+    main()
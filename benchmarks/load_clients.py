@@ -0,0 +1,116 @@
+"""Load test: hundreds of WebSocket clients, some deliberately slow.
+
+Starts the dashboard on a local port with the synthetic backend and a short
+poll interval, connects *clients* sockets (a fraction of which read only
+every few seconds) and reports how quickly each version reaches the fast
+clients, plus the server's per-client queue and eviction stats.
+
+    python -m benchmarks.load_clients --clients 300 --slow 0.1 --seconds 15
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import socket
+import statistics
+import threading
+import time
+import urllib.request
+
+import uvicorn
+import websockets
+
+import config
+
+# synthetic bars must not reach the user's bar cache, snapshot or alert log
+config.SNAPSHOT_CACHE = ""
+config.BAR_CACHE_DIR = ""
+config.ALERT_LOG = ""
+
+import app as dashboard
+from benchmarks.synthetic import SyntheticBackend
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _serve(port: int) -> uvicorn.Server:
+    server = uvicorn.Server(uvicorn.Config(dashboard.app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+async def _client(url: str, slow: bool, seconds: float, arrivals: dict[int, list[float]]) -> int:
+    received = 0
+    deadline = time.monotonic() + seconds
+    async with websockets.connect(url, max_queue=1 if slow else 64, max_size=None) as ws:
+        while time.monotonic() < deadline:
+            try:
+                raw = await asyncio.wait_for(ws.recv(), deadline - time.monotonic())
+            except (asyncio.TimeoutError, websockets.ConnectionClosed):
+                break
+            received += 1
+            if slow:
+                await asyncio.sleep(3)
+            else:
+                arrivals.setdefault(json.loads(raw)["version"], []).append(time.monotonic())
+    return received
+
+
+async def _run(port: int, clients: int, slow_frac: float, seconds: float) -> dict:
+    url = f"ws://127.0.0.1:{port}/ws?mode=delta"
+    arrivals: dict[int, list[float]] = {}
+    n_slow = int(clients * slow_frac)
+    tasks = [_client(url, i < n_slow, seconds, arrivals) for i in range(clients)]
+
+    async def probe() -> dict:
+        # sample server-side stats while everyone is still connected
+        await asyncio.sleep(seconds * 0.8)
+        raw = await asyncio.to_thread(urllib.request.urlopen, f"http://127.0.0.1:{port}/clients")
+        return json.loads(raw.read())
+
+    stats, *counts = await asyncio.gather(probe(), *tasks, return_exceptions=True)
+    spreads = [max(t) - min(t) for t in arrivals.values() if len(t) > 1]
+    return {
+        "clients": clients,
+        "slow_clients": n_slow,
+        "errors": sum(isinstance(c, Exception) for c in counts),
+        "versions_seen": len(arrivals),
+        "fanout_spread_ms_p50": round(statistics.median(spreads) * 1e3, 2) if spreads else None,
+        "fanout_spread_ms_max": round(max(spreads) * 1e3, 2) if spreads else None,
+        "server_clients": len(stats["clients"]),
+        "server_evicted": stats["evicted"],
+        "server_max_lag_s": max((c["lag_s"] for c in stats["clients"]), default=0),
+        "server_max_queue_depth": max((c["queue_depth"] for c in stats["clients"]), default=0),
+        "server_dropped_total": sum(c["dropped"] for c in stats["clients"]),
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--clients", type=int, default=300)
+    ap.add_argument("--slow", type=float, default=0.1, help="fraction of slow clients")
+    ap.add_argument("--seconds", type=float, default=15)
+    ap.add_argument("--poll", type=float, default=0.5, help="server poll interval")
+    args = ap.parse_args()
+
+    for name in ("app", "fanout"):
+        logging.getLogger(name).setLevel(logging.WARNING)
+    dashboard.feed.backend = SyntheticBackend()
+    dashboard.POLL_INTERVAL = args.poll
+    port = _free_port()
+    server = _serve(port)
+    try:
+        print(json.dumps(asyncio.run(_run(port, args.clients, args.slow, args.seconds)), indent=2))
+    finally:
+        server.should_exit = True
+
+
+if __name__ == "__main__":
+    main()
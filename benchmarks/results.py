@@ -0,0 +1,64 @@
+"""Save benchmark runs as JSON so results can be compared across commits.
+
+Each run is written to ``benchmarks/results/<name>-<UTC timestamp>.json``
+with the environment it ran in; ``python -m benchmarks.compare`` diffs two
+of them.
+"""
+
+import json
+import os
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+
+def _commit() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).parent, capture_output=True, text=True, timeout=5,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def environment() -> dict:
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "commit": _commit(),
+    }
+
+
+def save(name: str, rows: list[dict], params: dict | None = None, out: str | Path | None = None) -> Path:
+    """Write *rows* (one dict per measurement) plus run metadata; returns the path."""
+    stamp = datetime.now(timezone.utc)
+    path = Path(out) if out else RESULTS_DIR / f"{name}-{stamp:%Y%m%dT%H%M%SZ}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    doc = {
+        "benchmark": name,
+        "time": stamp.isoformat(timespec="seconds"),
+        "argv": sys.argv[1:],
+        "params": params or {},
+        "env": environment(),
+        "results": rows,
+    }
+    path.write_text(json.dumps(doc, indent=2) + "\n")
+    print(f"saved {path}")
+    return path
+
+
+def load(path: str | Path) -> dict:
+    return json.loads(Path(path).read_text())
@@ -0,0 +1,126 @@
+"""Deterministic synthetic 1-min futures bars for offline benchmarks."""
+
+import numpy as np
+import pandas as pd
+
+from config import TIMEZONE
+from session_calendar import cme_schedule
+
+# Relative 1-min volatility by ET wall-clock time: a quiet Asia session,
+# London picking up, a spike into the NY open, a lunch lull and a PM session.
+_VOL_PROFILE = [
+    ((0, 0), 0.45), ((2, 0), 0.9), ((5, 0), 0.6), ((8, 30), 1.3), ((9, 30), 2.2),
+    ((10, 30), 1.4), ((12, 0), 0.7), ((13, 30), 1.1), ((15, 0), 1.3), ((16, 0), 0.6),
+    ((18, 0), 0.7), ((19, 0), 0.45),
+]
+
+
+def _profile() -> np.ndarray:
+    """Volatility multiplier for each minute of the ET day."""
+    out = np.empty(1440)
+    marks = [(h * 60 + m, v) for (h, m), v in _VOL_PROFILE] + [(1440, None)]
+    for (a, v), (b, _) in zip(marks, marks[1:]):
+        out[a:b] = v
+    return out
+
+
+def _halted(idx: pd.DatetimeIndex) -> np.ndarray:
+    """Bars outside CME Globex hours: the daily 17:00–18:00 halt, weekends,
+    holiday closures, 13:00 holiday halts and 13:15 early closes."""
+    if not len(idx):
+        return np.zeros(0, dtype=bool)
+    wd, hr, md = idx.weekday, idx.hour, idx.hour * 60 + idx.minute
+    out = (hr == 17) | ((wd == 4) & (hr >= 17)) | (wd == 5) | ((wd == 6) & (hr < 18))
+    days = idx.normalize().tz_localize(None)
+    trade_days = (idx + pd.Timedelta(hours=6)).normalize().tz_localize(None)   # 18:00 → next date
+    for year in range(idx[0].year, idx[-1].year + 1):
+        closed, halted, early = (pd.DatetimeIndex(sorted(d)) for d in cme_schedule(year))
+        out |= trade_days.isin(closed)
+        out |= days.isin(halted) & (md >= 13 * 60) & (md < 18 * 60)
+        out |= days.isin(early) & (md >= 13 * 60 + 15) & (md < 18 * 60)
+    return np.asarray(out)
+
+
+def intraday_bars(days: int, seed: int = 0, start: str = "2024-01-07 18:00", base: float = 17000.0) -> pd.DataFrame:
+    """*days* calendar days of 1-min OHLCV bars on the CME Globex schedule.
+
+    Deterministic for a given *seed*. Returns follow a random walk whose
+    volatility and volume follow the ET session profile, NY sessions carry
+    a random per-day drift (trend vs. range days), and each reopen after a
+    halt, weekend or holiday gaps away from the previous close.
+    """
+    rng = np.random.default_rng(seed)
+    idx = pd.date_range(pd.Timestamp(start, tz=TIMEZONE), periods=days * 1440, freq="1min")
+    idx = idx[~_halted(idx)]
+
+    n = len(idx)
+    md = np.asarray(idx.hour * 60 + idx.minute)
+    vol = _profile()[md]
+    step = rng.normal(0.0, base * 1.2e-4, n) * vol
+
+    # trend or range day: a drift through each NY session
+    day_no = np.asarray((idx.normalize() - idx.normalize().min()).days) if n else np.zeros(0, dtype=np.int64)
+    drift = rng.normal(0.0, base * 1.5e-5, day_no[-1] + 1 if n else 0)
+    ny = (md >= 9 * 60 + 30) & (md < 16 * 60)
+    step[ny] += drift[day_no[ny]]
+
+    # overnight / weekend / holiday gaps at each reopen
+    ts = idx.as_unit("ns").asi8
+    gap_min = np.r_[0, np.diff(ts) // 60_000_000_000] if n else ts
+    reopen = gap_min > 1
+    gap = rng.normal(0.0, base * 8e-4, reopen.sum()) * np.sqrt(gap_min[reopen] / 60.0)
+    step[reopen] += gap
+
+    close = base + np.cumsum(step)
+    open_ = np.r_[close[0], close[:-1]] if n else close
+    open_[reopen] += gap
+    wick = np.abs(rng.normal(0.0, base * 0.8e-4, (2, n))) * vol
+    return pd.DataFrame(
+        {
+            "Open": open_,
+            "High": np.maximum(open_, close) + wick[0],
+            "Low": np.minimum(open_, close) - wick[1],
+            "Close": close,
+            "Volume": np.maximum(1, rng.gamma(2.0, 120.0, n) * vol).round(),
+        },
+        index=idx,
+    )
+
+
+def periodic_bars(df: pd.DataFrame, interval: str) -> pd.DataFrame:
+    """Daily (``"1d"``) or weekly bars rolled up from 1-min *df*."""
+    rule = "1D" if interval == "1d" else "W"
+    return df.resample(rule).agg({"Open": "first", "High": "max", "Low": "min", "Close": "last"}).dropna()
+
+
+class SyntheticBackend:
+    """Offline ``DataFeed`` backend serving synthetic bars.
+
+    Intraday requests return the bars up to "now" on a clock that starts at
+    the end of the first *warmup_days* and advances one bar per call, so
+    every poll sees new data.
+    """
+
+    def __init__(self, days: int = 6, warmup_days: int = 5, seed: int = 0):
+        self._bars: dict[str, pd.DataFrame] = {}
+        self._days = days
+        self._warmup = warmup_days
+        self._seed = seed
+        self._pos: dict[str, int] = {}
+
+    def _frame(self, ticker: str) -> pd.DataFrame:
+        if ticker not in self._bars:
+            seed = self._seed + sum(map(ord, ticker))
+            self._bars[ticker] = intraday_bars(self._days, seed=seed)
+        return self._bars[ticker]
+
+    def history(self, ticker, interval, period=None, start=None, prepost=False) -> pd.DataFrame:
+        df = self._frame(ticker)
+        if interval != "1m":
+            return periodic_bars(df, interval)
+        first = df.index.searchsorted(df.index[0] + pd.Timedelta(days=self._warmup))
+        pos = self._pos[ticker] = min(self._pos.get(ticker, first) + 1, len(df))
+        out = df.iloc[:pos]
+        if start is not None:
+            out = out.loc[start:]
+        return out.copy()
@@ -7,6 +7,95 @@ TICKER_LABELS = {"NQ=F": "NQ", "ES=F": "ES"}
 # Poll interval (seconds)
 POLL_INTERVAL = 30
 
+# Intraday fetching — incremental mode keeps a rolling per-ticker bar store
+# and only requests bars newer than the last one held.
+INTRADAY_INCREMENTAL = True
+INTRADAY_WINDOW_DAYS = 7    # calendar days of 1-min history kept per ticker
+INTRADAY_OVERLAP_MIN = 5    # minutes re-requested to reconcile revised bars
+
+# Feed mode — "poll" fetches every POLL_INTERVAL seconds; "stream" consumes
+# pushed ticks, aggregates them into 1-min bars and recomputes on each bar
+# close or at most every STREAM_THROTTLE seconds while ticks arrive.
+FEED_MODE = "poll"
+STREAM_THROTTLE = 0.5       # seconds
+STREAM_SIM_RATE = 10        # ticks/s per ticker from the built-in simulator
+
+# Fetching — tickers are requested concurrently on a bounded thread pool.
+# "ticker" sends one request per symbol; "bulk" uses yfinance's
+# multi-ticker download for each interval.
+FETCH_BACKEND = "ticker"
+FETCH_WORKERS = 8
+FETCH_TIMEOUT = 10          # seconds per request
+
+# On-disk bar cache (Arrow files; needs pyarrow, "" disables). Restarts load
+# bars from here and only top up what is missing. The intraday window is
+# written at most every BAR_CACHE_SAVE_INTERVAL seconds and on shutdown.
+BAR_CACHE_DIR = "~/.ict_dashboard/bars"
+BAR_CACHE_SAVE_INTERVAL = 300  # seconds
+
+# Startup snapshot — the latest metrics are saved here at most every
+# SNAPSHOT_CACHE_INTERVAL seconds and on shutdown, and served (flagged
+# "stale") to clients that connect before the first compute ("" disables).
+SNAPSHOT_CACHE = "~/.ict_dashboard/snapshot.json"
+SNAPSHOT_CACHE_INTERVAL = 30  # seconds
+
+# Engine — streaming mode keeps session state between polls and only folds
+# in new bars; batch mode rescans the whole intraday frame every time.
+STREAMING_ENGINE = True
+
+# Engine memo — sub-results that only change with the daily/weekly candles
+# or once a minute (key levels, previous close, kill zones, macros) are kept
+# per input frame and date/minute, up to ENGINE_MEMO_SIZE entries (0 disables).
+ENGINE_MEMO_SIZE = 256
+
+# Engine workers — 0 computes in a thread beside the event loop; N shards the
+# tickers over N worker processes that each keep their tickers' bars and
+# engine state, so only new bars go out and per-ticker payloads come back.
+ENGINE_WORKERS = 0
+
+# Alerts — a bar whose high-low range reaches a level (previous day/week
+# levels, key opens, session highs/lows, OTE fibs) raises a "cross" alert;
+# one within PROXIMITY_PCT of it an "approach". A level alerts again only
+# after ALERT_COOLDOWN seconds, and each symbol raises at most ALERT_BURST
+# alerts at once, refilled at ALERT_RATE per minute. Alerts are appended to
+# ALERT_LOG ("" disables) and the last ALERT_HISTORY are served on /alerts.
+ALERTS = True
+ALERT_COOLDOWN = 300        # seconds of bar time
+ALERT_RATE = 6              # per symbol per minute
+ALERT_BURST = 10
+ALERT_LOG = "~/.ict_dashboard/alerts.jsonl"
+ALERT_HISTORY = 500
+
+# Historical queries — /history/bars and /history/levels serve the last
+# HISTORY_DAYS of 1-min bars per symbol, kept beyond the feed's intraday
+# window, loaded from BAR_CACHE_DIR on first use and saved there on shutdown.
+# Responses stream HISTORY_CHUNK_ROWS rows at a time.
+HISTORY_DAYS = 30
+HISTORY_CHUNK_ROWS = 5000
+
+# WebSocket fan-out — every client has its own bounded send queue.
+# "coalesce" keeps only the latest pending update for a slow client,
+# "drop_oldest" keeps up to SEND_QUEUE_SIZE and discards the oldest.
+SEND_QUEUE_SIZE = 8
+SEND_TIMEOUT = 5            # seconds per send
+SLOW_CLIENT_POLICY = "coalesce"
+MAX_CLIENT_LAG = 60         # seconds behind before a client is evicted
+
+# Wire encoding — "auto" picks the fastest JSON library installed (orjson,
+# msgspec, then the stdlib); name one to force it. Clients connecting with
+# /ws?format=msgpack get binary MessagePack frames if msgspec or msgpack is
+# installed, JSON otherwise.
+JSON_ENCODER = "auto"
+
+# Instrumentation — each pipeline stage keeps its last METRICS_WINDOW
+# durations for the p50/p95/p99 served on /metrics. PROFILE_SAMPLING starts
+# a stack-sampling profiler whose collapsed stacks are served on
+# /debug/profile and written to PROFILE_DUMP on shutdown.
+METRICS_WINDOW = 1024       # samples per histogram
+PROFILE_SAMPLING = False
+PROFILE_INTERVAL = 0.01     # seconds between stack samples
+PROFILE_DUMP = "~/.ict_dashboard/profile.txt"
+
 # Timezone
 TIMEZONE = "US/Eastern"
 
@@ -36,11 +125,23 @@ KEY_OPENS = [
     {"label": "13:00 PM Open",       "hour": 13, "minute": 0},
 ]
 
+# Higher timeframes built incrementally from the 1-min bars (label → minutes),
+# aligned to the 18:00 futures open. OTE runs on each of OTE_TIMEFRAMES; the
+# first is the ticker's "ote", the others are reported under "ote_htf".
+TIMEFRAMES = {"5m": 5, "15m": 15, "1h": 60, "4h": 240}
+OTE_TIMEFRAMES = ["5m", "15m", "1h", "4h"]
+
+# Fair Value Gaps and order blocks — detected on ZONE_TIMEFRAMES and kept
+# until price trades through them. Each ticker lists the zones near price
+# first, then the most recently formed, up to ZONE_LIMIT.
+ZONE_TIMEFRAMES = ["5m", "15m", "1h"]
+ZONE_LIMIT = 8
+
 # OTE Fibonacci levels
 OTE_FIBS = [0.618, 0.705, 0.786]
 
 # Proximity threshold (0.1%)
 PROXIMITY_PCT = 0.001
 
-# Swing lookback for pivot detection (bars on each side, 5-min chart)
+# Swing lookback for pivot detection (bars on each side, per OTE timeframe)
 SWING_LOOKBACK = 5
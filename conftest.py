@@ -0,0 +1,7 @@
+"""pytest setup: import the top-level modules and keep tests off the user's caches."""
+
+import config
+
+config.SNAPSHOT_CACHE = ""
+config.BAR_CACHE_DIR = ""
+config.ALERT_LOG = ""
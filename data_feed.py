@@ -1,62 +1,333 @@
 """Yahoo Finance data feed with caching."""
 
 import logging
+import threading
+import time
+from collections.abc import Collection
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from datetime import datetime
 
 import pandas as pd
 import pytz
 import yfinance as yf
 
-from config import TICKERS, TIMEZONE
+from bar_buffer import BarBuffer, Bars
+from bar_cache import BarCache
+from config import (
+    BAR_CACHE_SAVE_INTERVAL,
+    FETCH_BACKEND,
+    FETCH_TIMEOUT,
+    FETCH_WORKERS,
+    INTRADAY_INCREMENTAL,
+    INTRADAY_OVERLAP_MIN,
+    INTRADAY_WINDOW_DAYS,
+    TICKERS,
+    TIMEZONE,
+)
+from telemetry import REGISTRY, timed
 
 logger = logging.getLogger(__name__)
 ET = pytz.timezone(TIMEZONE)
 
+_DAILY_TTL = 300
+_WEEKLY_TTL = 1800
+
+_MINUTE_NS = 60 * 10**9
+_DAY_NS = 1440 * _MINUTE_NS
+_INTRADAY_CAPACITY = INTRADAY_WINDOW_DAYS * 1440
+
+
+# ── fetch backends ───────────────────────────────────────────────────
+class YahooBackend:
+    """Default fetch backend: one ``yfinance`` request per ticker.
+
+    Any object with the same ``history`` signature can be passed to
+    ``DataFeed`` instead, e.g. a fake source serving canned frames offline.
+    """
+
+    def __init__(self, timeout: float = FETCH_TIMEOUT):
+        self.timeout = timeout
+
+    def history(
+        self,
+        ticker: str,
+        interval: str,
+        period: str | None = None,
+        start: datetime | None = None,
+        prepost: bool = False,
+    ) -> pd.DataFrame:
+        kwargs = {"interval": interval, "prepost": prepost, "timeout": self.timeout}
+        if start is not None:
+            return yf.Ticker(ticker).history(start=start, **kwargs)
+        return yf.Ticker(ticker).history(period=period, **kwargs)
+
+
+class YahooBulkBackend(YahooBackend):
+    """Backend that also fetches many tickers in one ``yf.download`` call.
+
+    ``DataFeed`` uses ``history_many`` whenever the backend provides it.
+    """
+
+    def history_many(
+        self,
+        tickers: list[str],
+        interval: str,
+        period: str | None = None,
+        start: datetime | None = None,
+        prepost: bool = False,
+    ) -> dict[str, pd.DataFrame]:
+        kwargs = {
+            "interval": interval,
+            "prepost": prepost,
+            "timeout": self.timeout,
+            "group_by": "ticker",
+            "threads": True,
+            "progress": False,
+            "auto_adjust": True,
+        }
+        if start is not None:
+            raw = yf.download(tickers, start=start, **kwargs)
+        else:
+            raw = yf.download(tickers, period=period, **kwargs)
+        out: dict[str, pd.DataFrame] = {}
+        if raw is None or raw.empty:
+            return out
+        for ticker in tickers:
+            if ticker in raw.columns.get_level_values(0):
+                df = raw[ticker].dropna(how="all")
+                df.columns.name = None
+                out[ticker] = df
+        return out
+
+
+@timed("ict_stage_seconds", stage="tz_convert")
+def _to_et(df: pd.DataFrame) -> pd.DataFrame:
+    if df.index.tz is not None:
+        df.index = df.index.tz_convert(ET)
+    else:
+        df.index = df.index.tz_localize(ET)
+    return df
+
 
 class DataFeed:
-    def __init__(self):
+    def __init__(
+        self,
+        backend=None,
+        incremental: bool = INTRADAY_INCREMENTAL,
+        workers: int = FETCH_WORKERS,
+        cache: BarCache | None = None,
+        tickers: list[str] | None = None,
+    ):
+        if backend is None:
+            backend = YahooBulkBackend() if FETCH_BACKEND == "bulk" else YahooBackend()
+        self.backend = backend
+        self.tickers = list(tickers) if tickers is not None else list(TICKERS)
+        self.cache = cache if cache is not None else BarCache()
+        self.incremental = incremental
+        self.workers = workers
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="fetch")
+        # (kind, ticker) with a request still running; a timed-out one keeps running
+        self._inflight: set[tuple[str, str]] = set()
+        self._inflight_lock = threading.Lock()
+        self._intraday_store: dict[str, BarBuffer] = {}
+        self._unsaved: dict[str, Bars] = {}     # intraday bars fetched since the last cache save
+        self._saved_at = time.monotonic()
         self._daily_cache: dict[str, pd.DataFrame] = {}
         self._weekly_cache: dict[str, pd.DataFrame] = {}
         self._daily_ts: datetime | None = None
         self._weekly_ts: datetime | None = None
+        # Seconds taken by the latest request, by kind then ticker
+        self.timings: dict[str, dict[str, float]] = {"intraday": {}, "daily": {}, "weekly": {}}
 
-    # ------------------------------------------------------------------
-    def fetch_intraday(self) -> dict[str, pd.DataFrame]:
-        """1-min candles for the last 5 days (max 7d for 1m on yfinance)."""
+    # ── concurrency ──────────────────────────────────────────────────
+    def _submit(self, kind: str, tickers: list[str], fn) -> list[tuple[list[str], Future]]:
+        """Run ``fn(tickers)`` on the pool — once per ticker, or once for all
+        of them when the backend can fetch in bulk.
+
+        Tickers whose previous *kind* request is still running are skipped,
+        so two threads never write the same ticker's bars.
+        """
+        with self._inflight_lock:
+            busy = [t for t in tickers if (kind, t) in self._inflight]
+            tickers = [t for t in tickers if (kind, t) not in self._inflight]
+            self._inflight.update((kind, t) for t in tickers)
+        if busy:
+            logger.warning("%s fetch still running for %s; skipping it this time", kind.capitalize(), ", ".join(busy))
+        groups = [tickers] if hasattr(self.backend, "history_many") else [[t] for t in tickers]
+        jobs = []
+        for g in groups:
+            if g:
+                fut = self._pool.submit(self._timed, kind, g, fn)
+                fut.add_done_callback(lambda _, kind=kind, g=g: self._release(kind, g))
+                jobs.append((g, fut))
+        return jobs
+
+    def _release(self, kind: str, tickers: list[str]) -> None:
+        with self._inflight_lock:
+            self._inflight.difference_update((kind, t) for t in tickers)
+
+    def _timed(self, kind: str, tickers: list[str], fn) -> dict[str, pd.DataFrame]:
+        t0 = time.perf_counter()
+        try:
+            return fn(tickers)
+        finally:
+            elapsed = time.perf_counter() - t0
+            for ticker in tickers:
+                self.timings[kind][ticker] = elapsed
+                REGISTRY.observe("ict_fetch_seconds", elapsed, kind=kind, ticker=ticker)
+                logger.debug("%s fetch for %s took %.3fs", kind, ticker, elapsed)
+
+    def _gather(self, kind: str, jobs: list[tuple[list[str], Future]]) -> dict[str, pd.DataFrame]:
+        """Collect results; a failed or timed-out request only drops its own tickers."""
+        waves = -(-len(jobs) // self.workers) or 1
+        wait([f for _, f in jobs], timeout=FETCH_TIMEOUT * waves)
         out: dict[str, pd.DataFrame] = {}
-        for ticker in TICKERS:
+        for tickers, fut in jobs:
+            if not fut.done():
+                fut.cancel()    # only stops it if it has not started; see _submit
+                logger.warning("%s fetch timed out for %s", kind.capitalize(), ", ".join(tickers))
+                continue
             try:
-                df = yf.Ticker(ticker).history(
-                    period="5d", interval="1m", prepost=True
-                )
-                if df.empty:
-                    continue
-                # Ensure ET timezone
-                if df.index.tz is not None:
-                    df.index = df.index.tz_convert(ET)
-                else:
-                    df.index = df.index.tz_localize(ET)
-                out[ticker] = df
+                out.update(fut.result())
             except Exception as e:
-                logger.warning("Intraday fetch failed for %s: %s", ticker, e)
+                logger.warning("%s fetch failed for %s: %s", kind.capitalize(), ", ".join(tickers), e)
         return out
 
+    def _history(self, tickers: list[str], interval: str, **kwargs) -> dict[str, pd.DataFrame]:
+        if hasattr(self.backend, "history_many"):
+            return self.backend.history_many(tickers, interval, **kwargs)
+        return {t: self.backend.history(t, interval, **kwargs) for t in tickers}
+
     # ------------------------------------------------------------------
+    def fetch_intraday(self, tickers: Collection[str] | None = None) -> dict[str, Bars]:
+        """1-min candles for the last 5 days (max 7d for 1m on yfinance).
+
+        In incremental mode each ticker's bars live in a ``BarBuffer``; only
+        bars newer than the last held timestamp (minus a small overlap) are
+        requested and appended, and the result is a zero-copy view of it.
+        """
+        out = self._gather("intraday", self._submit_intraday(tickers))
+        self._save_due()
+        return out
+
+    def _submit_intraday(self, tickers: Collection[str] | None = None) -> list[tuple[list[str], Future]]:
+        wanted = [t for t in self.tickers if tickers is None or t in tickers]
+        return self._submit("intraday", wanted, self._fetch_intraday_group)
+
+    def _fetch_intraday_group(self, tickers: list[str]) -> dict[str, Bars]:
+        now = pd.Timestamp.now(tz="UTC").value
+        window = INTRADAY_WINDOW_DAYS * _DAY_NS
+        fresh, topup = [], {}
+        for ticker in tickers:
+            held = self._intraday_store.get(ticker) if self.incremental else None
+            if held is None and self.incremental:
+                cached = self.cache.load_bars(ticker, "1m")
+                if cached is not None and not cached.empty:
+                    held = self._intraday_store[ticker] = BarBuffer(_INTRADAY_CAPACITY)
+                    held.extend(cached)
+            if held is None or not len(held) or now - held.last_ts > window:
+                fresh.append(ticker)  # nothing usable to top up; start over
+            else:
+                topup[ticker] = held
+
+        fetched: dict[str, Bars] = {}
+        if fresh:
+            for ticker, df in self._history(fresh, "1m", period="5d", prepost=True).items():
+                if df.empty:
+                    continue
+                bars = Bars.from_frame(_to_et(df))
+                if self.incremental:
+                    buf = self._intraday_store[ticker] = BarBuffer(_INTRADAY_CAPACITY)
+                    buf.extend(bars)
+                    bars = self._trimmed(buf)
+                fetched[ticker] = bars
+        if topup:
+            since = min(buf.last_ts for buf in topup.values()) - INTRADAY_OVERLAP_MIN * _MINUTE_NS
+            since = pd.Timestamp(since, tz="UTC").tz_convert(ET).to_pydatetime()
+            new = self._history(list(topup), "1m", start=since, prepost=True)
+            for ticker, buf in topup.items():
+                df = new.get(ticker)
+                if df is not None and not df.empty:
+                    # overlapping bars are replaced by the refetch
+                    buf.extend(Bars.from_frame(_to_et(df)))
+                fetched[ticker] = self._trimmed(buf)
+
+        self._unsaved.update(fetched)
+        return fetched
+
+    def save(self) -> None:
+        """Write the intraday bars fetched since the last save to the bar cache."""
+        self._saved_at = time.monotonic()
+        unsaved, self._unsaved = self._unsaved, {}
+        for ticker, bars in unsaved.items():
+            # hold the ticker like a fetch would, so none writes its buffer meanwhile
+            with self._inflight_lock:
+                busy = ("intraday", ticker) in self._inflight
+                self._inflight.add(("intraday", ticker))
+            if busy:
+                self._unsaved.setdefault(ticker, bars)      # next time
+                continue
+            try:
+                buf = self._intraday_store.get(ticker)
+                self.cache.save(ticker, "1m", buf.view() if buf is not None else bars)
+            finally:
+                self._release("intraday", [ticker])
+
+    def _save_due(self) -> None:
+        """``save`` every ``BAR_CACHE_SAVE_INTERVAL`` seconds, after a fetch rather than inside one."""
+        if self._unsaved and time.monotonic() - self._saved_at >= BAR_CACHE_SAVE_INTERVAL:
+            self.save()
+
+    @staticmethod
+    def _trimmed(buf: BarBuffer) -> Bars:
+        """Evict bars older than the intraday window and return the rest."""
+        buf.drop_before(buf.last_ts - INTRADAY_WINDOW_DAYS * _DAY_NS)
+        return buf.view()
+
+    # ------------------------------------------------------------------
+    def _fetch_periodic_group(self, interval: str, period: str):
+        def fn(tickers: list[str]) -> dict[str, pd.DataFrame]:
+            out = {t: df for t, df in self._history(tickers, interval, period=period).items() if not df.empty}
+            for ticker, df in out.items():
+                self.cache.save(ticker, interval, df)
+            return out
+        return fn
+
+    def _load_periodic(self, interval: str) -> tuple[dict[str, pd.DataFrame], datetime | None]:
+        """Daily/weekly frames from the disk cache, stamped with the oldest fetch time."""
+        out: dict[str, pd.DataFrame] = {}
+        stamps: list[float] = []
+        for ticker in self.tickers:
+            df, fetched_at = self.cache.load(ticker, interval)
+            if df is None:
+                return {}, None
+            out[ticker] = df
+            stamps.append(fetched_at)
+        return out, datetime.fromtimestamp(min(stamps)) if stamps else None
+
+    def _warm_start(self) -> None:
+        """On first use, adopt cached daily/weekly frames that are still fresh."""
+        if self._daily_ts is None:
+            self._daily_cache, self._daily_ts = self._load_periodic("1d")
+        if self._weekly_ts is None:
+            self._weekly_cache, self._weekly_ts = self._load_periodic("1wk")
+
+    @staticmethod
+    def _due(ts: datetime | None, ttl: float, now: datetime) -> bool:
+        return ts is None or (now - ts).total_seconds() >= ttl
+
     def fetch_daily(self) -> dict[str, pd.DataFrame]:
         """Daily candles, cached for 5 minutes."""
+        self._warm_start()
         now = datetime.now()
-        if self._daily_ts and (now - self._daily_ts).total_seconds() < 300:
+        if not self._due(self._daily_ts, _DAILY_TTL, now):
             return self._daily_cache
+        return self._store_daily(self._gather("daily", self._submit_daily()), now)
 
-        out: dict[str, pd.DataFrame] = {}
-        for ticker in TICKERS:
-            try:
-                df = yf.Ticker(ticker).history(period="1mo", interval="1d")
-                if not df.empty:
-                    out[ticker] = df
-            except Exception as e:
-                logger.warning("Daily fetch failed for %s: %s", ticker, e)
+    def _submit_daily(self) -> list[tuple[list[str], Future]]:
+        return self._submit("daily", list(self.tickers), self._fetch_periodic_group("1d", "1mo"))
 
+    def _store_daily(self, out: dict[str, pd.DataFrame], now: datetime) -> dict[str, pd.DataFrame]:
         self._daily_cache = out
         self._daily_ts = now
         return out
@@ -64,27 +335,36 @@ class DataFeed:
     # ------------------------------------------------------------------
     def fetch_weekly(self) -> dict[str, pd.DataFrame]:
         """Weekly candles, cached for 30 minutes."""
+        self._warm_start()
         now = datetime.now()
-        if self._weekly_ts and (now - self._weekly_ts).total_seconds() < 1800:
+        if not self._due(self._weekly_ts, _WEEKLY_TTL, now):
             return self._weekly_cache
+        return self._store_weekly(self._gather("weekly", self._submit_weekly()), now)
 
-        out: dict[str, pd.DataFrame] = {}
-        for ticker in TICKERS:
-            try:
-                df = yf.Ticker(ticker).history(period="3mo", interval="1wk")
-                if not df.empty:
-                    out[ticker] = df
-            except Exception as e:
-                logger.warning("Weekly fetch failed for %s: %s", ticker, e)
+    def _submit_weekly(self) -> list[tuple[list[str], Future]]:
+        return self._submit("weekly", list(self.tickers), self._fetch_periodic_group("1wk", "3mo"))
 
+    def _store_weekly(self, out: dict[str, pd.DataFrame], now: datetime) -> dict[str, pd.DataFrame]:
         self._weekly_cache = out
         self._weekly_ts = now
         return out
 
     # ------------------------------------------------------------------
-    def fetch_all(self) -> dict:
+    def fetch_all(self, tickers: Collection[str] | None = None) -> dict:
+        """Intraday for *tickers* (default: all) plus any expired daily/weekly data, all requested at once.
+
+        Daily and weekly frames are cheap and cached, so they are always kept
+        for every ticker.
+        """
+        self._warm_start()
+        now = datetime.now()
+        intraday = self._submit_intraday(tickers)
+        daily = self._submit_daily() if self._due(self._daily_ts, _DAILY_TTL, now) else None
+        weekly = self._submit_weekly() if self._due(self._weekly_ts, _WEEKLY_TTL, now) else None
+        intraday = self._gather("intraday", intraday)
+        self._save_due()
         return {
-            "intraday": self.fetch_intraday(),
-            "daily": self.fetch_daily(),
-            "weekly": self.fetch_weekly(),
+            "intraday": intraday,
+            "daily": self._store_daily(self._gather("daily", daily), now) if daily is not None else self._daily_cache,
+            "weekly": self._store_weekly(self._gather("weekly", weekly), now) if weekly is not None else self._weekly_cache,
         }
@@ -0,0 +1,47 @@
+"""Path-based diffs between successive metrics snapshots.
+
+A patch is a list of ops. ``[path, value]`` sets the value at *path* and
+``[path]`` deletes it; *path* is a list of dict keys / list indices and an
+empty path replaces the whole document. Lists whose length changed are
+replaced wholesale.
+"""
+
+
+def diff(old, new) -> list[list]:
+    ops: list[list] = []
+    _diff(old, new, [], ops)
+    return ops
+
+
+def _diff(a, b, path: list, ops: list[list]) -> None:
+    if type(a) is dict and type(b) is dict:
+        for k, v in b.items():
+            if k in a:
+                _diff(a[k], v, path + [k], ops)
+            else:
+                ops.append([path + [k], v])
+        for k in a:
+            if k not in b:
+                ops.append([path + [k]])
+    elif type(a) is list and type(b) is list and len(a) == len(b):
+        for i, (x, y) in enumerate(zip(a, b)):
+            _diff(x, y, path + [i], ops)
+    elif type(a) is not type(b) or a != b:
+        ops.append([path, b])
+
+
+def apply(doc, ops: list[list]):
+    """Apply *ops* to *doc* in place and return the (possibly new) root."""
+    for op in ops:
+        path = op[0]
+        if not path:
+            doc = op[1]
+            continue
+        parent = doc
+        for k in path[:-1]:
+            parent = parent[k]
+        if len(op) == 1:
+            del parent[path[-1]]
+        else:
+            parent[path[-1]] = op[1]
+    return doc
@@ -0,0 +1,63 @@
+"""Desktop entry point: the native window first, the server behind it.
+
+The pywebview window opens on a placeholder page straight away while the
+server thread imports the app and starts uvicorn. Uvicorn sets a
+``threading.Event`` once it is listening and the window then loads the
+dashboard, which is served the cached snapshot until the first live
+compute lands. Nothing polls the server over HTTP.
+"""
+
+import logging
+import threading
+
+HOST, PORT = "127.0.0.1", 8000
+URL = f"http://{HOST}:{PORT}"
+TITLE = "ICT Dashboard — NQ & ES"
+READY_TIMEOUT = 30     # seconds
+
+_SPLASH = """<!doctype html><html><body style="margin:0;height:100vh;display:flex;
+align-items:center;justify-content:center;background:#0b0b11;color:#6b7280;
+font:600 12px system-ui,sans-serif;letter-spacing:.1em">STARTING…</body></html>"""
+
+logger = logging.getLogger(__name__)
+
+
+def serve(ready: threading.Event, app=None, host: str = HOST, port: int = PORT) -> None:
+    """Run uvicorn, setting *ready* once it accepts connections (blocks)."""
+    import uvicorn
+
+    if app is None:
+        from app import app
+
+    class _Server(uvicorn.Server):
+        async def startup(self, sockets=None) -> None:
+            await super().startup(sockets=sockets)
+            if self.started:
+                logger.info("Server ready at %s", URL)
+                ready.set()
+
+    _Server(uvicorn.Config(app, host=host, port=port, log_level="info")).run()
+
+
+def main(app=None) -> None:
+    import multiprocessing
+    multiprocessing.freeze_support()   # ENGINE_WORKERS processes in a frozen bundle
+
+    ready = threading.Event()
+    threading.Thread(target=serve, args=(ready, app), name="server", daemon=True).start()
+
+    import webview  # pywebview
+
+    window = webview.create_window(TITLE, html=_SPLASH, width=1400, height=900, min_size=(900, 600))
+
+    def load_when_ready() -> None:
+        if ready.wait(READY_TIMEOUT):
+            window.load_url(URL)
+        else:
+            logger.error("Server did not start within %d s", READY_TIMEOUT)
+
+    webview.start(load_when_ready)  # blocks until the window is closed
+
+
+if __name__ == "__main__":
+    main()
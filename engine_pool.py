@@ -0,0 +1,186 @@
+"""Engine worker processes, sharded by ticker.
+
+Each worker process owns a fixed shard of the tickers: their 1-min bars
+(one ``BarBuffer`` each), daily/weekly frames and engine state. Per compute
+the parent sends a shard only the bars it has not seen yet (plus the
+``INTRADAY_OVERLAP_MIN`` before them, which a refetch may have revised) and
+any daily/weekly frame that changed, and gets back that shard's per-ticker
+payloads. The session-wide fields — clock, kill zones, macros — are
+computed in the parent.
+
+Each shard is its own single-process ``ProcessPoolExecutor``, so a ticker
+always lands on the process holding its state. ``compute`` awaits the
+shards with ``run_in_executor``: the event loop only slices new bars and
+merges results while the workers run.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+from collections.abc import Collection
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from typing import NamedTuple
+
+import pandas as pd
+
+from bar_buffer import BarBuffer, Bars, as_bars
+from config import ENGINE_WORKERS, INTRADAY_OVERLAP_MIN, INTRADAY_WINDOW_DAYS, STREAMING_ENGINE, TICKERS
+from ict_engine import ET, ICTEngine
+from ict_stream import StreamingICTEngine
+from memo import Memo
+from schema import Metrics, TickerMetrics
+
+logger = logging.getLogger(__name__)
+
+_CAPACITY = INTRADAY_WINDOW_DAYS * 1440
+_OVERLAP_NS = INTRADAY_OVERLAP_MIN * 60 * 10**9
+
+
+class _Update(NamedTuple):
+    """What one ticker's worker needs to catch up with the parent."""
+    head: int | None             # oldest bar the parent holds (epoch ns)
+    bars: Bars                   # bars from the first new (or revised) one on
+    reset: bool                  # replace the held bars instead of extending them
+    daily: pd.DataFrame | None   # None = unchanged since the last update
+    weekly: pd.DataFrame | None
+
+
+# ── worker side ──────────────────────────────────────────────────────
+_engine: ICTEngine | None = None          # per worker process
+_bars: dict[str, BarBuffer] = {}
+_frames: dict[str, dict[str, pd.DataFrame]] = {"daily": {}, "weekly": {}}
+
+
+def _init(tickers: list[str], streaming: bool) -> None:
+    global _engine
+    _engine = StreamingICTEngine(tickers) if streaming else ICTEngine(tickers)
+
+
+def _ping() -> None:
+    """No-op task that makes the executor spawn its process ahead of the first compute."""
+
+
+def _compute_shard(
+    updates: dict[str, _Update], now: datetime, sections: Collection[str] | None
+) -> dict[str, TickerMetrics]:
+    """Fold *updates* into this worker's state and compute the updated tickers."""
+    for ticker, u in updates.items():
+        buf = _bars.get(ticker)
+        if u.reset or buf is None:
+            buf = _bars[ticker] = BarBuffer(max(_CAPACITY, len(u.bars)))
+        buf.extend(u.bars)
+        if u.head is not None:
+            buf.drop_before(u.head)
+        if u.daily is not None:
+            _frames["daily"][ticker] = u.daily
+        if u.weekly is not None:
+            _frames["weekly"][ticker] = u.weekly
+    data = {"intraday": {t: buf.view() for t, buf in _bars.items()}, **_frames}
+    return _engine.compute(data, now, updates.keys(), sections)["tickers"]
+
+
+# ── parent side ──────────────────────────────────────────────────────
+class EnginePool:
+    """``ICTEngine.compute`` spread over worker processes, one shard of tickers each."""
+
+    def __init__(self, tickers: list[str] = TICKERS, workers: int = ENGINE_WORKERS, streaming: bool = STREAMING_ENGINE):
+        self.tickers = list(tickers)
+        n = max(1, min(workers, len(self.tickers)))
+        self.shards = [self.tickers[i::n] for i in range(n)]
+        self.streaming = streaming
+        self._session = ICTEngine([])    # clock, kill zones and macros only
+        # spawn, not fork: the parent runs an event loop and executor threads
+        self._context = multiprocessing.get_context("spawn")
+        self._executors = [self._start(shard) for shard in self.shards]
+        self._sent: dict[str, int] = {}                 # newest bar ts sent per ticker
+        self._frames_sent: dict[tuple[str, str], pd.DataFrame] = {}
+
+    @property
+    def memo(self) -> Memo:
+        """Memo of the session-wide parts computed here; each worker keeps its own."""
+        return self._session.memo
+
+    def _start(self, shard: list[str]) -> ProcessPoolExecutor:
+        executor = ProcessPoolExecutor(
+            1, mp_context=self._context, initializer=_init, initargs=(shard, self.streaming)
+        )
+        executor.submit(_ping)
+        return executor
+
+    def _updates(self, shard: list[str], data: dict) -> dict[str, _Update]:
+        out = {}
+        for ticker in shard:
+            bars = as_bars(data.get("intraday", {}).get(ticker, pd.DataFrame()))
+            if bars.empty:
+                self._sent.pop(ticker, None)
+                out[ticker] = _Update(None, bars, True, self._frame("daily", ticker, data), self._frame("weekly", ticker, data))
+                continue
+            head, last = int(bars.ts[0]), self._sent.get(ticker)
+            i = int(bars.ts.searchsorted(last)) if last is not None else len(bars)
+            # resend everything if the worker has nothing yet or the parent's series moved under it
+            reset = i == len(bars) or int(bars.ts[i]) != last
+            # copies: the task is pickled on the executor's thread, after the feed may have moved on
+            bars = bars.copy(0 if reset else int(bars.ts.searchsorted(last - _OVERLAP_NS)))
+            self._sent[ticker] = int(bars.ts[-1])
+            out[ticker] = _Update(head, bars, reset, self._frame("daily", ticker, data), self._frame("weekly", ticker, data))
+        return out
+
+    def _frame(self, kind: str, ticker: str, data: dict) -> pd.DataFrame | None:
+        df = data.get(kind, {}).get(ticker)
+        if df is None:
+            df = pd.DataFrame()
+        if self._frames_sent.get((kind, ticker)) is df:
+            return None
+        self._frames_sent[kind, ticker] = df
+        return df
+
+    def _forget(self, shard: list[str]) -> None:
+        """Send the whole window next time (the worker's state is gone or suspect)."""
+        for ticker in shard:
+            self._sent.pop(ticker, None)
+            self._frames_sent.pop(("daily", ticker), None)
+            self._frames_sent.pop(("weekly", ticker), None)
+
+    async def compute(
+        self,
+        data: dict,
+        now: datetime | None = None,
+        tickers: Collection[str] | None = None,
+        sections: Collection[str] | None = None,
+    ) -> Metrics:
+        """Same arguments and result as ``ICTEngine.compute``; shards without requested tickers sit out."""
+        now = now or datetime.now(ET)
+        loop = asyncio.get_running_loop()
+        busy, futures = [], []
+        for i, shard in enumerate(self.shards):
+            wanted = [t for t in shard if tickers is None or t in tickers]
+            if wanted:
+                busy.append(i)
+                futures.append(loop.run_in_executor(
+                    self._executors[i], _compute_shard, self._updates(wanted, data), now, sections
+                ))
+        result = self._session.compute({}, now)
+        parts = await asyncio.gather(*futures, return_exceptions=True)
+        errors = [(i, part) for i, part in zip(busy, parts) if isinstance(part, BaseException)]
+        for i, exc in errors:
+            self._recover(i, exc)
+        if errors:
+            raise errors[0][1]
+        merged: dict[str, TickerMetrics] = {}
+        for part in parts:
+            merged.update(part)
+        result["tickers"] = {t: merged[t] for t in self.tickers if t in merged}
+        return result
+
+    def _recover(self, i: int, exc: BaseException) -> None:
+        self._forget(self.shards[i])
+        if isinstance(exc, BrokenProcessPool):
+            logger.warning("Engine worker %d died; restarting it: %s", i, exc)
+            self._executors[i].shutdown(wait=False, cancel_futures=True)
+            self._executors[i] = self._start(self.shards[i])
+
+    def close(self) -> None:
+        for executor in self._executors:
+            executor.shutdown(wait=False, cancel_futures=True)
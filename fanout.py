@@ -0,0 +1,263 @@
+"""Concurrent WebSocket fan-out with per-client bounded send queues."""
+
+import asyncio
+import functools
+import itertools
+import logging
+import time
+from collections import deque
+from typing import TYPE_CHECKING
+
+from fastapi import WebSocket
+
+from config import MAX_CLIENT_LAG, SEND_QUEUE_SIZE, SEND_TIMEOUT, SLOW_CLIENT_POLICY
+from snapshot import Snapshot
+from subscriptions import Subscription
+
+if TYPE_CHECKING:
+    from alerts import AlertBatch
+from telemetry import REGISTRY, Histogram
+
+logger = logging.getLogger(__name__)
+
+_ids = itertools.count(1)
+_background: set[asyncio.Task] = set()     # fire-and-forget tasks, referenced until done
+
+
+def background(coro, what: str) -> asyncio.Task:
+    """Run *coro* without awaiting it; it is kept alive until done and logged if it fails."""
+    task = asyncio.create_task(coro)
+    _background.add(task)
+    task.add_done_callback(functools.partial(_finished, what))
+    return task
+
+
+def _finished(what: str, task: asyncio.Task) -> None:
+    _background.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("%s failed", what, exc_info=task.exception())
+
+
+class ClientConnection:
+    """One WebSocket connection, its protocol and its outgoing queue.
+
+    Full-protocol clients get the whole metrics JSON every time. Delta
+    clients (``/ws?mode=delta``) get a snapshot first and then patches
+    against the version they last received; if queued updates are dropped
+    the next send falls back to a full snapshot automatically. Either
+    protocol is sent as JSON text frames or, with ``fmt="msgpack"``,
+    MessagePack binary frames, and carry only the client's ``subscription``.
+
+    Delta clients also get ``{"type": "alert"}`` events for their
+    subscription. Alerts have their own queue, are never coalesced away and
+    go out ahead of pending snapshots.
+
+    A dedicated sender task drains the queue, so a slow socket only delays
+    its own updates. When the queue is full, ``"drop_oldest"`` discards the
+    oldest pending update and ``"coalesce"`` keeps only the latest.
+    """
+
+    def __init__(
+        self,
+        ws: WebSocket,
+        delta: bool,
+        fmt: str = "json",
+        subscription: Subscription | None = None,
+        queue_size: int = SEND_QUEUE_SIZE,
+        policy: str = SLOW_CLIENT_POLICY,
+        send_timeout: float = SEND_TIMEOUT,
+    ):
+        self.id = next(_ids)
+        self.ws = ws
+        self.delta = delta
+        self.fmt = fmt
+        self.subscription = subscription or Subscription.everything()
+        self.version = 0
+        self.queue_size = queue_size
+        self.policy = policy
+        self.send_timeout = send_timeout
+        self.sent = 0
+        self.dropped = 0
+        self.closed = False
+        self._pending: deque[tuple[Snapshot, bool, float]] = deque()
+        self._alerts: deque[tuple["AlertBatch", float]] = deque()
+        self._wake = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._in_flight: float | None = None  # queue time of the update being sent
+        mode = "delta" if delta else "full"
+        self._send_time = REGISTRY.histogram("ict_send_seconds", mode=mode)
+        self._delivery_time = REGISTRY.histogram("ict_delivery_seconds", mode=mode)
+        self.send_times = Histogram(window=256)   # this client only
+
+    # ── protocol ─────────────────────────────────────────────────────
+    def message(self, snap: Snapshot, resync: bool = False) -> str | bytes | None:
+        """What to send for *snap*, or ``None`` if the client already has it."""
+        if snap.version <= self.version and not resync:
+            return None
+        snap = snap.view(self.subscription)
+        if not self.delta:
+            msg = snap.message("payload", self.fmt)
+        elif not resync and snap.ops is not None and self.version == snap.version - 1:
+            msg = snap.message("patch", self.fmt)
+        else:
+            msg = snap.message("full", self.fmt)
+        self.version = snap.version
+        return msg
+
+    def subscribe(self, subscription: Subscription) -> None:
+        """Switch to *subscription*; the next update is a full snapshot of it."""
+        self.subscription = subscription
+        self.version = 0    # a patch would be against the old slice
+
+    # ── queue ────────────────────────────────────────────────────────
+    def offer(self, snap: Snapshot, resync: bool = False) -> None:
+        """Queue *snap* for sending without ever blocking the caller."""
+        if self.closed:
+            return
+        queued_at = time.monotonic()
+        limit = 0 if self.policy == "coalesce" else self.queue_size - 1
+        while len(self._pending) > limit:
+            # the replacement inherits how long the client has been behind
+            _, was_resync, was_queued = self._pending.popleft()
+            resync = resync or was_resync
+            queued_at = min(queued_at, was_queued)
+            self.dropped += 1
+        self._pending.append((snap, resync, queued_at))
+        self._wake.set()
+
+    def offer_alerts(self, batch: "AlertBatch") -> None:
+        """Queue *batch* (delta clients only; the full protocol carries bare payloads)."""
+        if self.closed or not self.delta:
+            return
+        self._alerts.append((batch, time.monotonic()))
+        self._wake.set()
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._pending) + len(self._alerts)
+
+    @property
+    def lag(self) -> float:
+        """Seconds the oldest undelivered update has been waiting."""
+        oldest = self._in_flight
+        if self._pending and (oldest is None or self._pending[0][2] < oldest):
+            oldest = self._pending[0][2]
+        if self._alerts and (oldest is None or self._alerts[0][1] < oldest):
+            oldest = self._alerts[0][1]
+        return time.monotonic() - oldest if oldest is not None else 0.0
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._sender())
+
+    async def _sender(self) -> None:
+        try:
+            while True:
+                if not self._pending and not self._alerts:
+                    self._wake.clear()
+                    await self._wake.wait()
+                    continue
+                if self._alerts:
+                    batch, queued_at = self._alerts.popleft()
+                    msg = batch.message(self.subscription, self.fmt)
+                else:
+                    snap, resync, queued_at = self._pending.popleft()
+                    msg = self.message(snap, resync)
+                if msg is None:
+                    continue
+                self._in_flight = queued_at
+                t0 = time.monotonic()
+                send = self.ws.send_bytes(msg) if isinstance(msg, bytes) else self.ws.send_text(msg)
+                await asyncio.wait_for(send, self.send_timeout)
+                t1 = time.monotonic()
+                self._send_time.observe(t1 - t0)
+                self.send_times.observe(t1 - t0)
+                self._delivery_time.observe(t1 - queued_at)
+                self._in_flight = None
+                self.sent += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.info("Client %d send failed: %s", self.id, str(e) or type(e).__name__)
+        finally:
+            self.closed = True
+
+    async def close(self, code: int = 1000) -> None:
+        self.closed = True
+        if self._task is not None:
+            self._task.cancel()
+        try:
+            await asyncio.wait_for(self.ws.close(code=code), self.send_timeout)
+        except Exception:
+            pass
+
+    def stats(self) -> dict:
+        return {
+            "id": self.id,
+            "mode": "delta" if self.delta else "full",
+            "format": self.fmt,
+            "symbols": sorted(self.subscription.symbols),
+            "sections": sorted(self.subscription.sections),
+            "version": self.version,
+            "queue_depth": self.queue_depth,
+            "lag_s": round(self.lag, 3),
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "send_ms": {f"p{round(q * 100)}": round(v * 1e3, 3) for q, v in self.send_times.quantiles().items()},
+        }
+
+
+class Fanout:
+    """Registry of connected clients; broadcasting only enqueues."""
+
+    def __init__(self, max_lag: float = MAX_CLIENT_LAG):
+        self.max_lag = max_lag
+        self.clients: dict[WebSocket, ClientConnection] = {}
+        self.evicted = 0
+
+    def __len__(self) -> int:
+        return len(self.clients)
+
+    def add(
+        self, ws: WebSocket, delta: bool, fmt: str = "json", subscription: Subscription | None = None
+    ) -> ClientConnection:
+        client = self.clients[ws] = ClientConnection(ws, delta, fmt, subscription)
+        client.start()
+        return client
+
+    async def remove(self, ws: WebSocket) -> None:
+        client = self.clients.pop(ws, None)
+        if client is not None:
+            await client.close()
+
+    async def close_all(self) -> None:
+        await asyncio.gather(*(self.remove(ws) for ws in list(self.clients)))
+
+    def demand(self) -> Subscription:
+        """Union of every client's subscription: what the engine has to compute."""
+        return Subscription.union(c.subscription for c in self.clients.values())
+
+    def broadcast(self, snap: Snapshot) -> None:
+        """Queue *snap* for every client and evict dead or lagging ones."""
+        for ws, client in list(self.clients.items()):
+            if client.closed or client.lag > self.max_lag:
+                self.evict(ws, client)
+                continue
+            client.offer(snap)
+
+    def alert(self, batch: "AlertBatch") -> None:
+        """Queue *batch* for every client; each only gets its subscription's alerts."""
+        for client in self.clients.values():
+            client.offer_alerts(batch)
+
+    def evict(self, ws: WebSocket, client: ClientConnection) -> None:
+        logger.warning("Evicting client %d (lag %.1fs, %d queued)", client.id, client.lag, client.queue_depth)
+        self.clients.pop(ws, None)
+        self.evicted += 1
+        background(client.close(code=1013), f"Closing evicted client {client.id}")
+
+    def stats(self) -> dict:
+        return {
+            "clients": [c.stats() for c in self.clients.values()],
+            "evicted": self.evicted,
+            "subscriptions": len({c.subscription for c in self.clients.values()}),
+        }
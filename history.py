@@ -0,0 +1,337 @@
+"""Historical queries over the 1-min bars: ranges, roll-ups, downsampling, levels.
+
+``HistoryStore`` keeps each symbol's last ``HISTORY_DAYS`` of 1-min bars in
+a ``BarBuffer``, topped up from every refresh (and by the app on query for
+symbols no refresh fetches), so history reaches back past the feed's
+``INTRADAY_WINDOW_DAYS``. It is seeded from the bar cache and saved back
+to it on shutdown.
+
+A bar query slices ``[start, end)`` with two binary searches, rolls the
+bars up to the interval asked for (any of ``TIMEFRAMES``, or ``"1d"`` per
+trade date) and, given ``points``, downsamples server-side:
+
+- ``minmax`` merges runs of consecutive bars into one OHLC bar each, so
+  every high and low in the range survives at any zoom;
+- ``lttb`` keeps the bars Largest-Triangle-Three-Buckets picks on the
+  close, for line charts.
+
+A levels query gives, per trade date, the previous day's and week's OHLC
+levels, the Asia / London / NY session highs and lows and the key opens,
+computed from the same bars.
+
+Responses are JSON written ``HISTORY_CHUNK_ROWS`` rows at a time. Every
+query has an ETag built from its parameters, the range's first bar and
+size, and the generation of the newest write into it, so a range that no
+refresh has touched keeps its tag.
+"""
+
+import bisect
+import hashlib
+import logging
+import threading
+from collections.abc import Callable, Iterator
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from bar_buffer import BarBuffer, Bars, as_bars
+from bar_cache import BarCache
+from config import HISTORY_CHUNK_ROWS, HISTORY_DAYS, INTRADAY_OVERLAP_MIN, KEY_OPENS, TICKERS, TIMEFRAMES
+from session_calendar import CALENDAR, ET
+from session_index import SessionIndex
+from serialization import dumps
+from timeframes import aggregate, rollup
+
+logger = logging.getLogger(__name__)
+
+_MINUTE_NS = 60 * 10**9
+_DAY_NS = 1440 * _MINUTE_NS
+_OVERLAP_NS = INTRADAY_OVERLAP_MIN * _MINUTE_NS
+_LOOKBACK_NS = 10 * _DAY_NS     # bars before a levels range: the previous day and week
+_CACHE_INTERVAL = "1m_history"  # bar cache key, apart from the feed's "1m" window
+
+INTERVALS = ("1m", *TIMEFRAMES, "1d")
+METHODS = ("minmax", "lttb")
+COLUMNS = ["ts", "open", "high", "low", "close", "volume"]
+
+
+class Result(NamedTuple):
+    etag: str
+    body: Iterator[bytes] | None    # None: the caller's copy (If-None-Match) is current
+
+
+# ── parameters ───────────────────────────────────────────────────────
+def parse_time(value: str | None) -> int | None:
+    """Epoch ns from epoch milliseconds or an ISO 8601 time (naive times are ET)."""
+    if value is None or value == "":
+        return None
+    if value.lstrip("-").isdigit():
+        return int(value) * 10**6
+    try:
+        ts = pd.Timestamp(value)
+    except ValueError:
+        raise ValueError(f"not a time: {value!r} (epoch ms or ISO 8601)") from None
+    if ts.tzinfo is None:
+        ts = ts.tz_localize(ET)
+    return ts.value
+
+
+def _matches(etag: str, if_none_match: str | None) -> bool:
+    if not if_none_match:
+        return False
+    tags = [t.strip() for t in if_none_match.split(",")]
+    return "*" in tags or etag in tags or etag.removeprefix("W/") in tags
+
+
+# ── roll-ups and downsampling ────────────────────────────────────────
+def _trade_day_starts(bars: Bars) -> np.ndarray:
+    """Positions where each CME trade date's bars begin."""
+    close = CALENDAR.session_bounds(bars.ts)[1]
+    return np.flatnonzero(np.r_[True, close[1:] != close[:-1]])
+
+
+def daily(bars: Bars) -> Bars:
+    """One bar per trade date (evening bars count toward the next date), stamped with its first bar."""
+    return rollup(bars, _trade_day_starts(bars)) if not bars.empty else bars
+
+
+def minmax(bars: Bars, points: int) -> Bars:
+    """*bars* merged into at most *points* OHLC bars of consecutive rows.
+
+    Buckets split the rows, not the clock, so closed hours take no points;
+    each keeps its first open, last close, highest high and lowest low.
+    """
+    n = len(bars)
+    if n <= points:
+        return bars
+    return rollup(bars, np.arange(points) * n // points)
+
+
+def lttb(bars: Bars, points: int) -> Bars:
+    """The *points* bars Largest-Triangle-Three-Buckets keeps of the close series."""
+    ok = ~np.isnan(bars.close)
+    if not ok.all():
+        bars = Bars(*(a[ok] for a in bars))
+    n = len(bars)
+    if n <= points or points < 3:
+        return bars
+    x = (bars.ts - bars.ts[0]).astype(np.float64)
+    y = bars.close
+    # bucket k of the middle points is rows [bounds[k], bounds[k + 1])
+    bounds = (np.arange(points - 1) * ((n - 2) / (points - 2))).astype(np.int64) + 1
+    bounds[-1] = n - 1
+    sx, sy = np.r_[0.0, np.cumsum(x)], np.r_[0.0, np.cumsum(y)]
+    size = np.diff(bounds)
+    avg_x = np.r_[(sx[bounds[1:]] - sx[bounds[:-1]]) / size, x[-1]]
+    avg_y = np.r_[(sy[bounds[1:]] - sy[bounds[:-1]]) / size, y[-1]]
+    keep = np.empty(points, np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for k in range(points - 2):
+        lo, hi = bounds[k], bounds[k + 1]
+        # twice the triangle area between the last kept point, each candidate and the next bucket's mean
+        area = np.abs((x[a] - avg_x[k + 1]) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y[k + 1] - y[a]))
+        a = lo + int(area.argmax())
+        keep[k + 1] = a
+    return Bars(*(col[keep] for col in bars))
+
+
+# ── levels and sessions ──────────────────────────────────────────────
+def _high_low(bars: Bars, sidx: SessionIndex, start: int, end: int) -> dict | None:
+    i, j = sidx.bounds(start, end)
+    if j == i:
+        return None
+    return {"high": round(float(np.fmax.reduce(bars.high[i:j])), 2),
+            "low": round(float(np.fmin.reduce(bars.low[i:j])), 2)}
+
+
+def _ohlc(bars: Bars, k: int, keys: tuple[str, ...]) -> dict[str, float]:
+    return {key: round(float(col[k]), 2) for key, col in zip(keys, bars[1:5])}
+
+
+def session_levels(bars: Bars, start: int | None = None) -> list[dict]:
+    """Per trade date from *start* on: its OHLC, previous day/week levels, sessions and key opens.
+
+    *bars* should reach back a week before *start* for the previous-week levels.
+    """
+    if bars.empty:
+        return []
+    days = daily(bars)
+    dates = [CALENDAR.trade_date_at(t) for t in days.ts.tolist()]
+    weeks = [d.isocalendar()[:2] for d in dates]
+    week_first = [k for k in range(len(dates)) if k == 0 or weeks[k] != weeks[k - 1]]
+    weekly = rollup(days, np.array(week_first))
+    week_of = np.searchsorted(week_first, np.arange(len(dates)), "right") - 1
+    first = CALENDAR.trade_date_at(start) if start is not None else dates[0]
+    sidx = SessionIndex(bars.ts)
+
+    out = []
+    for k, d in enumerate(dates):
+        if d < first:
+            continue
+        day = CALENDAR.day(d)
+        levels = _ohlc(days, k - 1, ("pdo", "pdh", "pdl", "pdc")) if k else {}
+        if week_of[k]:
+            levels |= _ohlc(weekly, week_of[k] - 1, ("pwo", "pwh", "pwl", "pwc"))
+        opens = {}
+        for ko in KEY_OPENS:
+            hm = (ko["hour"], ko["minute"])
+            # the 18:00 open starting this trade date is on the evening before
+            target = CALENDAR.day(day.eve).opens[hm] if hm == (18, 0) else day.opens[hm]
+            pos = sidx.first(target, target + 2 * _MINUTE_NS)
+            opens[ko["label"]] = round(float(bars.open[pos]), 2) if pos is not None else None
+        out.append({
+            "date": d.isoformat(),
+            **_ohlc(days, k, ("open", "high", "low", "close")),
+            "levels": levels,
+            "sessions": {
+                "Asia": _high_low(bars, sidx, *day.asia),
+                "London": _high_low(bars, sidx, *day.london),
+                "NY": _high_low(bars, sidx, day.ny_open, day.close),
+            },
+            "key_opens": opens,
+        })
+    return out
+
+
+# ── encoding ─────────────────────────────────────────────────────────
+def stream_json(head: dict, key: str, n: int, rows: Callable[[slice], list], chunk: int = HISTORY_CHUNK_ROWS) -> Iterator[bytes]:
+    """``{**head, key: [...]}`` as JSON, *chunk* rows at a time; ``rows(s)`` builds slice *s*."""
+    yield dumps(head)[:-1] + b',"' + key.encode() + b'":['
+    for i in range(0, n, chunk):
+        part = dumps(rows(slice(i, i + chunk)))[1:-1]
+        yield b"," + part if i else part
+    yield b"]}"
+
+
+def _bar_rows(bars: Bars) -> Callable[[slice], list]:
+    ms = bars.ts // 10**6
+
+    def rows(s: slice) -> list:
+        return list(zip(ms[s].tolist(), *(np.round(a[s], 2).tolist() for a in bars[1:])))
+    return rows
+
+
+# ── store ────────────────────────────────────────────────────────────
+class HistoryStore:
+    """The last *days* of 1-min bars per symbol, for historical queries.
+
+    Thread-safe: ``update`` and the queries take one lock, and query bodies
+    are built from copies, so they can be written out after it is released.
+    """
+
+    def __init__(self, days: int = HISTORY_DAYS, cache: BarCache | None = None, tickers: list[str] = TICKERS):
+        self.capacity = days * 1440
+        self.cache = cache if cache is not None else BarCache()
+        self.tickers = list(tickers)
+        self._bars: dict[str, BarBuffer] = {}
+        # per symbol, writes as (from_ts, generation): both increasing, so the
+        # newest write touching a range is the last one starting before its end
+        self._writes: dict[str, tuple[list[int], list[int]]] = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def _buffer(self, symbol: str) -> BarBuffer:
+        buf = self._bars.get(symbol)
+        if buf is None:
+            buf = self._bars[symbol] = BarBuffer(self.capacity)
+            # saved history, then the feed's cached window over it
+            for interval in (_CACHE_INTERVAL, "1m"):
+                cached = self.cache.load_bars(symbol, interval)
+                if cached is not None and not cached.empty:
+                    self._write(symbol, buf, cached)
+        return buf
+
+    def _write(self, symbol: str, buf: BarBuffer, bars: Bars) -> None:
+        """``buf.extend(bars)``, recorded for ETags."""
+        buf.extend(bars)
+        self._generation += 1
+        starts, gens = self._writes.setdefault(symbol, ([], []))
+        cut = bisect.bisect_left(starts, int(bars.ts[0]))
+        del starts[cut:], gens[cut:]
+        starts.append(int(bars.ts[0]))
+        gens.append(self._generation)
+
+    def update(self, intraday: dict) -> None:
+        """Fold in each symbol's new bars, re-reading the ``INTRADAY_OVERLAP_MIN`` a refetch may revise."""
+        with self._lock:
+            for symbol, data in intraday.items():
+                bars = as_bars(data)
+                if bars.empty:
+                    continue
+                buf = self._buffer(symbol)
+                if buf.last_ts is not None:
+                    bars = Bars(*(a[int(bars.ts.searchsorted(buf.last_ts - _OVERLAP_NS)):] for a in bars))
+                if not bars.empty:
+                    self._write(symbol, buf, bars)
+
+    def save(self) -> None:
+        with self._lock:
+            for symbol, buf in self._bars.items():
+                self.cache.save(symbol, _CACHE_INTERVAL, buf.view())
+
+    # ── queries ──────────────────────────────────────────────────────
+    def _range(self, symbol: str, start: int | None, end: int | None) -> Bars:
+        if symbol not in self.tickers:
+            raise KeyError(f"unknown symbol {symbol!r}")
+        bars = self._buffer(symbol).view()
+        i = int(bars.ts.searchsorted(start)) if start is not None else 0
+        j = int(bars.ts.searchsorted(end)) if end is not None else len(bars)
+        return Bars(*(a[i:max(i, j)] for a in bars))
+
+    def _etag(self, symbol: str, params: tuple, bars: Bars) -> str:
+        starts, gens = self._writes.get(symbol, ([], []))
+        k = bisect.bisect_right(starts, int(bars.ts[-1])) if len(bars) else 0
+        key = (symbol, params, len(bars), int(bars.ts[0]) if len(bars) else 0, gens[k - 1] if k else 0)
+        # weak: the body may be sent gzip-encoded
+        return 'W/"' + hashlib.blake2b(repr(key).encode(), digest_size=12).hexdigest() + '"'
+
+    def bars(
+        self,
+        symbol: str,
+        interval: str = "1m",
+        start: str | None = None,
+        end: str | None = None,
+        points: int | None = None,
+        method: str = "minmax",
+        if_none_match: str | None = None,
+    ) -> Result:
+        """Bars of *symbol* in ``[start, end)`` at *interval*, downsampled to *points* if given."""
+        if interval not in INTERVALS:
+            raise ValueError(f"interval must be one of {', '.join(INTERVALS)}")
+        if method not in METHODS:
+            raise ValueError(f"method must be one of {', '.join(METHODS)}")
+        if points is not None and points < 3:
+            raise ValueError("points must be at least 3")
+        lo, hi = parse_time(start), parse_time(end)
+        with self._lock:
+            bars = self._range(symbol, lo, hi)
+            etag = self._etag(symbol, (interval, points, method), bars)
+            if _matches(etag, if_none_match):
+                return Result(etag, None)
+            if interval == "1d":
+                bars = daily(bars)
+            elif interval != "1m" and not bars.empty:
+                bars = aggregate(bars, TIMEFRAMES[interval])
+            if points is not None:
+                bars = minmax(bars, points) if method == "minmax" else lttb(bars, points)
+            if interval == "1m" and (points is None or len(bars) <= points):
+                bars = bars.copy()      # still a view of the ring
+        head = {"symbol": symbol, "interval": interval, "method": method if points else None,
+                "count": len(bars), "columns": COLUMNS}
+        return Result(etag, stream_json(head, "bars", len(bars), _bar_rows(bars)))
+
+    def levels(
+        self, symbol: str, start: str | None = None, end: str | None = None, if_none_match: str | None = None
+    ) -> Result:
+        """Per trade date of *symbol* in ``[start, end)``: levels, sessions and key opens."""
+        lo, hi = parse_time(start), parse_time(end)
+        with self._lock:
+            bars = self._range(symbol, lo - _LOOKBACK_NS if lo is not None else None, hi)
+            etag = self._etag(symbol, ("levels", lo), bars)
+            if _matches(etag, if_none_match):
+                return Result(etag, None)
+            days = session_levels(bars, lo)
+        head = {"symbol": symbol, "count": len(days)}
+        return Result(etag, stream_json(head, "days", len(days), days.__getitem__))
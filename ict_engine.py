@@ -1,7 +1,9 @@
 """ICT Concepts calculation engine."""
 
-from datetime import datetime, time, timedelta
+from collections.abc import Collection
+from datetime import datetime, timedelta
 
+import numpy as np
 import pandas as pd
 import pytz
 
@@ -10,19 +12,42 @@ from config import (
     KILL_ZONES,
     MACRO_TIMES,
     OTE_FIBS,
+    OTE_TIMEFRAMES,
     PROXIMITY_PCT,
     SWING_LOOKBACK,
     TICKER_LABELS,
     TICKERS,
     TIMEZONE,
 )
+from bar_buffer import Bars, as_bars
+from memo import Memo, memoized
+from session_calendar import CALENDAR
+from schema import SECTIONS, OTE, KeyOpen, KillZone, Macro, Metrics, PowerOf3, Sweep, TickerMetrics, Zones
+from session_index import SessionIndex, to_ns
+from telemetry import timed
+from timeframes import TimeframeBars
+from zones import ZoneBook
 
 ET = pytz.timezone(TIMEZONE)
 
+_MINUTE_NS = 60 * 10**9
+_FIB_KEYS = [(fib, str(fib)) for fib in OTE_FIBS]   # payload keys, formatted once
+_NO_FRAME = pd.DataFrame()      # one shared stand-in, so a missing frame is a memo hit too
+
 
 # ── helpers ──────────────────────────────────────────────────────────
-def _mins(h: int, m: int) -> int:
-    return h * 60 + m
+def _minute_ns(now: datetime) -> int:
+    """Epoch ns of *now* truncated to the minute."""
+    return to_ns(now.replace(second=0, microsecond=0))
+
+
+def _window_status(window: tuple[int, int] | None, now_ns: int) -> dict:
+    """Status, countdown and flag of a ``[start, end)`` window; ``None`` (not trading) reads as closed."""
+    if window is None or now_ns >= window[1]:
+        return {"status": "closed", "countdown": "", "active": False}
+    if now_ns >= window[0]:
+        return {"status": "ACTIVE", "countdown": _countdown((window[1] - now_ns) // _MINUTE_NS), "active": True}
+    return {"status": "upcoming", "countdown": _countdown((window[0] - now_ns) // _MINUTE_NS), "active": False}
 
 
 def _countdown(minutes: int) -> str:
@@ -48,11 +73,88 @@ def _safe_float(val) -> float | None:
         return None
 
 
+def _max(a: np.ndarray) -> float:
+    """NaN-skipping max of a non-empty array (NaN only if every value is)."""
+    return float(np.fmax.reduce(a))
+
+
+def _min(a: np.ndarray) -> float:
+    return float(np.fmin.reduce(a))
+
+
+def swing_pivots(highs: np.ndarray, lows: np.ndarray, n: int) -> tuple[np.ndarray, np.ndarray]:
+    """Indices of swing highs and swing lows with *n* bars on each side.
+
+    A bar is a pivot when it equals the max (min) of the centred
+    ``2n + 1`` window; edge bars without a full window never qualify.
+    """
+    w = 2 * n + 1
+    roll_hi = pd.Series(highs).rolling(w, center=True).max().to_numpy()
+    roll_lo = pd.Series(lows).rolling(w, center=True).min().to_numpy()
+    return np.flatnonzero(highs == roll_hi), np.flatnonzero(lows == roll_lo)
+
+
+def _po3_payload(
+    ny_open: float,
+    session_high: float,
+    session_low: float,
+    accum_h: float | None,
+    accum_l: float | None,
+    current: float,
+    elapsed: float,
+) -> PowerOf3:
+    """Classify the Power of 3 phase from NY-session aggregates.
+
+    ``accum_h``/``accum_l`` are ``None`` when there is no accumulation range yet.
+    """
+    if elapsed < 30 or accum_h is None:
+        phase, bias = "Accumulation", "Neutral"
+    else:
+        accum_rng = accum_h - accum_l if accum_h != accum_l else 1.0
+        buf = accum_rng * 0.10
+
+        swept_high = session_high > accum_h + buf
+        swept_low = session_low < accum_l - buf
+
+        if swept_low and current > ny_open:
+            phase, bias = "Distribution", "Bullish"
+        elif swept_high and current < ny_open:
+            phase, bias = "Distribution", "Bearish"
+        elif swept_high:
+            phase, bias = "Manipulation", "Bearish"
+        elif swept_low:
+            phase, bias = "Manipulation", "Bullish"
+        else:
+            phase, bias = "Accumulation", "Neutral"
+
+    return {
+        "available": True,
+        "ny_open": ny_open,
+        "high": session_high,
+        "low": session_low,
+        "phase": phase,
+        "bias": bias,
+    }
+
+
 # ── engine ───────────────────────────────────────────────────────────
 class ICTEngine:
 
-    def compute(self, data: dict) -> dict:
-        now = datetime.now(ET)
+    def __init__(self, tickers: list[str] = TICKERS):
+        self.tickers = list(tickers)
+        self._timeframes: dict[str, TimeframeBars] = {}
+        self._zones: dict[str, ZoneBook] = {}
+        self.memo = Memo()
+
+    def compute(
+        self,
+        data: dict,
+        now: datetime | None = None,
+        tickers: Collection[str] | None = None,
+        sections: Collection[str] | None = None,
+    ) -> Metrics:
+        """Metrics for *tickers* (default: all) with only the given ``SECTIONS`` (default: all)."""
+        now = now or datetime.now(ET)
         intraday = data.get("intraday", {})
         daily = data.get("daily", {})
         weekly = data.get("weekly", {})
@@ -65,91 +167,126 @@ class ICTEngine:
             "tickers": {},
         }
 
-        for ticker in TICKERS:
-            label = TICKER_LABELS.get(ticker, ticker)
-            intra = intraday.get(ticker, pd.DataFrame())
-            day = daily.get(ticker, pd.DataFrame())
-            week = weekly.get(ticker, pd.DataFrame())
-
-            price = None
-            if not intra.empty:
-                price = round(float(intra["Close"].iloc[-1]), 2)
-
-            # daily change
-            daily_change = 0.0
-            if not day.empty and price is not None:
-                prev_close = self._prev_day_close(day, now)
-                if prev_close:
-                    daily_change = round(((price - prev_close) / prev_close) * 100, 2)
-
-            # levels (raw floats first)
-            levels_raw = self._key_levels(day, week, now)
-            liquidity = self._liquidity_sweeps(intra, levels_raw, now)
-            ote = self._ote(intra, price, now)
-            key_opens = self._key_opens(intra, price, now)
-            po3 = self._power_of_3(intra, now)
-
-            # decorate levels with proximity flags
-            levels = {}
-            for k, v in levels_raw.items():
-                levels[k] = {"value": v, "near": _near(price, v)}
-
-            result["tickers"][ticker] = {
-                "label": label,
-                "price": price,
-                "daily_change": daily_change,
-                "levels": levels,
-                "liquidity": liquidity,
-                "ote": ote,
-                "key_opens": key_opens,
-                "po3": po3,
-            }
+        for ticker in self.tickers:
+            if tickers is not None and ticker not in tickers:
+                continue
+            result["tickers"][ticker] = self._compute_ticker(
+                ticker,
+                intraday.get(ticker, _NO_FRAME),
+                daily.get(ticker, _NO_FRAME),
+                weekly.get(ticker, _NO_FRAME),
+                now,
+                SECTIONS.keys() if sections is None else sections,
+            )
 
         return result
 
+    def _compute_ticker(
+        self,
+        ticker: str,
+        intra: Bars | pd.DataFrame,
+        day: pd.DataFrame,
+        week: pd.DataFrame,
+        now: datetime,
+        sections: Collection[str] = SECTIONS.keys(),
+    ) -> TickerMetrics:
+        label = TICKER_LABELS.get(ticker, ticker)
+
+        price = None
+        intra = as_bars(intra)
+        if not intra.empty:
+            price = round(float(intra.close[-1]), 2)
+
+        # daily change
+        daily_change = 0.0
+        if not day.empty and price is not None:
+            prev_close = self._prev_day_close(day, now)
+            if prev_close:
+                daily_change = round(((price - prev_close) / prev_close) * 100, 2)
+
+        out: TickerMetrics = {"label": label, "price": price, "daily_change": daily_change}
+        sections = set(sections)
+
+        # levels (raw floats first); sweeps are measured against them
+        levels_raw = self._key_levels(day, week, now) if {"levels", "liquidity"} & sections else {}
+        if "levels" in sections:
+            out["levels"] = {k: {"value": v, "near": _near(price, v)} for k, v in levels_raw.items()}
+        if {"liquidity", "key_opens", "po3"} & sections:
+            liquidity, key_opens, po3 = self._session_signals(ticker, intra, levels_raw, price, now)
+            if "liquidity" in sections:
+                out["liquidity"] = liquidity
+        if {"ote", "zones"} & sections:
+            tf_bars = self._timeframe_bars(ticker, intra)
+            if "ote" in sections:
+                out["ote"] = self._ote(tf_bars[OTE_TIMEFRAMES[0]], price, now)
+                out["ote_htf"] = {tf: self._ote(tf_bars[tf], price, now) for tf in OTE_TIMEFRAMES[1:]}
+            if "zones" in sections:
+                out["zones"] = self._fvg_zones(ticker, tf_bars, price)
+        if "key_opens" in sections:
+            out["key_opens"] = key_opens
+        if "po3" in sections:
+            out["po3"] = po3
+        return out
+
+    def _session_signals(
+        self, ticker: str, intra: Bars, levels: dict, price: float | None, now: datetime
+    ) -> tuple[list[Sweep], list[KeyOpen], PowerOf3]:
+        """Liquidity sweeps, key opens and Power of 3 for one ticker."""
+        sidx = SessionIndex(intra.ts)
+        return (
+            self._liquidity_sweeps(intra, levels, now, sidx),
+            self._key_opens(intra, price, now, sidx),
+            self._power_of_3(intra, now, sidx),
+        )
+
+    @timed("ict_engine_seconds", method="timeframe_bars")
+    def _timeframe_bars(self, ticker: str, intra: Bars) -> TimeframeBars:
+        """*ticker*'s higher-timeframe bars, brought up to date with *intra*."""
+        tf_bars = self._timeframes.get(ticker)
+        if tf_bars is None:
+            tf_bars = self._timeframes[ticker] = TimeframeBars()
+        tf_bars.update(intra)
+        return tf_bars
+
+    # ── FVGs / order blocks ──────────────────────────────────────────
+    @timed("ict_engine_seconds", method="fvg_zones")
+    def _fvg_zones(self, ticker: str, tf_bars: TimeframeBars, price: float | None) -> Zones:
+        book = self._zones.get(ticker)
+        if book is None:
+            book = self._zones[ticker] = ZoneBook()
+        book.update(tf_bars)
+        return book.payload(price)
+
     # ── kill zones ───────────────────────────────────────────────────
-    def _kill_zones(self, now: datetime) -> list[dict]:
-        now_m = _mins(now.hour, now.minute)
+    @memoized("kill_zones", lambda now: ((now.date(), now.hour, now.minute), ()))
+    @timed("ict_engine_seconds", method="kill_zones")
+    def _kill_zones(self, now: datetime) -> list[KillZone]:
+        now_ns = _minute_ns(now)
+        today = CALENDAR.day(now.date())
+        tonight = CALENDAR.day(today.date + timedelta(days=1))
         out = []
         for kz in KILL_ZONES:
-            s = _mins(*kz["start"])
-            e = _mins(*kz["end"])
             name = kz["name"]
-
-            if kz.get("crosses_midnight"):
-                if now_m >= s or now_m < e:
-                    rem = (1440 - now_m + e) if now_m >= s else (e - now_m)
-                    out.append({"name": name, "status": "ACTIVE", "countdown": _countdown(rem), "active": True})
-                else:
-                    rem = s - now_m if now_m < s else (1440 - now_m + s)
-                    out.append({"name": name, "status": "upcoming", "countdown": _countdown(rem), "active": False})
-            else:
-                if s <= now_m < e:
-                    out.append({"name": name, "status": "ACTIVE", "countdown": _countdown(e - now_m), "active": True})
-                elif now_m < s:
-                    out.append({"name": name, "status": "upcoming", "countdown": _countdown(s - now_m), "active": False})
-                else:
-                    out.append({"name": name, "status": "closed", "countdown": "", "active": False})
+            # a zone crossing midnight is listed under the date it ends on
+            day = tonight if kz.get("crosses_midnight") else today
+            out.append({"name": name, **_window_status(day.trading_window(day.kill_zones[name]), now_ns)})
         return out
 
     # ── macro times ──────────────────────────────────────────────────
-    def _macros(self, now: datetime) -> list[dict]:
-        now_m = _mins(now.hour, now.minute)
-        out = []
-        for m in MACRO_TIMES:
-            s = _mins(*m["start"])
-            e = _mins(*m["end"])
-            if s <= now_m < e:
-                out.append({"label": m["label"], "status": "ACTIVE", "countdown": _countdown(e - now_m), "active": True})
-            elif now_m < s:
-                out.append({"label": m["label"], "status": "upcoming", "countdown": _countdown(s - now_m), "active": False})
-            else:
-                out.append({"label": m["label"], "status": "closed", "countdown": "", "active": False})
-        return out
+    @memoized("macros", lambda now: ((now.date(), now.hour, now.minute), ()))
+    @timed("ict_engine_seconds", method="macros")
+    def _macros(self, now: datetime) -> list[Macro]:
+        now_ns = _minute_ns(now)
+        day = CALENDAR.day(now.date())
+        return [
+            {"label": m["label"], **_window_status(day.trading_window(day.macros[m["label"]]), now_ns)}
+            for m in MACRO_TIMES
+        ]
 
     # ── previous-day close ───────────────────────────────────────────
-    @staticmethod
-    def _prev_day_close(daily: pd.DataFrame, now: datetime) -> float | None:
+    @memoized("prev_day_close", lambda daily, now: ((id(daily), now.date()), (daily,)))
+    @timed("ict_engine_seconds", method="prev_day_close")
+    def _prev_day_close(self, daily: pd.DataFrame, now: datetime) -> float | None:
         if daily.empty:
             return None
         last = daily.index[-1]
@@ -162,6 +299,8 @@ class ICTEngine:
         return _safe_float(daily["Close"].iloc[idx])
 
     # ── key levels ───────────────────────────────────────────────────
+    @memoized("key_levels", lambda daily, weekly, now: ((id(daily), id(weekly), now.date()), (daily, weekly)))
+    @timed("ict_engine_seconds", method="key_levels")
     def _key_levels(self, daily: pd.DataFrame, weekly: pd.DataFrame, now: datetime) -> dict:
         levels: dict[str, float | None] = {}
 
@@ -188,40 +327,40 @@ class ICTEngine:
         return levels
 
     # ── liquidity sweeps ─────────────────────────────────────────────
-    def _liquidity_sweeps(self, intra: pd.DataFrame, levels: dict, now: datetime) -> list[dict]:
+    @timed("ict_engine_seconds", method="liquidity_sweeps")
+    def _liquidity_sweeps(
+        self, intra: Bars, levels: dict, now: datetime, sidx: SessionIndex | None = None
+    ) -> list[Sweep]:
         if intra.empty:
             return []
+        sidx = sidx or SessionIndex(intra.ts)
 
-        today = now.date()
-        yesterday = today - timedelta(days=(3 if today.weekday() == 0 else 1))
-
-        ny_start = ET.localize(datetime.combine(today, time(9, 30)))
-        ny_data = intra[intra.index >= ny_start]
+        day = CALENDAR.day(now.date())
+        i, j = sidx.bounds(day.ny_open)
+        has_ny = j > i
+        ny_hi = _max(intra.high[i:j]) if has_ny else None
+        ny_lo = _min(intra.low[i:j]) if has_ny else None
 
         sessions = [
-            ("Asia High",   yesterday, time(19, 0), today, time(0, 0),  "high"),
-            ("Asia Low",    yesterday, time(19, 0), today, time(0, 0),  "low"),
-            ("London High", today,     time(2, 0),  today, time(5, 0),  "high"),
-            ("London Low",  today,     time(2, 0),  today, time(5, 0),  "low"),
+            ("Asia High",   day.asia,   "high"),
+            ("Asia Low",    day.asia,   "low"),
+            ("London High", day.london, "high"),
+            ("London Low",  day.london, "low"),
         ]
 
-        out: list[dict] = []
-        for label, sd, st, ed, et_, side in sessions:
+        out: list[Sweep] = []
+        for label, (start, end), side in sessions:
             try:
-                s_dt = ET.localize(datetime.combine(sd, st))
-                e_dt = ET.localize(datetime.combine(ed, et_))
-                if e_dt <= s_dt:
-                    e_dt += timedelta(days=1)
-                seg = intra[(intra.index >= s_dt) & (intra.index < e_dt)]
-                if seg.empty:
+                a, b = sidx.bounds(start, end)
+                if b == a:
                     out.append({"label": label, "level": None, "swept": False, "status": "N/A"})
                     continue
                 if side == "high":
-                    lvl = round(float(seg["High"].max()), 2)
-                    swept = (not ny_data.empty) and float(ny_data["High"].max()) > lvl
+                    lvl = round(_max(intra.high[a:b]), 2)
+                    swept = has_ny and ny_hi > lvl
                 else:
-                    lvl = round(float(seg["Low"].min()), 2)
-                    swept = (not ny_data.empty) and float(ny_data["Low"].min()) < lvl
+                    lvl = round(_min(intra.low[a:b]), 2)
+                    swept = has_ny and ny_lo < lvl
                 out.append({"label": label, "level": lvl, "swept": swept, "status": "SWEPT" if swept else "Unswept"})
             except Exception:
                 out.append({"label": label, "level": None, "swept": False, "status": "N/A"})
@@ -232,47 +371,37 @@ class ICTEngine:
             if val is None:
                 continue
             if side == "high":
-                swept = (not ny_data.empty) and float(ny_data["High"].max()) > val
+                swept = has_ny and ny_hi > val
             else:
-                swept = (not ny_data.empty) and float(ny_data["Low"].min()) < val
+                swept = has_ny and ny_lo < val
             out.append({"label": key.upper(), "level": val, "swept": swept, "status": "SWEPT" if swept else "Unswept"})
 
         return out
 
     # ── OTE ──────────────────────────────────────────────────────────
-    def _ote(self, intra: pd.DataFrame, price: float | None, now: datetime) -> dict:
-        if intra.empty or price is None:
+    @timed("ict_engine_seconds", method="ote")
+    def _ote(self, bars: Bars, price: float | None, now: datetime) -> OTE:
+        """OTE zone from the latest swing pivots of one timeframe's *bars*."""
+        if bars.empty or price is None:
             return {"available": False}
         try:
-            df5 = (
-                intra.resample("5min")
-                .agg({"Open": "first", "High": "max", "Low": "min", "Close": "last"})
-                .dropna()
-            )
+            highs, lows = bars.high, bars.low
             n = SWING_LOOKBACK
-            if len(df5) < n * 2 + 1:
+            if len(highs) < n * 2 + 1:
                 return {"available": False}
 
-            highs = df5["High"].values
-            lows = df5["Low"].values
+            sh_all, sl_all = swing_pivots(highs, lows, n)
 
-            swing_highs, swing_lows = [], []
-            for i in range(n, len(highs) - n):
-                if highs[i] == max(highs[i - n : i + n + 1]):
-                    swing_highs.append((i, float(highs[i])))
-                if lows[i] == min(lows[i - n : i + n + 1]):
-                    swing_lows.append((i, float(lows[i])))
-
-            if not swing_highs or not swing_lows:
+            if not len(sh_all) or not len(sl_all):
                 return {"available": False}
 
-            sh_idx, sh = swing_highs[-1]
-            sl_idx, sl = swing_lows[-1]
+            sh_idx, sh = int(sh_all[-1]), float(highs[sh_all[-1]])
+            sl_idx, sl = int(sl_all[-1]), float(lows[sl_all[-1]])
             rng = sh - sl
             if rng <= 0:
                 return {"available": False}
 
-            result: dict = {
+            result: OTE = {
                 "available": True,
                 "swing_high": round(sh, 2),
                 "swing_low": round(sl, 2),
@@ -282,18 +411,18 @@ class ICTEngine:
             if sh_idx > sl_idx:
                 # Most-recent pivot is a HIGH → bullish move completed → OTE for long entry
                 result["direction"] = "bullish"
-                for fib in OTE_FIBS:
+                for fib, key in _FIB_KEYS:
                     lvl = round(sh - rng * fib, 2)
-                    result["levels"][str(fib)] = {"price": lvl, "near": _near(price, lvl)}
+                    result["levels"][key] = {"price": lvl, "near": _near(price, lvl)}
                 ote_top = round(sh - rng * OTE_FIBS[0], 2)
                 ote_bot = round(sh - rng * OTE_FIBS[-1], 2)
                 result["in_ote"] = ote_bot <= price <= ote_top
             else:
                 # Most-recent pivot is a LOW → bearish move completed → OTE for short entry
                 result["direction"] = "bearish"
-                for fib in OTE_FIBS:
+                for fib, key in _FIB_KEYS:
                     lvl = round(sl + rng * fib, 2)
-                    result["levels"][str(fib)] = {"price": lvl, "near": _near(price, lvl)}
+                    result["levels"][key] = {"price": lvl, "near": _near(price, lvl)}
                 ote_bot = round(sl + rng * OTE_FIBS[0], 2)
                 ote_top = round(sl + rng * OTE_FIBS[-1], 2)
                 result["in_ote"] = ote_bot <= price <= ote_top
@@ -303,12 +432,20 @@ class ICTEngine:
             return {"available": False}
 
     # ── key opens ────────────────────────────────────────────────────
-    def _key_opens(self, intra: pd.DataFrame, price: float | None, now: datetime) -> list[dict]:
+    @timed("ict_engine_seconds", method="key_opens")
+    def _key_opens(
+        self, intra: Bars, price: float | None, now: datetime, sidx: SessionIndex | None = None
+    ) -> list[KeyOpen]:
         if intra.empty:
             return [{"label": ko["label"], "price": None, "near": False} for ko in KEY_OPENS]
+        sidx = sidx or SessionIndex(intra.ts)
 
         today = now.date()
-        out: list[dict] = []
+        day = CALENDAR.day(today)
+        now_ns = to_ns(now)
+        first_day = CALENDAR.day_at(int(intra.ts[0])).date
+        opens = intra.open
+        out: list[KeyOpen] = []
 
         for ko in KEY_OPENS:
             h, m = ko["hour"], ko["minute"]
@@ -317,22 +454,27 @@ class ICTEngine:
 
             if h == 18:
                 # Most recent 18:00 candle before now
-                match = intra[(intra.index.hour == h) & (intra.index.minute == m) & (intra.index <= now)]
-                if not match.empty:
-                    open_price = _safe_float(match.iloc[-1]["Open"])
+                d = today
+                while d >= first_day:
+                    target = CALENDAR.day(d).opens[(h, m)]
+                    pos = sidx.last(target, min(target + _MINUTE_NS, now_ns + 1000))
+                    if pos is not None:
+                        open_price = _safe_float(opens[pos])
+                        break
+                    d -= timedelta(days=1)
             elif h == 0:
                 # Today's midnight
-                target = ET.localize(datetime.combine(today, time(0, 0)))
-                seg = intra[(intra.index >= target) & (intra.index < target + timedelta(minutes=2))]
-                if not seg.empty:
-                    open_price = _safe_float(seg.iloc[0]["Open"])
+                target = day.opens[(h, m)]
+                pos = sidx.first(target, target + 2 * _MINUTE_NS)
+                if pos is not None:
+                    open_price = _safe_float(opens[pos])
             else:
                 # Intraday opens for today
-                target = ET.localize(datetime.combine(today, time(h, m)))
-                if now >= target:
-                    seg = intra[(intra.index >= target) & (intra.index < target + timedelta(minutes=2))]
-                    if not seg.empty:
-                        open_price = _safe_float(seg.iloc[0]["Open"])
+                target = day.opens[(h, m)]
+                if now_ns >= target:
+                    pos = sidx.first(target, target + 2 * _MINUTE_NS)
+                    if pos is not None:
+                        open_price = _safe_float(opens[pos])
 
             if open_price is not None:
                 open_price = round(open_price, 2)
@@ -346,67 +488,34 @@ class ICTEngine:
         return out
 
     # ── power of 3 ───────────────────────────────────────────────────
-    def _power_of_3(self, intra: pd.DataFrame, now: datetime) -> dict:
+    @timed("ict_engine_seconds", method="power_of_3")
+    def _power_of_3(self, intra: Bars, now: datetime, sidx: SessionIndex | None = None) -> PowerOf3:
         if intra.empty:
             return {"available": False}
+        sidx = sidx or SessionIndex(intra.ts)
 
-        today = now.date()
-        ny_open_dt = ET.localize(datetime.combine(today, time(9, 30)))
-        ny_data = intra[intra.index >= ny_open_dt]
+        day = CALENDAR.day(now.date())
+        i, j = sidx.bounds(day.ny_open)
 
-        if ny_data.empty:
+        if j == i:
             return {"available": False}
 
         try:
-            ny_open = round(float(ny_data["Open"].iloc[0]), 2)
-            session_high = round(float(ny_data["High"].max()), 2)
-            session_low = round(float(ny_data["Low"].min()), 2)
-
-            elapsed = (now - ny_open_dt).total_seconds() / 60
-
-            if elapsed < 30:
-                return {
-                    "available": True,
-                    "ny_open": ny_open,
-                    "high": session_high,
-                    "low": session_low,
-                    "phase": "Accumulation",
-                    "bias": "Neutral",
-                }
+            ny_open = round(float(intra.open[i]), 2)
+            session_high = round(_max(intra.high[i:j]), 2)
+            session_low = round(_min(intra.low[i:j]), 2)
 
-            # Accumulation range (first 30 min)
-            accum_end = ny_open_dt + timedelta(minutes=30)
-            accum = ny_data[ny_data.index < accum_end]
-            if accum.empty:
-                return {"available": True, "ny_open": ny_open, "high": session_high, "low": session_low, "phase": "Accumulation", "bias": "Neutral"}
-
-            accum_h = float(accum["High"].max())
-            accum_l = float(accum["Low"].min())
-            accum_rng = accum_h - accum_l if accum_h != accum_l else 1.0
-            buf = accum_rng * 0.10
-
-            swept_high = session_high > accum_h + buf
-            swept_low = session_low < accum_l - buf
-            current = float(ny_data["Close"].iloc[-1])
-
-            if swept_low and current > ny_open:
-                phase, bias = "Distribution", "Bullish"
-            elif swept_high and current < ny_open:
-                phase, bias = "Distribution", "Bearish"
-            elif swept_high:
-                phase, bias = "Manipulation", "Bearish"
-            elif swept_low:
-                phase, bias = "Manipulation", "Bullish"
-            else:
-                phase, bias = "Accumulation", "Neutral"
+            elapsed = (to_ns(now) - day.ny_open) / _MINUTE_NS
 
-            return {
-                "available": True,
-                "ny_open": ny_open,
-                "high": session_high,
-                "low": session_low,
-                "phase": phase,
-                "bias": bias,
-            }
+            # Accumulation range (first 30 min)
+            accum_h = accum_l = None
+            if elapsed >= 30:
+                a, b = sidx.bounds(day.ny_open, day.accum_end)
+                if b > a:
+                    accum_h = _max(intra.high[a:b])
+                    accum_l = _min(intra.low[a:b])
+
+            current = float(intra.close[j - 1])
+            return _po3_payload(ny_open, session_high, session_low, accum_h, accum_l, current, elapsed)
         except Exception:
             return {"available": False}
@@ -0,0 +1,376 @@
+"""Streaming ICT engine — session state advanced bar by bar."""
+
+from collections import deque
+from datetime import date, datetime, timedelta
+from typing import Iterator
+
+import pandas as pd
+
+from config import INTRADAY_OVERLAP_MIN, KEY_OPENS, TICKERS
+from bar_buffer import Bars, as_bars
+from ict_engine import _MINUTE_NS, ET, ICTEngine, _near, _po3_payload, _safe_float
+from schema import KeyOpen, PowerOf3, Sweep
+from session_calendar import CALENDAR
+from session_index import to_ns
+from telemetry import timed
+
+_ASIA_START = 19 * 60
+_LONDON_START, _LONDON_END = 2 * 60, 5 * 60
+_NY_OPEN = 9 * 60 + 30
+_ACCUM_END = _NY_OPEN + 30
+_KEEP_DAYS = 8
+# A refetch re-reads the INTRADAY_OVERLAP_MIN minutes before the newest bar
+# and may revise any bar in them, so that many bars (plus the newest) can be undone.
+_UNDO_BARS = INTRADAY_OVERLAP_MIN + 1
+
+# Key opens matched on the exact minute (most recent occurrence) vs. the
+# first bar inside a 2-minute window of the given day.
+_EXACT_OPENS = [(ko["hour"], ko["minute"]) for ko in KEY_OPENS if ko["hour"] == 18]
+_WINDOW_OPENS = [(ko["hour"], ko["minute"]) for ko in KEY_OPENS if ko["hour"] != 18]
+
+_NAN = float("nan")
+
+
+def _hi(cur: float | None, v: float) -> float | None:
+    return v if v == v and (cur is None or v > cur) else cur
+
+
+def _lo(cur: float | None, v: float) -> float | None:
+    return v if v == v and (cur is None or v < cur) else cur
+
+
+def _f(v: float | None) -> float:
+    return _NAN if v is None else float(v)
+
+
+# ── state ────────────────────────────────────────────────────────────
+class _DayStats:
+    """Aggregates for one ET calendar date."""
+
+    __slots__ = (
+        "eve_n", "eve_hi", "eve_lo",
+        "lon_n", "lon_hi", "lon_lo",
+        "ny_n", "ny_open", "ny_hi", "ny_lo",
+        "acc_n", "acc_hi", "acc_lo",
+        "opens",
+    )
+
+    def __init__(self):
+        for name in self.__slots__:
+            setattr(self, name, None)
+        self.eve_n = self.lon_n = self.ny_n = self.acc_n = 0
+        self.opens: dict[tuple[int, int], float] = {}
+
+    def copy(self) -> "_DayStats":
+        new = _DayStats.__new__(_DayStats)
+        for name in self.__slots__:
+            setattr(new, name, getattr(self, name))
+        new.opens = dict(self.opens)
+        return new
+
+
+class _TickerState:
+    __slots__ = ("days", "exact_opens", "last_ts", "last_close", "recent")
+
+    def __init__(self):
+        self.days: dict[date, _DayStats] = {}
+        self.exact_opens: dict[tuple[int, int], float] = {}
+        self.last_ts: int | None = None      # epoch ns of the newest bar
+        self.last_close: float | None = None
+        # the newest bars as (ts, date, minute of day, o, h, l, c, state before it)
+        self.recent: deque[tuple] = deque(maxlen=_UNDO_BARS)
+
+    def checkpoint(self, d: date) -> tuple:
+        """What a bar on date *d* may change, to restore it later."""
+        prev = self.days.get(d)
+        return (
+            d,
+            prev.copy() if prev is not None else None,
+            dict(self.exact_opens),
+            self.last_ts,
+            self.last_close,
+        )
+
+    def rollback(self, k: int) -> list[tuple]:
+        """Undo ``recent[k]`` and every bar after it; returns the undone entries, oldest first."""
+        undone = [self.recent.pop() for _ in range(len(self.recent) - k)][::-1]
+        d, prev, exact, self.last_ts, self.last_close = undone[0][-1]
+        for later in [day for day in self.days if day > d]:
+            del self.days[later]
+        if prev is None:
+            self.days.pop(d, None)
+        else:
+            self.days[d] = prev
+        self.exact_opens = exact
+        return undone
+
+
+# ── engine ───────────────────────────────────────────────────────────
+class StreamingICTEngine(ICTEngine):
+    """``ICTEngine`` that keeps per-ticker session state between calls.
+
+    Each ``compute`` only folds in bars newer than the last one seen, so
+    sweeps, key opens and Power of 3 cost O(1) per appended bar instead of a
+    scan over the whole frame. Output matches the batch engine as long as
+    every bar is at or before ``now``.
+
+    The newest ``_UNDO_BARS`` bars stay revisable: if the feed sends one of
+    them again with different prices (a refetch revising the overlap window),
+    drops one or fills a gap between them, the state is rolled back to just
+    before it and the bars from there on are folded in again.
+    """
+
+    def __init__(self, tickers: list[str] = TICKERS):
+        super().__init__(tickers)
+        self._state: dict[str, _TickerState] = {}
+
+    # ── feeding bars ─────────────────────────────────────────────────
+    def update_bar(self, ticker: str, ts: pd.Timestamp, o: float, h: float, l: float, c: float) -> None:
+        """Fold one ET-stamped 1-min bar into *ticker*'s state (new, or revising a recent one)."""
+        st = self._state.setdefault(ticker, _TickerState())
+        redo: list[tuple] = []
+        if st.last_ts is not None and ts.value <= st.last_ts:
+            if not st.recent or ts.value < st.recent[0][0]:
+                raise ValueError(f"{ticker}: bar {ts} is older than the last {_UNDO_BARS} bars")
+            k = next(k for k, bar in enumerate(st.recent) if bar[0] >= ts.value)
+            redo = [bar for bar in st.rollback(k) if bar[0] != ts.value]
+        self._fold(st, ts.value, ts.date(), ts.hour * 60 + ts.minute, o, h, l, c)
+        for bar in redo:
+            self._fold(st, *bar[:-1])
+
+    def iter_bars(self, ticker: str, intra: Bars | pd.DataFrame) -> Iterator[int]:
+        """Fold the new bars of *intra* into *ticker*'s state one at a time.
+
+        Yields each bar's position right after applying it, so a replay can
+        read signals at every step. Bars already seen are skipped, from the
+        first recent bar *intra* revises on they are folded in again; if
+        *intra* no longer lines up with the state it is rebuilt from scratch.
+        """
+        bars = as_bars(intra)
+        idx = bars.ts
+        st = self._state.get(ticker)
+        start = self._resume(st, bars) if st is not None else None
+        if start is None:
+            start = 0
+            st = self._state[ticker] = _TickerState()
+
+        if start == len(idx):
+            return
+        new = pd.to_datetime(idx[start:], utc=True).tz_convert(ET)
+        dates = new.date
+        mds = (new.hour * 60 + new.minute).tolist()
+        ts = idx[start:].tolist()
+        o = bars.open[start:].tolist()
+        h = bars.high[start:].tolist()
+        l = bars.low[start:].tolist()
+        c = bars.close[start:].tolist()
+
+        keep_from = len(new) - _UNDO_BARS
+        prev_d = None
+        for i in range(len(new)):
+            d = dates[i]
+            if d != prev_d:
+                oldest = d - timedelta(days=_KEEP_DAYS)
+                for old in [k for k in st.days if k < oldest]:
+                    del st.days[old]
+                prev_d = d
+            if i >= keep_from:
+                self._fold(st, ts[i], d, mds[i], o[i], h[i], l[i], c[i])
+            else:
+                self._apply(st, d, mds[i], o[i], h[i], l[i], c[i])
+                st.last_ts = ts[i]
+            yield start + i
+
+    @staticmethod
+    def _resume(st: _TickerState, bars: Bars) -> int | None:
+        """Position in *bars* to fold from, after rolling back the recent bars it revises.
+
+        ``None`` if *bars* does not reach back to the oldest revisable bar.
+        """
+        idx = bars.ts
+        if not st.recent or not len(idx) or idx[0] > st.recent[0][0]:
+            return None
+        p = int(idx.searchsorted(st.recent[0][0]))
+        for k, (ts, _, _, o, h, l, c, _) in enumerate(st.recent):
+            # the k-th recent bar must sit at p, unchanged: no bar dropped, inserted or revised
+            if p == len(idx) or idx[p] != ts or (o, h, l, c) != (
+                bars.open[p], bars.high[p], bars.low[p], bars.close[p]
+            ):
+                st.rollback(k)
+                return p
+            p += 1
+        return p
+
+    def _fold(self, st: _TickerState, ts: int, d: date, md: int, o: float, h: float, l: float, c: float) -> None:
+        """``_apply`` one bar, keeping what it changed so it can be undone."""
+        st.recent.append((ts, d, md, o, h, l, c, st.checkpoint(d)))
+        self._apply(st, d, md, o, h, l, c)
+        st.last_ts = ts
+
+    @timed("ict_engine_seconds", method="advance")
+    def _advance(self, ticker: str, intra: Bars) -> _TickerState:
+        """Bring *ticker*'s state up to date with the bars in *intra*."""
+        for _ in self.iter_bars(ticker, intra):
+            pass
+        return self._state[ticker]
+
+    @staticmethod
+    def _apply(st: _TickerState, d: date, md: int, o: float, h: float, l: float, c: float) -> None:
+        day = st.days.get(d)
+        if day is None:
+            day = st.days[d] = _DayStats()
+
+        if md >= _ASIA_START:
+            day.eve_n += 1
+            day.eve_hi = _hi(day.eve_hi, h)
+            day.eve_lo = _lo(day.eve_lo, l)
+        if _LONDON_START <= md < _LONDON_END:
+            day.lon_n += 1
+            day.lon_hi = _hi(day.lon_hi, h)
+            day.lon_lo = _lo(day.lon_lo, l)
+        if md >= _NY_OPEN:
+            if day.ny_n == 0:
+                day.ny_open = o
+            day.ny_n += 1
+            day.ny_hi = _hi(day.ny_hi, h)
+            day.ny_lo = _lo(day.ny_lo, l)
+            if md < _ACCUM_END:
+                day.acc_n += 1
+                day.acc_hi = _hi(day.acc_hi, h)
+                day.acc_lo = _lo(day.acc_lo, l)
+
+        for key in _WINDOW_OPENS:
+            t = key[0] * 60 + key[1]
+            if t <= md < t + 2 and key not in day.opens:
+                day.opens[key] = o
+        for key in _EXACT_OPENS:
+            if md == key[0] * 60 + key[1]:
+                st.exact_opens[key] = o
+
+        st.last_close = c
+
+    # ── reading state ────────────────────────────────────────────────
+    def _session_signals(
+        self, ticker: str, intra: Bars, levels: dict, price: float | None, now: datetime
+    ) -> tuple[list[Sweep], list[KeyOpen], PowerOf3]:
+        if intra.empty:
+            self._state.pop(ticker, None)
+            return super()._session_signals(ticker, intra, levels, price, now)
+        self._advance(ticker, intra)
+        return (
+            self.liquidity(ticker, levels, now),
+            self.key_opens(ticker, price, now),
+            self.power_of_3(ticker, now),
+        )
+
+    @timed("ict_engine_seconds", method="liquidity_sweeps")
+    def liquidity(self, ticker: str, levels: dict, now: datetime) -> list[Sweep]:
+        """Liquidity sweeps from the current state (same shape as the batch engine)."""
+        return self._state_sweeps(self._state[ticker], levels, now)
+
+    @timed("ict_engine_seconds", method="key_opens")
+    def key_opens(self, ticker: str, price: float | None, now: datetime) -> list[KeyOpen]:
+        return self._state_key_opens(self._state[ticker], price, now)
+
+    @timed("ict_engine_seconds", method="power_of_3")
+    def power_of_3(self, ticker: str, now: datetime) -> PowerOf3:
+        return self._state_power_of_3(self._state[ticker], now)
+
+    @staticmethod
+    def _state_sweeps(st: _TickerState, levels: dict, now: datetime) -> list[Sweep]:
+        today = now.date()
+        ny = st.days.get(today)
+        has_ny = ny is not None and ny.ny_n > 0
+        ny_hi = _f(ny.ny_hi) if has_ny else None
+        ny_lo = _f(ny.ny_lo) if has_ny else None
+
+        # Asia: 19:00 → 00:00 on the evening of the day before (``SessionDay.eve``)
+        asia_n, asia_hi, asia_lo = 0, None, None
+        y = st.days.get(CALENDAR.day(today).eve)
+        if y is not None and y.eve_n:
+            asia_n, asia_hi, asia_lo = y.eve_n, y.eve_hi, y.eve_lo
+
+        lon = st.days.get(today)
+        lon_n = lon.lon_n if lon is not None else 0
+        sessions = [
+            ("Asia High",   asia_n, asia_hi, "high"),
+            ("Asia Low",    asia_n, asia_lo, "low"),
+            ("London High", lon_n,  lon.lon_hi if lon_n else None, "high"),
+            ("London Low",  lon_n,  lon.lon_lo if lon_n else None, "low"),
+        ]
+
+        out: list[Sweep] = []
+        for label, n, val, side in sessions:
+            if not n:
+                out.append({"label": label, "level": None, "swept": False, "status": "N/A"})
+                continue
+            lvl = round(_f(val), 2)
+            if side == "high":
+                swept = has_ny and ny_hi > lvl
+            else:
+                swept = has_ny and ny_lo < lvl
+            out.append({"label": label, "level": lvl, "swept": swept, "status": "SWEPT" if swept else "Unswept"})
+
+        # PDH / PDL sweeps
+        for key, side in [("pdh", "high"), ("pdl", "low")]:
+            val = levels.get(key)
+            if val is None:
+                continue
+            if side == "high":
+                swept = has_ny and ny_hi > val
+            else:
+                swept = has_ny and ny_lo < val
+            out.append({"label": key.upper(), "level": val, "swept": swept, "status": "SWEPT" if swept else "Unswept"})
+
+        return out
+
+    @staticmethod
+    def _state_key_opens(st: _TickerState, price: float | None, now: datetime) -> list[KeyOpen]:
+        today = now.date()
+        day = st.days.get(today)
+        now_ns = to_ns(now)
+        out: list[KeyOpen] = []
+
+        for ko in KEY_OPENS:
+            h, m = ko["hour"], ko["minute"]
+            open_price = None
+
+            if h == 18:
+                open_price = _safe_float(st.exact_opens.get((h, m)))
+            elif day is not None:
+                if h == 0 or now_ns >= CALENDAR.day(today).opens[(h, m)]:
+                    open_price = _safe_float(day.opens.get((h, m)))
+
+            if open_price is not None:
+                open_price = round(open_price, 2)
+
+            out.append({
+                "label": ko["label"],
+                "price": open_price,
+                "near": _near(price, open_price),
+            })
+
+        return out
+
+    @staticmethod
+    def _state_power_of_3(st: _TickerState, now: datetime) -> PowerOf3:
+        today = now.date()
+        day = st.days.get(today)
+        if day is None or day.ny_n == 0:
+            return {"available": False}
+
+        elapsed = (to_ns(now) - CALENDAR.day(today).ny_open) / _MINUTE_NS
+
+        accum_h = accum_l = None
+        if elapsed >= 30 and day.acc_n:
+            accum_h, accum_l = _f(day.acc_hi), _f(day.acc_lo)
+
+        return _po3_payload(
+            round(_f(day.ny_open), 2),
+            round(_f(day.ny_hi), 2),
+            round(_f(day.ny_lo), 2),
+            accum_h,
+            accum_l,
+            float(st.last_close),
+            elapsed,
+        )
@@ -0,0 +1,82 @@
+"""Bounded LRU memo for engine sub-results that change less often than compute runs.
+
+A memoized ``ICTEngine`` method is keyed by its name, the identity of the
+input frames it reads and a time bucket: the minute for the kill-zone and
+macro schedules, the date for values derived from daily/weekly candles.
+Frames handed to the engine are never modified — ``DataFeed`` swaps in a
+new frame when it refetches — so an unchanged identity is unchanged data.
+Each entry holds on to its frames, so their ids cannot be reused by other
+objects while it is cached.
+
+Cached values are shared between computes and must be treated as
+read-only.
+"""
+
+import functools
+from collections import Counter, OrderedDict
+from typing import Any, Callable
+
+from config import ENGINE_MEMO_SIZE
+
+METHODS: list[str] = []     # names of every ``memoized`` method, for exporting counters
+
+
+class Memo:
+    """LRU of up to *size* results with per-method hit and miss counts (``size=0`` disables it)."""
+
+    def __init__(self, size: int = ENGINE_MEMO_SIZE):
+        self.size = size
+        self.hits: Counter[str] = Counter()
+        self.misses: Counter[str] = Counter()
+        self.evictions = 0
+        self._entries: OrderedDict[tuple, tuple[Any, tuple]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: tuple, compute: Callable[[], Any], pin: tuple = ()) -> Any:
+        """The cached result for *key* (its first item names the method), computed on a miss.
+
+        *pin* holds objects whose ``id`` is part of *key* for as long as the entry lives.
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits[key[0]] += 1
+            return entry[0]
+        self.misses[key[0]] += 1
+        value = compute()
+        if self.size > 0:
+            self._entries[key] = (value, pin)
+            if len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        """Hits, misses and hit rate per method."""
+        out = {}
+        for name in sorted(self.hits.keys() | self.misses.keys()):
+            hits, misses = self.hits[name], self.misses[name]
+            out[name] = {"hits": hits, "misses": misses, "hit_rate": round(hits / (hits + misses), 4)}
+        return out
+
+
+def memoized(name: str, key: Callable[..., tuple[tuple, tuple]]):
+    """Decorator caching a method in ``self.memo``.
+
+    ``key(*args)`` returns ``(bucket, pin)``: the hashable parts of the
+    cache key after *name*, and the objects to keep alive with the entry.
+    """
+    METHODS.append(name)
+
+    def wrap(fn):
+        @functools.wraps(fn)
+        def inner(self, *args):
+            bucket, pin = key(*args)
+            return self.memo.get((name, *bucket), lambda: fn(self, *args), pin)
+        return inner
+    return wrap
@@ -0,0 +1,317 @@
+"""Offline replay: walk stored 1-min bars through the engine on a simulated clock.
+
+Each bar is folded into ``StreamingICTEngine`` state in turn and the clock is
+set to that bar's close, so the signals read after every step are what the
+live dashboard would have shown at that minute. Only signal *transitions*
+are recorded — a sweep flipping to SWEPT, price entering the OTE zone, the
+Power of 3 phase changing — one row each, written as a columnar file.
+
+    python -m replay --synthetic 365 --out signals.parquet
+    python -m replay --bars NQ=F=nq_1m.parquet --bars ES=F=es_1m.csv
+"""
+
+import argparse
+import logging
+import time
+from datetime import timedelta
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from config import KILL_ZONES, OTE_FIBS, PROXIMITY_PCT, SWING_LOOKBACK, TICKERS
+from data_feed import ET
+from ict_stream import StreamingICTEngine
+from session_calendar import CALENDAR
+
+logger = logging.getLogger(__name__)
+
+_OHLC = ["Open", "High", "Low", "Close"]
+_MINUTE_NS = 60 * 10**9
+_BUCKET_NS = 5 * _MINUTE_NS
+_COLUMNS = ["ts", "ticker", "signal", "value", "previous", "level", "price", "kill_zone"]
+
+
+class Params(NamedTuple):
+    """Engine settings a replay can vary; defaults come from ``config``."""
+    swing_lookback: int = SWING_LOOKBACK
+    ote_fibs: tuple[float, ...] = tuple(OTE_FIBS)
+    proximity_pct: float = PROXIMITY_PCT
+    kill_zones: tuple[dict, ...] = tuple(KILL_ZONES)
+
+
+def kill_zone_labels(ts: pd.Series, kill_zones=KILL_ZONES) -> np.ndarray:
+    """Name of the kill zone each ET timestamp falls in (first match), else ``""``.
+
+    As on the dashboard, zones run on CME trade dates only and end at the
+    day's close; one crossing midnight belongs to the date it ends on.
+    """
+    md = (ts.dt.hour * 60 + ts.dt.minute).to_numpy()
+    ns = pd.DatetimeIndex(ts).as_unit("ns").asi8
+    dates = ts.dt.date.to_numpy()
+    today = _trading(ns, dates)
+    tonight = _trading(ns, dates + timedelta(days=1))
+    out = np.full(len(md), "", dtype=object)
+    for kz in reversed(kill_zones):
+        s = kz["start"][0] * 60 + kz["start"][1]
+        e = kz["end"][0] * 60 + kz["end"][1]
+        if kz.get("crosses_midnight"):
+            inside = ((md >= s) & tonight) | ((md < e) & today)
+        else:
+            inside = (md >= s) & (md < e) & today
+        out[inside] = kz["name"]
+    return out
+
+
+def _trading(ns: np.ndarray, dates: np.ndarray) -> np.ndarray:
+    """Whether each of *dates* is a trade date whose close is after the matching epoch-ns time."""
+    if not len(dates):
+        return np.zeros(0, dtype=bool)
+    uniq, inv = np.unique(dates, return_inverse=True)
+    days = [CALENDAR.day(d) for d in uniq]
+    trading = np.array([d.trading for d in days])[inv]
+    close = np.array([d.close for d in days], dtype=np.int64)[inv]
+    return trading & (ns < close)
+
+
+# ── OTE on 5-min buckets, one 1-min bar at a time ────────────────────
+class _OTETracker:
+    """Incremental equivalent of ``ICTEngine._ote`` over the whole replay.
+
+    Closed 5-min buckets are kept as lists; a pivot whose ``2n + 1`` window
+    is fully closed is final. The only pivot that can still change is the
+    one whose right-hand window ends in the forming bucket, so each bar
+    costs a couple of comparisons.
+    """
+
+    def __init__(self, n: int = SWING_LOOKBACK, fibs=OTE_FIBS, proximity_pct: float = PROXIMITY_PCT):
+        self.n = n
+        self.fibs = tuple(fibs)
+        self.proximity_pct = proximity_pct
+        self.highs: list[float] = []
+        self.lows: list[float] = []
+        self.bucket: int | None = None
+        self.hi = self.lo = 0.0
+        self.last_ph = self.last_pl = -1        # latest final pivots
+        self._left_hi = self._right_hi = np.inf  # window around the live candidate
+        self._left_lo = self._right_lo = -np.inf
+
+    def add(self, bucket: int, h: float, l: float) -> None:
+        if bucket != self.bucket:
+            if self.bucket is not None:
+                self.highs.append(self.hi)
+                self.lows.append(self.lo)
+                self._closed()
+            self.bucket, self.hi, self.lo = bucket, h, l
+        else:
+            self.hi = max(self.hi, h)
+            self.lo = min(self.lo, l)
+
+    def _closed(self) -> None:
+        n, H, L = self.n, self.highs, self.lows
+        k = len(H)                       # index of the forming bucket
+        c = k - 1 - n                    # newest pivot with a fully closed window
+        if c >= n:
+            if H[c] >= max(H[c - n:c + n + 1]):
+                self.last_ph = c
+            if L[c] <= min(L[c - n:c + n + 1]):
+                self.last_pl = c
+        c = k - n                        # candidate still waiting on the forming bucket
+        if c >= n:
+            self._left_hi, self._left_lo = max(H[c - n:c]), min(L[c - n:c])
+            right_h, right_l = H[c + 1:k], L[c + 1:k]
+            self._right_hi = max(right_h) if right_h else -np.inf
+            self._right_lo = min(right_l) if right_l else np.inf
+        else:
+            self._left_hi, self._left_lo = np.inf, -np.inf
+
+    def state(self, price: float) -> tuple[str | None, bool | None, bool | None]:
+        """``(direction, in_ote, near)`` as ``_ote`` would report them.
+
+        *near* is True when any fib level is within the proximity threshold;
+        all three are ``None`` while OTE is unavailable.
+        """
+        H, L, n = self.highs, self.lows, self.n
+        k = len(H)
+        if k + 1 < 2 * n + 1:
+            return None, None, None
+        ph, pl = self.last_ph, self.last_pl
+        c = k - n
+        if H[c] >= self._left_hi and H[c] >= self._right_hi and H[c] >= self.hi:
+            ph = c
+        if L[c] <= self._left_lo and L[c] <= self._right_lo and L[c] <= self.lo:
+            pl = c
+        if ph < 0 or pl < 0:
+            return None, None, None
+        sh, sl = H[ph], L[pl]
+        rng = sh - sl
+        if rng <= 0:
+            return None, None, None
+        if ph > pl:
+            direction, levels = "bullish", [round(sh - rng * f, 2) for f in self.fibs]
+            top, bot = levels[0], levels[-1]
+        else:
+            direction, levels = "bearish", [round(sl + rng * f, 2) for f in self.fibs]
+            bot, top = levels[0], levels[-1]
+        tol = self.proximity_pct
+        near = any(lvl and abs(price - lvl) <= tol * abs(lvl) for lvl in levels)
+        return direction, bot <= price <= top, near
+
+
+# ── replay ───────────────────────────────────────────────────────────
+def _prior_session_levels(bars: pd.DataFrame) -> tuple[np.ndarray, np.ndarray]:
+    """Per bar, the high/low of the previous completed CME session (PDH/PDL).
+
+    Bars traded on exchange holidays count toward the next trade date.
+    """
+    _, session = CALENDAR.session_bounds(bars.index.as_unit("ns").asi8)
+    daily = bars.groupby(session).agg(High=("High", "max"), Low=("Low", "min"))
+    prev = daily.shift(1).reindex(session)
+    return prev["High"].round(2).to_numpy(), prev["Low"].round(2).to_numpy()
+
+
+def replay_ticker(
+    ticker: str,
+    bars: pd.DataFrame,
+    engine: StreamingICTEngine | None = None,
+    params: Params = Params(),
+    since: pd.Timestamp | None = None,
+) -> pd.DataFrame:
+    """Signal transitions for one ticker's 1-min *bars*, in time order.
+
+    Rows are stamped with the simulated clock, i.e. the close of the bar
+    that caused the change. Bars before *since* only warm the state up;
+    their transitions are not returned.
+    """
+    bars = bars[_OHLC].dropna().sort_index()
+    bars = bars[~bars.index.duplicated(keep="last")]
+    if bars.index.tz is None:
+        bars.index = bars.index.tz_localize("UTC")
+    bars.index = bars.index.tz_convert(ET)
+    engine = engine or StreamingICTEngine()
+
+    ts = bars.index.as_unit("ns").asi8
+    clock = (bars.index + pd.Timedelta(minutes=1)).to_pydatetime()   # each bar's close
+    buckets = (ts // _BUCKET_NS).tolist()
+    highs = bars["High"].to_numpy().tolist()
+    lows = bars["Low"].to_numpy().tolist()
+    closes = bars["Close"].to_numpy().round(2).tolist()
+    pdh, pdl = _prior_session_levels(bars)
+    pdh, pdl = pdh.tolist(), pdl.tolist()
+
+    ote = _OTETracker(params.swing_lookback, params.ote_fibs, params.proximity_pct)
+    first = int(ts.searchsorted(pd.Timestamp(since).value)) if since is not None else 0
+    last: dict[str, object] = {}
+    rows: list[tuple] = []
+
+    def record(i: int, signal: str, value, level=None) -> None:
+        prev = last.get(signal)
+        if value != prev:
+            last[signal] = value
+            if i >= first:
+                rows.append((ts[i] + _MINUTE_NS, ticker, signal, value, prev, level, closes[i]))
+
+    levels: dict = {}
+    for i in engine.iter_bars(ticker, bars):
+        now, price = clock[i], closes[i]
+        if levels.get("pdh") != pdh[i] or levels.get("pdl") != pdl[i]:
+            levels = {} if pdh[i] != pdh[i] else {"pdh": pdh[i], "pdl": pdl[i]}   # NaN on the first session
+
+        for s in engine.liquidity(ticker, levels, now):
+            record(i, f"sweep:{s['label']}", s["status"], s["level"])
+
+        po3 = engine.power_of_3(ticker, now)
+        record(i, "po3:phase", po3.get("phase"))
+        record(i, "po3:bias", po3.get("bias"))
+
+        ote.add(buckets[i], highs[i], lows[i])
+        direction, in_ote, near = ote.state(price)
+        record(i, "ote:direction", direction)
+        record(i, "ote:in_ote", in_ote)
+        record(i, "ote:near", near)
+
+    out = pd.DataFrame(rows, columns=_COLUMNS[:-1])
+    for col in ("value", "previous"):
+        out[col] = out[col].map(lambda v: None if v is None else str(v))
+    out["ts"] = pd.to_datetime(out["ts"].astype("int64"), utc=True).dt.tz_convert(ET)
+    out["kill_zone"] = kill_zone_labels(out["ts"], params.kill_zones)
+    return out
+
+
+def replay(bars: dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """Replay every ticker and merge the transitions into one time-ordered table."""
+    engine = StreamingICTEngine()
+    frames = [replay_ticker(t, df, engine) for t, df in bars.items() if not df.empty]
+    if not frames:
+        return pd.DataFrame(columns=_COLUMNS)
+    return pd.concat(frames, ignore_index=True).sort_values("ts", kind="stable", ignore_index=True)
+
+
+def write(df: pd.DataFrame, path: str | Path) -> Path:
+    """Write transitions as Parquet (needs pyarrow), falling back to CSV."""
+    path = Path(path)
+    if path.suffix == ".parquet":
+        try:
+            df.to_parquet(path, index=False)
+            return path
+        except ImportError:
+            path = path.with_suffix(".csv")
+            logger.warning("pyarrow not installed; writing %s instead", path.name)
+    df.to_csv(path, index=False)
+    return path
+
+
+def read_bars(path: str) -> pd.DataFrame:
+    if path.endswith(".csv"):
+        df = pd.read_csv(path, index_col=0)
+        df.index = pd.to_datetime(df.index, utc=True)
+        return df
+    return pd.read_parquet(path)
+
+
+def parse_bars_spec(spec: str) -> tuple[str, str]:
+    """Split a ``TICKER=PATH`` argument; the ticker may itself contain ``=`` (``NQ=F``)."""
+    ticker, _, path = spec.rpartition("=")
+    return ticker, path
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--bars", action="append", default=[], metavar="TICKER=PATH",
+                    help="1-min bars for TICKER from a .parquet or .csv file (repeatable)")
+    ap.add_argument("--cache", action="store_true", help="replay the 1-min bars in the on-disk bar cache")
+    ap.add_argument("--synthetic", type=int, metavar="DAYS", help="replay DAYS of synthetic bars per ticker")
+    ap.add_argument("--out", default="replay.parquet")
+    args = ap.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s  %(message)s")
+
+    bars: dict[str, pd.DataFrame] = {}
+    for spec in args.bars:
+        ticker, path = parse_bars_spec(spec)
+        bars[ticker] = read_bars(path)
+    if args.cache:
+        from bar_cache import BarCache
+        cache = BarCache()
+        for ticker in TICKERS:
+            df, _ = cache.load(ticker, "1m")
+            if df is not None:
+                bars[ticker] = df
+    if args.synthetic:
+        from benchmarks.synthetic import intraday_bars
+        for i, ticker in enumerate(TICKERS):
+            bars[ticker] = intraday_bars(args.synthetic, seed=i)
+    if not bars:
+        ap.error("nothing to replay: pass --bars, --cache or --synthetic")
+
+    t0 = time.perf_counter()
+    out = replay(bars)
+    elapsed = time.perf_counter() - t0
+    path = write(out, args.out)
+    n = sum(len(df) for df in bars.values())
+    logger.info("Replayed %d bars in %.1fs (%.0f bars/s); %d transitions → %s",
+                n, elapsed, n / elapsed, len(out), path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""Typed schema of the metrics payload that ``ICTEngine.compute`` builds.
+
+The payload stays plain dicts and lists at runtime — ``delta.diff`` walks
+it and every encoder in ``serialization`` takes it as-is — so these are
+``TypedDict``s: they document and type-check the shape without a
+conversion step between the engine and the wire.
+
+Sections that can be missing their inputs carry ``available: False`` and
+nothing else; the remaining keys are only present when it is ``True``.
+
+Each ticker always has its header (label, price, daily change); the other
+``SECTIONS`` are present only when requested (``subscriptions``).
+"""
+
+from typing import TypedDict
+
+
+class Window(TypedDict):
+    """A kill zone (``name``) or macro (``label``) and where ``now`` falls in it."""
+    status: str          # "ACTIVE", "upcoming" or "closed"
+    countdown: str       # "1h 5m" until it ends (active) or starts (upcoming)
+    active: bool
+
+
+class KillZone(Window):
+    name: str
+
+
+class Macro(Window):
+    label: str
+
+
+class Level(TypedDict):
+    value: float | None
+    near: bool
+
+
+class Sweep(TypedDict):
+    label: str
+    level: float | None
+    swept: bool
+    status: str          # "SWEPT", "Unswept" or "N/A"
+
+
+class FibLevel(TypedDict):
+    price: float
+    near: bool
+
+
+class _Available(TypedDict):
+    available: bool
+
+
+class OTE(_Available, total=False):
+    swing_high: float
+    swing_low: float
+    levels: dict[str, FibLevel]      # keyed by str(fib) from OTE_FIBS
+    direction: str                   # "bullish" or "bearish"
+    in_ote: bool
+
+
+class KeyOpen(TypedDict):
+    label: str
+    price: float | None
+    near: bool
+
+
+class PowerOf3(_Available, total=False):
+    ny_open: float
+    high: float
+    low: float
+    phase: str           # "Accumulation", "Manipulation" or "Distribution"
+    bias: str            # "Bullish", "Bearish" or "Neutral"
+
+
+class ZoneCounts(TypedDict):
+    fvg: int
+    ob: int
+
+
+class ZoneLevel(TypedDict):
+    kind: str            # "fvg" or "ob"
+    direction: str
+    timeframe: str
+    top: float
+    bottom: float
+    inside: bool
+    near: bool
+
+
+class Zones(TypedDict):
+    active: dict[str, ZoneCounts]    # per timeframe in ZONE_TIMEFRAMES
+    zones: list[ZoneLevel]
+
+
+class _TickerHeader(TypedDict):
+    label: str
+    price: float | None
+    daily_change: float
+
+
+class TickerMetrics(_TickerHeader, total=False):
+    levels: dict[str, Level]         # pdh, pdl, pdo, pdc, pwh, pwl, pwo, pwc
+    liquidity: list[Sweep]
+    ote: OTE
+    ote_htf: dict[str, OTE]          # OTE_TIMEFRAMES[1:]
+    zones: Zones
+    key_opens: list[KeyOpen]
+    po3: PowerOf3
+
+
+# Subscribable sections of a ticker → the TickerMetrics keys each one covers
+SECTIONS: dict[str, tuple[str, ...]] = {
+    "levels": ("levels",),
+    "liquidity": ("liquidity",),
+    "ote": ("ote", "ote_htf"),
+    "zones": ("zones",),
+    "key_opens": ("key_opens",),
+    "po3": ("po3",),
+}
+
+
+class _Metrics(TypedDict):
+    time: str
+    date: str
+    kill_zones: list[KillZone]
+    macros: list[Macro]
+    tickers: dict[str, TickerMetrics]
+
+
+class Metrics(_Metrics, total=False):
+    stale: bool          # True on a snapshot loaded from SNAPSHOT_CACHE at startup
+
+
+class Alert(TypedDict):
+    """A level crossed or approached by a bar (``alerts``), sent as ``{"type": "alert", "alerts": [...]}``."""
+    id: int              # increasing, also across restarts (continues ALERT_LOG)
+    ts: int              # bar time, epoch ms
+    symbol: str
+    kind: str            # "cross" or "approach"
+    direction: str       # "up" or "down"
+    label: str           # "PDH", "09:30 NY Open", "Asia High", "OTE 5m 0.705", …
+    section: str         # the SECTIONS entry the level comes from
+    level: float
+    price: float         # the bar's close
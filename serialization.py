@@ -0,0 +1,123 @@
+"""Wire encodings for snapshots: JSON and, when available, MessagePack.
+
+Both encode straight to bytes with one reusable encoder per format. JSON
+uses the fastest library installed — orjson, then msgspec, then the stdlib
+— unless ``JSON_ENCODER`` names one. MessagePack needs msgspec or msgpack;
+without either, ``FORMATS`` is just ``("json",)`` and clients asking for
+MessagePack are served JSON. ``loads`` decodes JSON with the same
+preference order.
+
+All JSON encoders produce the same compact UTF-8 output
+(``separators=(",", ":")``, no ASCII escaping), with NaN and ±inf as
+``null`` — the stdlib encoder is made to match orjson and msgspec, since
+``NaN`` is not JSON and the browser's ``JSON.parse`` rejects it.
+"""
+
+import json
+import logging
+import math
+from typing import Any, Callable
+
+from config import JSON_ENCODER
+
+logger = logging.getLogger(__name__)
+
+Encoder = Callable[[Any], bytes]
+
+
+def _json_encoders() -> dict[str, Encoder]:
+    out: dict[str, Encoder] = {}
+    try:
+        import orjson
+        out["orjson"] = orjson.dumps
+    except ImportError:
+        pass
+    try:
+        import msgspec
+        out["msgspec"] = msgspec.json.Encoder().encode
+    except ImportError:
+        pass
+    stdlib = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False, allow_nan=False)
+
+    def encode_stdlib(obj: Any) -> bytes:
+        try:
+            return stdlib.encode(obj).encode()
+        except ValueError:      # a NaN or inf somewhere: rare, so only then walk the object
+            return stdlib.encode(_finite(obj)).encode()
+
+    out["json"] = encode_stdlib
+    return out
+
+
+def _finite(obj: Any) -> Any:
+    """*obj* with non-finite floats replaced by ``None``."""
+    if isinstance(obj, float):
+        return obj if math.isfinite(obj) else None
+    if isinstance(obj, dict):
+        return {k: _finite(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_finite(v) for v in obj]
+    return obj
+
+
+def _json_decoder() -> Callable[[bytes | str], Any]:
+    try:
+        import orjson
+        return orjson.loads
+    except ImportError:
+        pass
+    try:
+        import msgspec
+        return msgspec.json.Decoder().decode
+    except ImportError:
+        return json.loads
+
+
+def _msgpack_encoders() -> dict[str, Encoder]:
+    out: dict[str, Encoder] = {}
+    try:
+        import msgspec
+        out["msgspec"] = msgspec.msgpack.Encoder().encode
+    except ImportError:
+        pass
+    try:
+        import msgpack
+        packer = msgpack.Packer(use_bin_type=True)
+        out["msgpack"] = packer.pack
+    except ImportError:
+        pass
+    return out
+
+
+ENCODERS: dict[str, dict[str, Encoder]] = {"json": _json_encoders(), "msgpack": _msgpack_encoders()}
+
+
+def _pick(fmt: str, name: str = "auto") -> tuple[str | None, Encoder | None]:
+    available = ENCODERS[fmt]
+    if name != "auto":
+        if name in available:
+            return name, available[name]
+        logger.warning("%s encoder %r is not installed; using the fastest available", fmt, name)
+    return next(iter(available.items()), (None, None))
+
+
+JSON_NAME, dumps = _pick("json", JSON_ENCODER)
+MSGPACK_NAME, packb = _pick("msgpack")
+FORMATS = ("json", "msgpack") if packb is not None else ("json",)
+loads = _json_decoder()
+
+
+def encode(obj: Any, fmt: str = "json") -> bytes:
+    return packb(obj) if fmt == "msgpack" else dumps(obj)
+
+
+def envelope(head: dict, key: str, body: bytes, fmt: str = "json") -> bytes:
+    """``{**head, key: <body>}`` where *body* is already encoded in *fmt*.
+
+    Splices bytes instead of re-encoding, so a payload shared by several
+    messages is only serialized once.
+    """
+    if fmt == "msgpack":
+        # a trailing None value packs to the single byte 0xc0; swap in the body
+        return packb({**head, key: None})[:-1] + body
+    return dumps(head)[:-1] + b',"' + key.encode() + b'":' + body + b"}"
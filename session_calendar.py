@@ -0,0 +1,265 @@
+"""Precomputed ET session boundaries per calendar date, with the CME holiday schedule.
+
+Every boundary is an epoch-nanosecond int, localized once when its year is
+first needed, so lookups never call ``ET.localize`` and DST is handled at
+build time. ``SessionIndex`` accepts these ints directly.
+"""
+
+from datetime import date, timedelta
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+import pytz
+
+from config import KEY_OPENS, KILL_ZONES, MACRO_TIMES, TIMEZONE
+
+ET = pytz.timezone(TIMEZONE)
+
+# CME equity index futures (ET): Globex trades 18:00 → 17:00 the next day.
+_GLOBEX_OPEN = (18, 0)
+_GLOBEX_CLOSE = (17, 0)
+_HOLIDAY_HALT = (13, 0)       # 12:00 CT halt on exchange holidays
+_EARLY_CLOSE = (13, 15)       # 12:15 CT close on the day after Thanksgiving / Christmas Eve
+
+
+class SessionDay(NamedTuple):
+    """Boundaries for one ET calendar date (epoch ns; windows are ``[start, end)``)."""
+    date: date
+    trading: bool                         # a CME trade date (not a weekend, holiday or closure)
+    early_close: bool
+    close: int                            # Globex close or halt that day
+    globex_open: int                      # 18:00 that evening
+    midnight: int
+    asia: tuple[int, int]                 # 19:00 previous evening → 00:00
+    london: tuple[int, int]               # 02:00 → 05:00
+    ny_open: int                          # 09:30
+    accum_end: int                        # 10:00, end of the Power of 3 accumulation range
+    kill_zones: dict[str, tuple[int, int]]
+    macros: dict[str, tuple[int, int]]
+    opens: dict[tuple[int, int], int]     # KEY_OPENS (hour, minute) on this date
+
+    @property
+    def eve(self) -> date:
+        """Date whose evening holds this day's Asia session."""
+        return self.date - timedelta(days=1)
+
+    def trading_window(self, window: tuple[int, int]) -> tuple[int, int] | None:
+        """*window* cut at this day's close; ``None`` unless this trade date is still open at its start."""
+        if not self.trading or window[0] >= self.close:
+            return None
+        return window[0], min(window[1], self.close)
+
+
+# ── CME holidays ─────────────────────────────────────────────────────
+def _nth_weekday(year: int, month: int, weekday: int, n: int) -> date:
+    d = date(year, month, 1)
+    d += timedelta(days=(weekday - d.weekday()) % 7)
+    return d + timedelta(weeks=n - 1)
+
+
+def _last_weekday(year: int, month: int, weekday: int) -> date:
+    d = date(year + (month == 12), month % 12 + 1, 1) - timedelta(days=1)
+    return d - timedelta(days=(d.weekday() - weekday) % 7)
+
+
+def _easter(year: int) -> date:
+    """Gregorian Easter Sunday (anonymous algorithm)."""
+    a, b, c = year % 19, year // 100, year % 100
+    d, e = divmod(b, 4)
+    g = (8 * b + 13) // 25
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+
+def _observed(d: date) -> date:
+    """Saturday holidays are observed on Friday, Sunday ones on Monday."""
+    if d.weekday() == 5:
+        return d - timedelta(days=1)
+    if d.weekday() == 6:
+        return d + timedelta(days=1)
+    return d
+
+
+def cme_schedule(year: int) -> tuple[set[date], set[date], set[date]]:
+    """``(closed, halted, early)`` dates for *year*.
+
+    *closed*: no Globex trading at all. *halted*: exchange holidays where
+    Globex halts at 13:00 ET and the day is not a trade date. *early*: trade
+    dates that close at 13:15 ET.
+    """
+    closed = {_observed(date(year, 1, 1)), _easter(year) - timedelta(days=2), _observed(date(year, 12, 25))}
+    halted = {
+        _nth_weekday(year, 1, 0, 3),            # Martin Luther King Jr. Day
+        _nth_weekday(year, 2, 0, 3),            # Presidents Day
+        _last_weekday(year, 5, 0),              # Memorial Day
+        _observed(date(year, 7, 4)),
+        _nth_weekday(year, 9, 0, 1),            # Labor Day
+        _nth_weekday(year, 11, 3, 4),           # Thanksgiving
+    }
+    if year >= 2022:
+        halted.add(_observed(date(year, 6, 19)))
+    early = {_nth_weekday(year, 11, 3, 4) + timedelta(days=1)}
+    eve = date(year, 12, 24)
+    if eve.weekday() < 5 and eve not in closed:
+        early.add(eve)
+    return closed, halted, early
+
+
+# ── calendar ─────────────────────────────────────────────────────────
+def _at(days: pd.DatetimeIndex, hm: tuple[int, int]) -> list[int]:
+    """Epoch ns of wall-clock *hm* ET on each of *days*, localized in one pass.
+
+    Nonexistent and ambiguous times resolve like ``ET.localize`` (standard time).
+    """
+    local = days + pd.Timedelta(hours=hm[0], minutes=hm[1])
+    return local.tz_localize(
+        ET, ambiguous=np.zeros(len(local), dtype=bool), nonexistent="shift_forward"
+    ).as_unit("ns").asi8.tolist()
+
+
+def _windows(days: pd.DatetimeIndex, start: tuple[int, int], end: tuple[int, int], shift: int = 0) -> list[tuple[int, int]]:
+    """``[start, end)`` per day; windows ending at or before their start run past midnight.
+
+    *shift* = -1 anchors the window on the previous evening instead.
+    """
+    base = days + pd.Timedelta(days=shift)
+    next_ = base + pd.Timedelta(days=1)
+    return list(zip(_at(base, start), _at(next_ if end <= start else base, end)))
+
+
+def _build_year(year: int) -> dict[date, SessionDay]:
+    closed, halted, early = cme_schedule(year)
+    days = pd.date_range(f"{year}-01-01", f"{year}-12-31", freq="D")
+    prev = days - pd.Timedelta(days=1)
+    dates = [d.date() for d in days]
+
+    closes = {hm: _at(days, hm) for hm in (_GLOBEX_CLOSE, _HOLIDAY_HALT, _EARLY_CLOSE)}
+    globex_open = _at(days, _GLOBEX_OPEN)
+    midnight = _at(days, (0, 0))
+    asia_start = _at(prev, (19, 0))
+    london = list(zip(_at(days, (2, 0)), _at(days, (5, 0))))
+    ny_open = _at(days, (9, 30))
+    accum_end = _at(days, (10, 0))
+    kill_zones = {
+        # a zone crossing midnight is the one that ends on this date
+        kz["name"]: _windows(days, kz["start"], kz["end"], -1 if kz.get("crosses_midnight") else 0)
+        for kz in KILL_ZONES
+    }
+    macros = {m["label"]: _windows(days, m["start"], m["end"]) for m in MACRO_TIMES}
+    opens = {(ko["hour"], ko["minute"]): _at(days, (ko["hour"], ko["minute"])) for ko in KEY_OPENS}
+
+    out = {}
+    for i, d in enumerate(dates):
+        close = _HOLIDAY_HALT if d in halted else _EARLY_CLOSE if d in early else _GLOBEX_CLOSE
+        out[d] = SessionDay(
+            date=d,
+            trading=d.weekday() < 5 and d not in closed and d not in halted,
+            early_close=d in early,
+            close=closes[close][i],
+            globex_open=globex_open[i],
+            midnight=midnight[i],
+            asia=(asia_start[i], midnight[i]),
+            london=london[i],
+            ny_open=ny_open[i],
+            accum_end=accum_end[i],
+            kill_zones={k: v[i] for k, v in kill_zones.items()},
+            macros={k: v[i] for k, v in macros.items()},
+            opens={k: v[i] for k, v in opens.items()},
+        )
+    return out
+
+
+class SessionCalendar:
+    """Session boundaries for every calendar date, built a year at a time.
+
+    ``day(d)`` is a dict lookup; ``day_at``, ``trade_date_at``,
+    ``session_bounds`` and ``session_open`` are binary searches over sorted
+    epoch arrays.
+    """
+
+    def __init__(self):
+        self._days: dict[date, SessionDay] = {}
+        self._years: set[int] = set()
+        self._dates: list[date] = []
+        self._midnights = np.empty(0, dtype=np.int64)
+        self._globex_opens = np.empty(0, dtype=np.int64)
+        self._trade_dates: list[date] = []
+        self._trade_days = np.empty(0, dtype="datetime64[D]")
+        self._closes = np.empty(0, dtype=np.int64)
+        self._span = (0, 0)                 # epoch ns covered by the built years
+
+    def _ensure(self, *years: int) -> None:
+        missing = [y for y in range(min(years) - 1, max(years) + 2) if y not in self._years]
+        if not missing:
+            return
+        for y in missing:
+            self._days.update(_build_year(y))
+            self._years.add(y)
+        self._dates = sorted(self._days)
+        self._midnights = np.array([self._days[d].midnight for d in self._dates], dtype=np.int64)
+        self._globex_opens = np.array([self._days[d].globex_open for d in self._dates], dtype=np.int64)
+        self._trade_dates = [d for d in self._dates if self._days[d].trading]
+        self._trade_days = np.array(self._trade_dates, dtype="datetime64[D]")
+        self._closes = np.array([self._days[d].close for d in self._trade_dates], dtype=np.int64)
+        # one year of margin on each side, so searches never run off either end
+        self._span = (int(self._midnights[366]), int(self._midnights[-366]))
+
+    def day(self, d: date) -> SessionDay:
+        sd = self._days.get(d)
+        if sd is None:
+            self._ensure(d.year)
+            sd = self._days[d]
+        return sd
+
+    def _cover(self, lo: int, hi: int) -> None:
+        """Make sure every epoch-ns time in ``[lo, hi]`` is well inside the built years."""
+        if self._span[0] <= lo and hi < self._span[1]:
+            return
+        self._ensure(*(int(y) for y in pd.to_datetime([lo, hi], utc=True).year))
+
+    def day_at(self, ts: int) -> SessionDay:
+        """The ET calendar date containing epoch-ns *ts*."""
+        self._cover(ts, ts)
+        return self._days[self._dates[int(self._midnights.searchsorted(ts, "right")) - 1]]
+
+    def trade_date_at(self, ts: int) -> date:
+        """The CME trade date that epoch-ns *ts* belongs to (evening bars count toward the next one)."""
+        self._cover(ts, ts)
+        return self._trade_dates[int(self._closes.searchsorted(ts, "right"))]
+
+    def session_bounds(self, ts: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Per epoch-ns timestamp, its trade date's ``[start, end)``: previous close → close."""
+        ts = np.asarray(ts, dtype=np.int64)
+        if not len(ts):
+            return ts.copy(), ts.copy()
+        self._cover(int(ts.min()), int(ts.max()))
+        pos = self._closes.searchsorted(ts, "right")
+        return self._closes[pos - 1], self._closes[pos]
+
+    def session_open(self, ts: np.ndarray) -> np.ndarray:
+        """Per epoch-ns timestamp, the latest 18:00 ET Globex open at or before it."""
+        ts = np.asarray(ts, dtype=np.int64)
+        if not len(ts):
+            return ts.copy()
+        self._cover(int(ts.min()), int(ts.max()))
+        return self._globex_opens[self._globex_opens.searchsorted(ts, "right") - 1]
+
+    def trading_days(self, start: date, end: date) -> list[date]:
+        """Trade dates in ``[start, end]``."""
+        self._ensure(start.year, end.year)
+        i = int(self._trade_days.searchsorted(np.datetime64(start, "D")))
+        j = int(self._trade_days.searchsorted(np.datetime64(end, "D"), "right"))
+        return self._trade_dates[i:j]
+
+    def previous_trading_day(self, d: date) -> date:
+        """The last trade date strictly before *d*."""
+        self._ensure(d.year)
+        return self._trade_dates[int(self._trade_days.searchsorted(np.datetime64(d, "D"))) - 1]
+
+
+CALENDAR = SessionCalendar()
@@ -0,0 +1,51 @@
+"""Time-window lookups on a sorted intraday index via binary search."""
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+
+def to_ns(dt: datetime | int) -> int:
+    """Epoch ns of *dt*; ints (e.g. ``SessionCalendar`` boundaries) pass through."""
+    return dt if isinstance(dt, int) else pd.Timestamp(dt).value
+
+
+class SessionIndex:
+    """Integer positions of time windows in a sorted ``DatetimeIndex`` or epoch-ns array.
+
+    Built once per frame; every lookup is a ``searchsorted`` on the int64
+    epoch array, and slices come back as ``iloc`` views rather than copies
+    selected through full-length boolean masks.
+    """
+
+    def __init__(self, index: pd.DatetimeIndex | np.ndarray):
+        if isinstance(index, np.ndarray):
+            self.ns: np.ndarray = index  # already epoch ns, e.g. ``Bars.ts``
+        elif isinstance(index, pd.DatetimeIndex):
+            self.ns = index.as_unit("ns").asi8
+        else:  # empty frames come with a RangeIndex
+            self.ns = np.empty(0, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.ns)
+
+    def bounds(self, start: datetime | int | None = None, end: datetime | int | None = None) -> tuple[int, int]:
+        """Positions ``[i, j)`` of bars with ``start <= ts < end``."""
+        i = int(self.ns.searchsorted(to_ns(start), "left")) if start is not None else 0
+        j = int(self.ns.searchsorted(to_ns(end), "left")) if end is not None else len(self.ns)
+        return i, max(i, j)
+
+    def window(self, df: pd.DataFrame, start: datetime | int | None = None, end: datetime | int | None = None) -> pd.DataFrame:
+        i, j = self.bounds(start, end)
+        return df.iloc[i:j]
+
+    def first(self, start: datetime | int, end: datetime | int) -> int | None:
+        """Position of the first bar in ``[start, end)``, if any."""
+        i, j = self.bounds(start, end)
+        return i if j > i else None
+
+    def last(self, start: datetime | int, end: datetime | int) -> int | None:
+        """Position of the last bar in ``[start, end)``, if any."""
+        i, j = self.bounds(start, end)
+        return j - 1 if j > i else None
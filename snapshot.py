@@ -0,0 +1,185 @@
+"""Shared, versioned snapshot of the latest computed metrics."""
+
+import asyncio
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Awaitable, Callable
+
+import delta
+from config import SNAPSHOT_CACHE_INTERVAL
+from schema import Metrics
+from serialization import encode, envelope, loads
+from subscriptions import Subscription
+from telemetry import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+
+class Snapshot:
+    """One published version of the metrics and its encoded messages.
+
+    Three messages can be sent for a snapshot: ``"payload"`` (the metrics
+    alone, full protocol), ``"full"`` (``{"type": "snapshot", ...}``, delta
+    protocol) and ``"patch"`` (changes from ``version - 1``; ``None`` for
+    the first snapshot). Each is encoded once per format on first use —
+    JSON at publish time, MessagePack only if a client asks for it — and
+    the full message embeds the encoded payload rather than re-encoding it.
+    JSON messages are ``str`` (text frames), MessagePack ones ``bytes``.
+
+    ``view`` gives the snapshot as seen by one subscription, shared by every
+    client that has it.
+    """
+
+    __slots__ = ("version", "metrics", "ops", "_encoded", "_text", "_views")
+
+    def __init__(self, version: int, metrics: Metrics, ops: list | None):
+        self.version = version
+        self.metrics = metrics
+        self.ops = ops
+        self._encoded: dict[tuple[str, str], bytes | None] = {}
+        self._text: dict[str, str | None] = {}
+        self._views: dict[Subscription, Snapshot] = {}
+
+    def view(self, sub: Subscription) -> "Snapshot":
+        """The slice of this snapshot *sub* receives (``self`` if nothing is left out)."""
+        view = self._views.get(sub)
+        if view is None:
+            ops = sub.slice_ops(self.ops) if self.ops is not None else None
+            if sub.covers(self.metrics) and (ops is None or len(ops) == len(self.ops)):
+                view = self
+            else:
+                view = Snapshot(self.version, sub.slice(self.metrics), ops)
+            self._views[sub] = view
+        return view
+
+    def encoded(self, kind: str, fmt: str = "json") -> bytes | None:
+        """*kind* encoded in *fmt*, built on first use."""
+        key = (kind, fmt)
+        if key not in self._encoded:
+            self._encoded[key] = self._encode(kind, fmt)
+        return self._encoded[key]
+
+    def message(self, kind: str, fmt: str = "json") -> str | bytes | None:
+        """*kind* as sent: ``str`` for a JSON text frame, ``bytes`` for MessagePack."""
+        if fmt != "json":
+            return self.encoded(kind, fmt)
+        if kind not in self._text:
+            raw = self.encoded(kind)
+            self._text[kind] = raw.decode() if raw is not None else None
+        return self._text[kind]
+
+    def _encode(self, kind: str, fmt: str) -> bytes | None:
+        suffix = "" if fmt == "json" else f"_{fmt}"
+        if kind == "payload":
+            with REGISTRY.time("ict_stage_seconds", stage="serialize" + suffix):
+                return encode(self.metrics, fmt)
+        if kind == "full":
+            return envelope({"type": "snapshot", "version": self.version}, "data", self.encoded("payload", fmt), fmt)
+        if self.ops is None:
+            return None
+        with REGISTRY.time("ict_stage_seconds", stage="serialize_patch" + suffix):
+            return encode({"type": "patch", "version": self.version, "base": self.version - 1, "ops": self.ops}, fmt)
+
+    @property
+    def payload(self) -> str:
+        return self.message("payload")
+
+    @property
+    def full(self) -> str:
+        return self.message("full")
+
+    @property
+    def patch(self) -> str | None:
+        return self.message("patch")
+
+
+class SnapshotStore:
+    """Holds the most recent snapshot and coalesces recomputation.
+
+    ``refresh`` runs *compute* at most once at a time: callers arriving while
+    a computation is in flight await that same task instead of starting
+    another fetch + engine run.
+
+    With a *cache* path the latest payload is written there every
+    *cache_interval* seconds, and a store created later starts from it —
+    marked ``stale`` — so clients get something to show before the first
+    compute has finished.
+    """
+
+    def __init__(
+        self,
+        compute: Callable[[], Awaitable[Metrics]],
+        cache: str | Path | None = None,
+        cache_interval: float = SNAPSHOT_CACHE_INTERVAL,
+    ):
+        self._compute = compute
+        self._inflight: asyncio.Task | None = None
+        self._cache = Path(cache).expanduser() if cache else None
+        self._cache_interval = cache_interval
+        self._saved_at = time.monotonic()
+        self.latest: Snapshot | None = self._load() if self._cache is not None else None
+
+    # ── on-disk cache ────────────────────────────────────────────────
+    def _load(self) -> Snapshot | None:
+        try:
+            metrics = loads(self._cache.read_bytes())
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring snapshot cache %s: %s", self._cache, e)
+            return None
+        if not isinstance(metrics, dict):
+            return None
+        metrics["stale"] = True
+        return Snapshot(1, metrics, None)
+
+    def save(self) -> None:
+        """Write the latest live snapshot to the cache file."""
+        snap = self.latest
+        self._saved_at = time.monotonic()
+        if self._cache is None or snap is None or snap.metrics.get("stale") or not snap.metrics["tickers"]:
+            return
+        tmp = self._cache.with_suffix(".tmp")
+        try:
+            self._cache.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_bytes(snap.encoded("payload"))
+            os.replace(tmp, self._cache)
+        except OSError as e:
+            logger.warning("Could not save snapshot cache %s: %s", self._cache, e)
+
+    # ── publishing ───────────────────────────────────────────────────
+
+    def publish(self, metrics: Metrics) -> Snapshot:
+        prev = self.latest
+        ops = None
+        if prev is not None:
+            with REGISTRY.time("ict_stage_seconds", stage="diff"):
+                ops = delta.diff(prev.metrics, metrics)
+        snap = Snapshot(prev.version + 1 if prev else 1, metrics, ops)
+        # JSON clients are the common case: encode for them up front
+        for kind in ("payload", "full", "patch"):
+            snap.message(kind)
+        self.latest = snap
+        if self._cache is not None and time.monotonic() - self._saved_at >= self._cache_interval:
+            self.save()
+        return snap
+
+    async def refresh(self) -> Snapshot:
+        if self._inflight is None:
+            self._inflight = asyncio.create_task(self._run())
+        # shield: one impatient waiter being cancelled must not cancel the
+        # computation for everyone else
+        return await asyncio.shield(self._inflight)
+
+    async def get(self) -> Snapshot:
+        """The cached snapshot, computing one first if none exists yet."""
+        return self.latest or await self.refresh()
+
+    async def _run(self) -> Snapshot:
+        try:
+            with REGISTRY.time("ict_stage_seconds", stage="refresh"):
+                return self.publish(await self._compute())
+        finally:
+            self._inflight = None
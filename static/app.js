@@ -3,13 +3,15 @@
 const RECONNECT_MS = 5000;
 let ws = null;
 let reconnTimer = null;
+let state = null;     // last full metrics document
+let version = 0;      // version of `state`
 
 // ═══════════════════════════════════════════════════════════════════
 //  WebSocket
 // ═══════════════════════════════════════════════════════════════════
 function connect() {
   const proto = location.protocol === "https:" ? "wss:" : "ws:";
-  ws = new WebSocket(`${proto}//${location.host}/ws`);
+  ws = new WebSocket(`${proto}//${location.host}/ws?mode=delta`);
 
   ws.onopen = () => {
     setConn("LIVE", "conn-live");
@@ -17,7 +19,7 @@ function connect() {
   };
 
   ws.onmessage = (e) => {
-    try { render(JSON.parse(e.data)); }
+    try { onMessage(JSON.parse(e.data)); }
     catch (err) { console.error("parse error", err); }
   };
 
@@ -29,6 +31,39 @@ function connect() {
   ws.onerror = () => ws.close();
 }
 
+// Delta protocol: a snapshot, then patches of [path, value] / [path] ops.
+function onMessage(msg) {
+  if (msg.type === "snapshot") {
+    state = msg.data;
+  } else if (msg.type === "patch") {
+    if (!state || msg.base !== version) {
+      ws.send(JSON.stringify({ type: "resync" }));
+      return;
+    }
+    state = applyPatch(state, msg.ops);
+  } else {
+    return;
+  }
+  version = msg.version;
+  render(state);
+  // until the first live compute the server sends the snapshot saved last run
+  if (state.stale) setConn("CACHED", "conn-cached");
+  else setConn("LIVE", "conn-live");
+}
+
+function applyPatch(doc, ops) {
+  for (const op of ops) {
+    const path = op[0];
+    if (!path.length) { doc = op[1]; continue; }
+    let parent = doc;
+    for (let i = 0; i < path.length - 1; i++) parent = parent[path[i]];
+    const key = path[path.length - 1];
+    if (op.length === 1) delete parent[key];
+    else parent[key] = op[1];
+  }
+  return doc;
+}
+
 function setConn(text, cls) {
   const el = document.getElementById("connection-status");
   el.textContent = text;
@@ -86,6 +121,7 @@ function render(d) {
   renderLiquidity(nq, es);
   renderKeyOpens(nq, es);
   renderOTE(nq, es);
+  renderZones(nq, es);
   renderPo3(nq, es);
 }
 
@@ -259,7 +295,51 @@ function renderOTE(nq, es) {
         <div class="text-sm font-medium tabular-nums ${fd.near ? "text-amber-400" : ""}">${fmt(fd.price)}</div>
       </div>`;
     }
-    h += `</div></div>`;
+    h += `</div>`;
+
+    const htf = Object.entries(t.ote_htf || {});
+    if (htf.length) {
+      h += `<div class="flex flex-wrap gap-4 mt-2 text-[11px]">`;
+      for (const [tf, x] of htf) {
+        if (!x?.available) {
+          h += `<span class="text-gray-600">${tf} —</span>`;
+          continue;
+        }
+        const cls = x.direction === "bullish" ? "text-emerald-400" : "text-red-400";
+        h += `<span class="text-gray-500">${tf} <span class="${cls} font-semibold">${x.direction === "bullish" ? "↑" : "↓"}</span>
+          ${x.in_ote ? badgeHtml("OTE", "badge-in-ote") : ""}</span>`;
+      }
+      h += `</div>`;
+    }
+    h += `</div>`;
+  }
+  el.innerHTML = h || noData();
+}
+
+// ═══════════════════════════════════════════════════════════════════
+//  FVGs / Order Blocks
+// ═══════════════════════════════════════════════════════════════════
+function renderZones(nq, es) {
+  const el = document.getElementById("zones");
+  let h = "";
+  for (const t of [nq, es]) {
+    if (!t) continue;
+    const zones = t.zones?.zones || [];
+    h += `<div class="mb-4"><div class="text-sm font-bold mb-1">${t.label}</div>`;
+    if (!zones.length) {
+      h += `<div class="text-gray-600 text-xs">No active zones</div></div>`;
+      continue;
+    }
+    for (const z of zones) {
+      const cls = z.direction === "bullish" ? "text-emerald-400" : "text-red-400";
+      h += `<div class="grid-row" style="grid-template-columns:0.6fr 0.7fr 1.6fr 1fr">
+        <div class="text-gray-500">${z.timeframe}</div>
+        <div class="${cls} font-semibold">${z.direction === "bullish" ? "+" : "−"}${z.kind.toUpperCase()}</div>
+        <div class="text-right tabular-nums ${z.near ? "text-amber-400" : ""}">${fmt(z.bottom)} – ${fmt(z.top)}</div>
+        <div class="text-right">${z.inside ? badgeHtml("INSIDE", "badge-in-ote") : z.near ? badgeHtml("NEAR", "badge-near") : ""}</div>
+      </div>`;
+    }
+    h += `</div>`;
   }
   el.innerHTML = h || noData();
 }
@@ -0,0 +1,198 @@
+"""Push-driven feed: ticks in, 1-min bars and recompute triggers out."""
+
+import asyncio
+import logging
+import random
+import time
+from collections.abc import Collection
+from datetime import datetime
+from typing import AsyncIterator, NamedTuple
+
+import pandas as pd
+
+from config import INTRADAY_WINDOW_DAYS, STREAM_THROTTLE, TICKERS
+from bar_buffer import EMPTY, BarBuffer, Bars, as_bars
+from data_feed import ET, DataFeed
+
+logger = logging.getLogger(__name__)
+
+_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
+
+class Tick(NamedTuple):
+    ticker: str
+    ts: float       # epoch seconds
+    price: float
+    size: float = 0.0
+
+
+# ── bar aggregation ──────────────────────────────────────────────────
+class BarAggregator:
+    """Folds ticks into per-ticker 1-min OHLCV bars held in ``BarBuffer`` rings.
+
+    The newest bar in each ring is the forming one and is revised in place;
+    ``bars`` returns a zero-copy view shaped like ``DataFeed.fetch_intraday``
+    output.
+    """
+
+    def __init__(self, max_bars: int = INTRADAY_WINDOW_DAYS * 1440):
+        self.max_bars = max_bars
+        self.late_ticks = 0
+        self._buffers: dict[str, BarBuffer] = {}
+
+    def seed(self, ticker: str, bars: Bars | pd.DataFrame) -> None:
+        """Start *ticker* from historical bars (e.g. the polled 5-day window).
+
+        The newest seeded bar may still be forming; ticks keep updating it.
+        """
+        buf = self._buffers[ticker] = BarBuffer(self.max_bars)
+        buf.extend(as_bars(bars))
+
+    def add(self, tick: Tick) -> bool:
+        """Apply *tick*; returns True when it closed the previous bar."""
+        minute = int(tick.ts // 60) * 60 * 10**9
+        buf = self._buffers.get(tick.ticker)
+        if buf is None:
+            buf = self._buffers[tick.ticker] = BarBuffer(self.max_bars)
+        forming = buf.last_ts
+        if forming == minute:
+            _, o, h, l, _, v = buf.last()
+            buf.append(minute, o, max(h, tick.price), min(l, tick.price), tick.price, v + tick.size)
+            return False
+        if forming is not None and minute < forming:
+            self.late_ticks += 1
+            return False
+        buf.append(minute, tick.price, tick.price, tick.price, tick.price, tick.size)
+        return forming is not None
+
+    def bars(self, ticker: str) -> Bars:
+        buf = self._buffers.get(ticker)
+        return buf.view() if buf is not None else EMPTY
+
+
+# ── tick sources ─────────────────────────────────────────────────────
+class TickSource:
+    """Anything that yields ``Tick``s — a broker API, a replay, a simulator."""
+
+    async def ticks(self) -> AsyncIterator[Tick]:
+        raise NotImplementedError
+        yield  # pragma: no cover
+
+
+class SimulatedTickSource(TickSource):
+    """Random-walk ticks stamped with the wall clock, *rate* per second per ticker."""
+
+    def __init__(self, prices: dict[str, float], rate: float = 10.0, seed: int | None = None):
+        self.prices = dict(prices)
+        self.rate = rate
+        self._rng = random.Random(seed)
+
+    async def ticks(self) -> AsyncIterator[Tick]:
+        interval = 1.0 / self.rate if self.rate > 0 else 0.0
+        while True:
+            now = time.time()
+            for ticker, price in self.prices.items():
+                price += self._rng.gauss(0.0, price * 2e-5)
+                self.prices[ticker] = price
+                yield Tick(ticker, now, round(price, 2), self._rng.randint(1, 5))
+            await asyncio.sleep(interval)
+
+
+class ReplayTickSource(TickSource):
+    """Replays 1-min bars as ticks (open → high/low → close within each bar).
+
+    *speed* is the clock multiplier; ``None`` replays as fast as possible.
+    """
+
+    def __init__(self, bars: dict[str, pd.DataFrame], ticks_per_bar: int = 4, speed: float | None = None):
+        self.bars = bars
+        self.ticks_per_bar = max(4, ticks_per_bar)
+        self.speed = speed
+
+    async def ticks(self) -> AsyncIterator[Tick]:
+        rows = []
+        for ticker, df in self.bars.items():
+            ts = df.index.as_unit("s").asi8
+            for i, (o, h, l, c, v) in enumerate(df[_COLUMNS].itertuples(index=False)):
+                rows.append((int(ts[i]), ticker, o, h, l, c, v))
+        rows.sort(key=lambda r: r[0])
+
+        n = self.ticks_per_bar
+        started = time.monotonic()
+        t0 = rows[0][0] if rows else 0
+        for ts, ticker, o, h, l, c, v in rows:
+            if self.speed:
+                delay = (ts - t0) / self.speed - (time.monotonic() - started)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            path = [o, h, l] if c >= o else [o, l, h]
+            path += [c] * (n - 3)
+            for k, price in enumerate(path):
+                yield Tick(ticker, ts + 59.0 * k / (n - 1), float(price), v / n)
+            if not self.speed:
+                await asyncio.sleep(0)
+
+
+# ── feed ─────────────────────────────────────────────────────────────
+class StreamingFeed:
+    """Async feed driven by a ``TickSource``.
+
+    ``run`` consumes ticks into a ``BarAggregator``; ``updates`` yields
+    whenever the engine should recompute — immediately on a bar close,
+    otherwise at most once per *throttle* seconds while ticks keep coming.
+    Daily/weekly candles still come from the polling ``DataFeed``.
+    """
+
+    def __init__(self, source: TickSource, poll_feed: DataFeed | None = None, throttle: float = STREAM_THROTTLE):
+        self.source = source
+        self.poll_feed = poll_feed or DataFeed()
+        self.throttle = throttle
+        self.aggregator = BarAggregator()
+        self.ticks = 0
+        self.last_tick_ts: float | None = None
+        self._changed = asyncio.Event()
+        self._bar_closed = asyncio.Event()
+
+    def seed(self, intraday: dict[str, Bars | pd.DataFrame]) -> None:
+        for ticker, bars in intraday.items():
+            self.aggregator.seed(ticker, bars)
+
+    async def run(self) -> None:
+        async for tick in self.source.ticks():
+            self.ticks += 1
+            self.last_tick_ts = tick.ts
+            if self.aggregator.add(tick):
+                self._bar_closed.set()
+            self._changed.set()
+
+    async def updates(self) -> AsyncIterator[None]:
+        last = 0.0
+        while True:
+            await self._changed.wait()
+            delay = self.throttle - (time.monotonic() - last)
+            if delay > 0 and not self._bar_closed.is_set():
+                try:
+                    await asyncio.wait_for(self._bar_closed.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+            self._changed.clear()
+            self._bar_closed.clear()
+            last = time.monotonic()
+            yield
+
+    def now(self) -> datetime:
+        """Feed clock: the latest tick time (wall clock before any tick)."""
+        if self.last_tick_ts is None:
+            return datetime.now(ET)
+        return datetime.fromtimestamp(self.last_tick_ts, ET)
+
+    async def fetch_all(self, tickers: Collection[str] | None = None) -> dict:
+        intraday = {}
+        for ticker in TICKERS:
+            if tickers is not None and ticker not in tickers:
+                continue
+            bars = self.aggregator.bars(ticker)
+            if not bars.empty:
+                intraday[ticker] = bars
+        daily, weekly = await asyncio.to_thread(lambda: (self.poll_feed.fetch_daily(), self.poll_feed.fetch_weekly()))
+        return {"intraday": intraday, "daily": daily, "weekly": weekly}
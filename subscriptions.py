@@ -0,0 +1,115 @@
+"""Per-client subscriptions: which symbols and sections a dashboard watches.
+
+A client starts subscribed to everything (or to ``?symbols=…&sections=…``)
+and adjusts it with control messages on ``/ws``::
+
+    {"type": "subscribe",   "symbols": ["CL=F"], "sections": ["levels"]}
+    {"type": "unsubscribe", "symbols": ["ES=F"], "sections": ["zones", "ote"]}
+
+The engine computes only the union of every connected client's
+subscription. Clients with the same subscription share one slice of each
+snapshot (``Snapshot.view``), encoded once; a slice's patch is the
+snapshot's patch with the ops outside the subscription filtered out, so
+nothing is diffed twice. The clock, kill zones and macros go to everyone.
+"""
+
+import logging
+from typing import Iterable, NamedTuple
+
+from config import TICKERS
+from schema import SECTIONS, Metrics, TickerMetrics
+
+logger = logging.getLogger(__name__)
+
+_HEADER = ("label", "price", "daily_change")
+
+
+def _known(kind: str, names: Iterable | str, allowed: Iterable[str]) -> frozenset[str]:
+    if isinstance(names, str):
+        names = [names]
+    names = {n for n in names if isinstance(n, str) and n}
+    unknown = names.difference(allowed)
+    if unknown:
+        logger.warning("Ignoring unknown %s: %s", kind, ", ".join(sorted(unknown)))
+    return frozenset(names.intersection(allowed))
+
+
+class Subscription(NamedTuple):
+    symbols: frozenset[str]
+    sections: frozenset[str]
+
+    @classmethod
+    def everything(cls) -> "Subscription":
+        return cls(frozenset(TICKERS), frozenset(SECTIONS))
+
+    @classmethod
+    def parse(cls, symbols: Iterable | None = None, sections: Iterable | None = None) -> "Subscription":
+        """Validated subscription; ``None`` for either part means all of it."""
+        return cls(
+            frozenset(TICKERS) if symbols is None else _known("symbols", symbols, TICKERS),
+            frozenset(SECTIONS) if sections is None else _known("sections", sections, SECTIONS),
+        )
+
+    @staticmethod
+    def union(subs: Iterable["Subscription"]) -> "Subscription":
+        symbols, sections = set(), set()
+        for sub in subs:
+            symbols |= sub.symbols
+            sections |= sub.sections
+        return Subscription(frozenset(symbols), frozenset(sections))
+
+    def apply(self, request: dict) -> "Subscription":
+        """This subscription after a ``subscribe`` / ``unsubscribe`` control message."""
+        change = Subscription.parse(request.get("symbols") or (), request.get("sections") or ())
+        if request.get("type") == "subscribe":
+            return Subscription(self.symbols | change.symbols, self.sections | change.sections)
+        return Subscription(self.symbols - change.symbols, self.sections - change.sections)
+
+    # ── slicing ──────────────────────────────────────────────────────
+    @property
+    def keys(self) -> frozenset[str]:
+        """TickerMetrics keys a subscriber receives."""
+        return frozenset(_HEADER).union(*(SECTIONS[s] for s in self.sections))
+
+    def covers(self, metrics: Metrics) -> bool:
+        """True if *metrics* holds nothing this subscription leaves out."""
+        keys = self.keys
+        return all(t in self.symbols and m.keys() <= keys for t, m in metrics["tickers"].items())
+
+    def provided_by(self, metrics: Metrics) -> bool:
+        """True if *metrics* has everything this subscription asks for."""
+        tickers = metrics["tickers"]
+        keys = self.keys
+        return all(t in tickers and keys <= tickers[t].keys() for t in self.symbols)
+
+    def slice(self, metrics: Metrics) -> Metrics:
+        out = dict(metrics)
+        out["tickers"] = self._tickers(metrics["tickers"])
+        return out
+
+    def _tickers(self, tickers: dict[str, TickerMetrics]) -> dict[str, TickerMetrics]:
+        return {t: self._ticker(m) for t, m in tickers.items() if t in self.symbols}
+
+    def _ticker(self, metrics: TickerMetrics) -> TickerMetrics:
+        keys = self.keys
+        return {k: v for k, v in metrics.items() if k in keys}
+
+    def slice_ops(self, ops: list[list]) -> list[list]:
+        """The ops of a ``delta.diff`` that touch this subscription, sliced to it."""
+        keys = self.keys
+        out = []
+        for op in ops:
+            path = op[0]
+            if not path:
+                out.append([path, self.slice(op[1])])
+            elif path[0] != "tickers":
+                out.append(op)
+            elif len(path) == 1:
+                out.append([path, self._tickers(op[1])] if len(op) > 1 else op)
+            elif path[1] not in self.symbols:
+                continue
+            elif len(path) == 2:
+                out.append([path, self._ticker(op[1])] if len(op) > 1 else op)
+            elif path[2] in keys:
+                out.append(op)
+        return out
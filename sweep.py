@@ -0,0 +1,200 @@
+"""Parallel parameter sweep over the offline replay.
+
+Work is sharded by (parameter set, ticker, block of trading days) and run on
+a process pool. Bars are written once to ``.npy`` files that every worker
+memory-maps, so a task carries only a path and a time range instead of a
+pickled DataFrame. Each shard replays a short warm-up before its first day
+so session ranges, prior-day levels and swings are already formed, and returns a row of
+counts; the driver sums them into one summary table.
+
+    python -m sweep --synthetic 90 --lookback 3,5,8 --proximity 0.0005,0.001 --workers 8
+"""
+
+import argparse
+import itertools
+import logging
+import os
+import tempfile
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from config import KILL_ZONES, OTE_FIBS, PROXIMITY_PCT, SWING_LOOKBACK, TICKERS
+from data_feed import ET
+from ict_stream import StreamingICTEngine
+from replay import Params, parse_bars_spec, read_bars, replay_ticker, write
+from session_calendar import CALENDAR
+
+logger = logging.getLogger(__name__)
+
+_OHLC = ["Open", "High", "Low", "Close"]
+_COUNTS = ["bars", "sweeps", "ote_entries", "ote_entries_kz", "ote_near", "ote_flips", "po3_distribution"]
+
+
+# ── shared bars ──────────────────────────────────────────────────────
+def share_bars(bars: dict[str, pd.DataFrame], root: str | os.PathLike) -> dict[str, str]:
+    """Write each ticker's bars as ``.ts.npy`` / ``.ohlc.npy`` files under *root*.
+
+    Returns the file stem per ticker, which is all a task needs to carry.
+    """
+    paths = {}
+    for i, (ticker, df) in enumerate(bars.items()):
+        df = df[_OHLC].dropna().sort_index()
+        base = Path(root) / f"bars{i}"
+        np.save(f"{base}.ts.npy", df.index.as_unit("ns").asi8)
+        np.save(f"{base}.ohlc.npy", df.to_numpy(dtype=np.float64))
+        paths[ticker] = str(base)
+    return paths
+
+
+_mapped: dict[str, tuple[np.ndarray, np.ndarray]] = {}   # per worker process
+
+
+def _load(base: str) -> tuple[np.ndarray, np.ndarray]:
+    if base not in _mapped:
+        _mapped[base] = (np.load(f"{base}.ts.npy", mmap_mode="r"), np.load(f"{base}.ohlc.npy", mmap_mode="r"))
+    return _mapped[base]
+
+
+def _frame(base: str, start_ns: int, end_ns: int) -> pd.DataFrame:
+    ts, ohlc = _load(base)
+    i, j = int(ts.searchsorted(start_ns)), int(ts.searchsorted(end_ns))
+    idx = pd.to_datetime(np.asarray(ts[i:j]), utc=True).tz_convert(ET)
+    return pd.DataFrame(np.asarray(ohlc[i:j]), index=idx, columns=_OHLC)
+
+
+def trading_days(base: str) -> tuple[np.ndarray, int]:
+    """Start (previous session's close, epoch ns) of every CME session in the file, and the last close."""
+    ts, _ = _load(base)
+    starts, ends = CALENDAR.session_bounds(np.asarray(ts))
+    return np.unique(starts), int(ends[-1]) if len(ends) else 0
+
+
+# ── shards ───────────────────────────────────────────────────────────
+def run_shard(param_id: int, params: Params, ticker: str, base: str,
+              warmup_ns: int, start_ns: int, end_ns: int) -> dict:
+    """Replay ``[warmup_ns, end_ns)`` and count the transitions from *start_ns* on."""
+    bars = _frame(base, warmup_ns, end_ns)
+    since = pd.Timestamp(start_ns, tz="UTC")
+    out = replay_ticker(ticker, bars, StreamingICTEngine(), params, since=since)
+    sig, val = out["signal"], out["value"]
+    entries = (sig == "ote:in_ote") & (val == "True")
+    return {
+        "param_id": param_id,
+        "ticker": ticker,
+        "bars": int((bars.index.as_unit("ns").asi8 >= start_ns).sum()),
+        "sweeps": int((sig.str.startswith("sweep:") & (val == "SWEPT")).sum()),
+        "ote_entries": int(entries.sum()),
+        "ote_entries_kz": int((entries & (out["kill_zone"] != "")).sum()),
+        "ote_near": int(((sig == "ote:near") & (val == "True")).sum()),
+        "ote_flips": int(((sig == "ote:direction") & out["previous"].notna()).sum()),
+        "po3_distribution": int(((sig == "po3:phase") & (val == "Distribution")).sum()),
+    }
+
+
+def param_grid(lookbacks, fibs, proximities, kz_widen) -> list[Params]:
+    """Cartesian product of the given values; *kz_widen* pads every kill zone by N minutes each side."""
+    grid = []
+    for n, f, p, w in itertools.product(lookbacks, fibs, proximities, kz_widen):
+        grid.append(Params(n, tuple(f), p, tuple(_widen(kz, w) for kz in KILL_ZONES)))
+    return grid
+
+
+def _widen(kz: dict, minutes: int) -> dict:
+    s = (kz["start"][0] * 60 + kz["start"][1] - minutes) % 1440
+    e = (kz["end"][0] * 60 + kz["end"][1] + minutes) % 1440
+    return {**kz, "start": divmod(s, 60), "end": divmod(e, 60), "crosses_midnight": e <= s}
+
+
+def _describe(params: Params) -> dict:
+    ny_am = next((kz for kz in params.kill_zones if kz["name"] == "NY AM"), None)
+    return {
+        "swing_lookback": params.swing_lookback,
+        "ote_fibs": "/".join(str(f) for f in params.ote_fibs),
+        "proximity_pct": params.proximity_pct,
+        "ny_am": "%02d:%02d-%02d:%02d" % (*ny_am["start"], *ny_am["end"]) if ny_am else "",
+    }
+
+
+def sweep(
+    bars: dict[str, pd.DataFrame],
+    grid: list[Params],
+    days_per_shard: int = 20,
+    warmup_days: int = 3,
+    workers: int | None = None,
+) -> pd.DataFrame:
+    """Run every parameter set over every ticker and return one summary row per pair."""
+    with tempfile.TemporaryDirectory(prefix="ict_sweep_") as root:
+        paths = share_bars(bars, root)
+        tasks = []
+        for ticker, base in paths.items():
+            days, last_close = trading_days(base)
+            if not len(days):
+                continue
+            firsts = range(0, len(days), days_per_shard)
+            ends = [*(days[i] for i in firsts[1:]), last_close]
+            for pid, params in enumerate(grid):
+                for i, end in zip(firsts, ends):
+                    warmup = days[max(0, i - warmup_days)]
+                    tasks.append((pid, params, ticker, base, int(warmup), int(days[i]), int(end)))
+
+        totals: dict[tuple[int, str], dict] = defaultdict(lambda: dict.fromkeys(_COUNTS, 0))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(run_shard, *t) for t in tasks]
+            for fut in as_completed(futures):
+                row = fut.result()
+                acc = totals[(row["param_id"], row["ticker"])]
+                for k in _COUNTS:
+                    acc[k] += row[k]
+
+    rows = [
+        {"param_id": pid, "ticker": ticker, **_describe(grid[pid]), **counts}
+        for (pid, ticker), counts in sorted(totals.items())
+    ]
+    return pd.DataFrame(rows)
+
+
+def _floats(s: str) -> list[float]:
+    return [float(x) for x in s.split(",")]
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--synthetic", type=int, default=60, metavar="DAYS", help="days of synthetic bars per ticker")
+    ap.add_argument("--bars", action="append", default=[], metavar="TICKER=PATH",
+                    help="1-min bars from a .parquet or .csv file instead (repeatable)")
+    ap.add_argument("--lookback", default=str(SWING_LOOKBACK), help="comma-separated SWING_LOOKBACK values")
+    ap.add_argument("--fibs", action="append", metavar="A:B:C",
+                    help="an OTE_FIBS set, e.g. 0.618:0.705:0.786 (repeatable)")
+    ap.add_argument("--proximity", default=str(PROXIMITY_PCT), help="comma-separated PROXIMITY_PCT values")
+    ap.add_argument("--kz-widen", default="0", help="comma-separated minutes to pad each kill zone by")
+    ap.add_argument("--days-per-shard", type=int, default=20)
+    ap.add_argument("--workers", type=int, default=None, help="process count (default: all cores)")
+    ap.add_argument("--out", default="sweep.parquet")
+    args = ap.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s  %(message)s")
+
+    if args.bars:
+        bars = {t: read_bars(p) for t, p in map(parse_bars_spec, args.bars)}
+    else:
+        from benchmarks.synthetic import intraday_bars
+        bars = {t: intraday_bars(args.synthetic, seed=i) for i, t in enumerate(TICKERS)}
+
+    fibs = [[float(x) for x in f.split(":")] for f in args.fibs] if args.fibs else [OTE_FIBS]
+    grid = param_grid([int(x) for x in args.lookback.split(",")], fibs,
+                      _floats(args.proximity), [int(x) for x in args.kz_widen.split(",")])
+
+    t0 = time.perf_counter()
+    summary = sweep(bars, grid, args.days_per_shard, workers=args.workers)
+    elapsed = time.perf_counter() - t0
+    path = write(summary, args.out)
+    logger.info("%d parameter sets × %d tickers in %.1fs → %s", len(grid), len(bars), elapsed, path)
+    print(summary.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""Per-stage latency histograms, Prometheus text export and a sampling profiler.
+
+Every stage of the fetch → compute → broadcast pipeline records into a
+``Histogram`` that keeps the last ``METRICS_WINDOW`` samples, so p50/p95/p99
+reflect recent behaviour while ``_count``/``_sum`` stay cumulative. ``REGISTRY``
+renders them all as Prometheus summaries for ``/metrics``.
+"""
+
+import functools
+import logging
+import sys
+import threading
+import time
+from collections import Counter, deque
+from pathlib import Path
+from typing import Callable
+
+from config import METRICS_WINDOW, PROFILE_INTERVAL
+
+logger = logging.getLogger(__name__)
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+# ── histograms ───────────────────────────────────────────────────────
+class Histogram:
+    """Rolling window of durations (seconds) plus cumulative count and sum."""
+
+    def __init__(self, window: int = METRICS_WINDOW):
+        self._samples: deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+            self.count += 1
+            self.sum += seconds
+
+    def quantiles(self, qs=QUANTILES) -> dict[float, float]:
+        import numpy as np    # deferred: the server starts before anything needs numpy
+
+        with self._lock:
+            samples = np.fromiter(self._samples, dtype=np.float64, count=len(self._samples))
+        if not len(samples):
+            return {q: float("nan") for q in qs}
+        return dict(zip(qs, np.quantile(samples, qs).tolist()))
+
+    def time(self) -> "_Timer":
+        return _Timer(self)
+
+
+class _Timer:
+    __slots__ = ("_hist", "_t0")
+
+    def __init__(self, hist: Histogram):
+        self._hist = hist
+
+    def __enter__(self) -> "_Timer":
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._hist.observe(time.perf_counter() - self._t0)
+
+
+def _num(v: float) -> str:
+    return "NaN" if v != v else f"{v:.6g}"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels: dict) -> str:
+    return ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items())
+
+
+class Registry:
+    """Named families of labelled histograms and gauges."""
+
+    def __init__(self):
+        self._help: dict[str, str] = {}
+        self._hists: dict[str, dict[tuple, Histogram]] = {}
+        self._gauges: dict[str, dict[tuple, Callable[[], float]]] = {}
+        self._lock = threading.Lock()
+
+    def describe(self, name: str, help: str) -> None:
+        self._help[name] = help
+
+    def histogram(self, name: str, **labels) -> Histogram:
+        """The histogram for *name* and *labels*, created on first use."""
+        key = tuple(labels.items())
+        family = self._hists.get(name)
+        hist = family.get(key) if family is not None else None
+        if hist is None:
+            with self._lock:
+                hist = self._hists.setdefault(name, {}).setdefault(key, Histogram())
+        return hist
+
+    def observe(self, name: str, seconds: float, **labels) -> None:
+        self.histogram(name, **labels).observe(seconds)
+
+    def time(self, name: str, **labels) -> _Timer:
+        """``with REGISTRY.time("ict_stage_seconds", stage="compute"): ...``"""
+        return self.histogram(name, **labels).time()
+
+    def gauge(self, name: str, read: Callable[[], float], help: str = "", **labels) -> None:
+        """Register a callable polled at export time (one per set of *labels*)."""
+        self._gauges.setdefault(name, {})[tuple(labels.items())] = read
+        if help:
+            self._help[name] = help
+
+    def render(self) -> str:
+        """All families in the Prometheus text exposition format."""
+        lines = []
+        for name, family in self._hists.items():
+            if name in self._help:
+                lines.append(f"# HELP {name} {self._help[name]}")
+            lines.append(f"# TYPE {name} summary")
+            for key, hist in list(family.items()):
+                labels = dict(key)
+                for q, v in hist.quantiles().items():
+                    lines.append(f"{name}{{{_labels({**labels, 'quantile': q})}}} {_num(v)}")
+                base = f"{{{_labels(labels)}}}" if labels else ""
+                lines.append(f"{name}_sum{base} {_num(hist.sum)}")
+                lines.append(f"{name}_count{base} {hist.count}")
+        for name, family in self._gauges.items():
+            if name in self._help:
+                lines.append(f"# HELP {name} {self._help[name]}")
+            lines.append(f"# TYPE {name} gauge")
+            for key, read in list(family.items()):
+                base = f"{{{_labels(dict(key))}}}" if key else ""
+                try:
+                    lines.append(f"{name}{base} {_num(float(read()))}")
+                except Exception as e:
+                    logger.warning("Gauge %s failed: %s", name, e)
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+REGISTRY.describe("ict_fetch_seconds", "Data feed request time per ticker.")
+REGISTRY.describe("ict_engine_seconds", "ICTEngine sub-method time per call.")
+REGISTRY.describe("ict_stage_seconds", "Pipeline stage time (compute, serialize, diff, refresh).")
+REGISTRY.describe("ict_send_seconds", "WebSocket send time per message.")
+REGISTRY.describe("ict_delivery_seconds", "Time from queueing an update to finishing its send.")
+
+
+def timed(name: str, **labels):
+    """Decorator recording each call's duration into ``REGISTRY``."""
+    def wrap(fn):
+        hist = REGISTRY.histogram(name, **labels)
+
+        @functools.wraps(fn)
+        def inner(*args, **kwargs):
+            t0 = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                hist.observe(time.perf_counter() - t0)
+        return inner
+    return wrap
+
+
+# ── sampling profiler ────────────────────────────────────────────────
+class SamplingProfiler:
+    """Samples every thread's Python stack on a timer.
+
+    Stacks are aggregated in collapsed form (``outer;inner count``), which
+    flamegraph.pl and speedscope read directly. Sampling costs one
+    ``sys._current_frames()`` walk per interval and nothing in between.
+    """
+
+    def __init__(self, interval: float = PROFILE_INTERVAL):
+        self.interval = interval
+        self.samples = 0
+        self._stacks: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+        self._thread.start()
+        logger.info("Sampling profiler started (every %.0f ms)", self.interval * 1e3)
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self) -> None:
+        me = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for tid, frame in sys._current_frames().items():
+                if tid == me:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                self._stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {n}\n" for stack, n in self._stacks.most_common())
+
+    def dump(self, path: str | Path) -> Path:
+        path = Path(path).expanduser()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(self.collapsed())
+        logger.info("Profile with %d samples written to %s", self.samples, path)
+        return path
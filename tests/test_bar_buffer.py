@@ -0,0 +1,111 @@
+"""BarBuffer: the double-written ring against a plain list of rows."""
+
+import numpy as np
+import pytest
+
+from bar_buffer import BarBuffer, Bars
+
+CAP = 8
+
+
+def _bars(ts) -> Bars:
+    ts = np.asarray(ts, dtype=np.int64)
+    f = ts.astype(np.float64)
+    return Bars(ts, f + 0.1, f + 0.2, f + 0.3, f + 0.4, f + 0.5)
+
+
+def _rows(buf: BarBuffer) -> list[tuple]:
+    view = buf.view()
+    assert all(a.flags.c_contiguous for a in view), "view must be contiguous"
+    assert np.all(np.diff(view.ts) > 0), "view must be oldest first"
+    return list(zip(*(a.tolist() for a in view)))
+
+
+def _expected(ts) -> list[tuple]:
+    return list(zip(*(a.tolist() for a in _bars(ts))))
+
+
+def _filled(n: int, cap: int = CAP) -> BarBuffer:
+    buf = BarBuffer(cap)
+    for t in range(n):
+        buf.append(t, t + 0.1, t + 0.2, t + 0.3, t + 0.4, t + 0.5)
+    return buf
+
+
+@pytest.mark.parametrize("n", [0, 1, CAP - 1, CAP, CAP + 1, 2 * CAP + 3, 5 * CAP])
+def test_append_past_capacity(n):
+    buf = _filled(n)
+    assert len(buf) == min(n, CAP)
+    assert _rows(buf) == _expected(range(max(0, n - CAP), n))
+    assert buf.last_ts == (n - 1 if n else None)
+
+
+@pytest.mark.parametrize("n", [3, CAP + 3])
+def test_append_revises_newest_and_rejects_older(n):
+    buf = _filled(n)
+    assert buf.append(n - 1, 1, 2, 0, 1.5, 9)
+    assert buf.last() == (n - 1, 1.0, 2.0, 0.0, 1.5, 9.0)
+    assert not buf.append(n - 2, 1, 1, 1, 1)
+    assert len(buf) == min(n, CAP) and buf.last_ts == n - 1
+
+
+@pytest.mark.parametrize("held, new", [
+    (5, range(5, 9)),                       # fills to capacity exactly
+    (6, range(6, 11)),                      # wraps
+    (CAP + 5, range(CAP + 5, CAP + 8)),
+    (3, range(3, 3 + 3 * CAP)),             # longer than the ring: only the newest CAP stay
+    (CAP + 2, range(CAP - 1, CAP + 4)),     # overlaps the held rows: they are replaced
+])
+def test_extend(held, new):
+    buf = _filled(held)
+    buf.extend(_bars(new))
+    ts = [t for t in range(held) if t < new[0]] + list(new)
+    assert _rows(buf) == _expected(ts[-CAP:])
+
+
+def _held(n: int) -> list[int]:
+    return list(range(max(0, n - CAP), n))
+
+
+@pytest.mark.parametrize("n", [5, CAP, CAP + 3, 3 * CAP + 5])
+@pytest.mark.parametrize("offset", [-1, 0, 2, 4])
+def test_truncate_across_the_wrap(n, offset):
+    buf = _filled(n)
+    ts = _held(n)[0] + offset
+    buf.truncate(ts)
+    kept = [t for t in _held(n) if t < ts]
+    assert _rows(buf) == _expected(kept)
+    # the next rows are written where the dropped ones were
+    new = range(max(ts, 0), max(ts, 0) + 3)
+    buf.extend(_bars(new))
+    assert _rows(buf) == _expected((kept + list(new))[-CAP:])
+
+
+@pytest.mark.parametrize("n", [5, CAP + 3])
+def test_truncate_at_or_after_the_newest(n):
+    buf = _filled(n)
+    buf.truncate(n + 10)
+    assert _rows(buf) == _expected(_held(n))
+    buf.truncate(n - 1)
+    assert _rows(buf) == _expected(_held(n)[:-1])
+
+
+@pytest.mark.parametrize("n", [5, CAP, CAP + 3, 3 * CAP + 5])
+@pytest.mark.parametrize("ts", [-10, "first", "second", "last", "after"])
+def test_drop_before_boundaries(n, ts):
+    buf = _filled(n)
+    held = _held(n)
+    ts = {"first": held[0], "second": held[1], "last": held[-1], "after": n + 10}.get(ts, ts)
+    buf.drop_before(ts)
+    kept = [t for t in held if t >= ts]
+    assert len(buf) == len(kept)
+    assert _rows(buf) == _expected(kept)
+    buf.append(n, n + 0.1, n + 0.2, n + 0.3, n + 0.4, n + 0.5)
+    assert _rows(buf) == _expected((kept + [n])[-CAP:])
+
+
+def test_view_is_read_only():
+    view = _filled(CAP + 2).view()
+    for a in view:
+        with pytest.raises(ValueError):
+            a[0] = 0
@@ -0,0 +1,133 @@
+"""DataFeed incremental intraday fetch against an offline stub backend."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from bar_buffer import Bars
+from bar_cache import BarCache
+from config import INTRADAY_OVERLAP_MIN, INTRADAY_WINDOW_DAYS
+from data_feed import DataFeed
+
+TICKER = "NQ=F"
+
+
+class StubBackend:
+    """Serves ``bars[ticker]`` like Yahoo would and records every request."""
+
+    def __init__(self, bars: pd.DataFrame):
+        self.bars = {TICKER: bars}
+        self.calls: list[tuple[str, str | None, pd.Timestamp | None]] = []
+
+    def history(self, ticker, interval, period=None, start=None, prepost=False) -> pd.DataFrame:
+        self.calls.append((interval, period, start))
+        df = self.bars[ticker]
+        if start is not None:
+            df = df.loc[start:]
+        return df.copy()
+
+
+class StubBulkBackend(StubBackend):
+    def history_many(self, tickers, interval, period=None, start=None, prepost=False) -> dict[str, pd.DataFrame]:
+        return {t: self.history(t, interval, period, start, prepost) for t in tickers}
+
+
+def _minutes(start: pd.Timestamp, end: pd.Timestamp, freq: str = "1min", seed: int = 0) -> pd.DataFrame:
+    idx = pd.date_range(start.floor("min"), end.floor("min"), freq=freq, tz="UTC")
+    close = 20000 + np.random.default_rng(seed).normal(0, 2, len(idx)).cumsum()
+    return pd.DataFrame(
+        {"Open": close - 0.5, "High": close + 1, "Low": close - 1, "Close": close, "Volume": 10.0},
+        index=idx,
+    )
+
+
+def _assert_bars(got: Bars, df: pd.DataFrame) -> None:
+    want = Bars.from_frame(df)
+    assert len(got) == len(want)
+    for name, a, b in zip(Bars._fields, got, want):
+        np.testing.assert_array_equal(a, b, err_msg=name)
+
+
+def _feed(backend, cache=None) -> DataFeed:
+    return DataFeed(backend=backend, workers=1, cache=cache or BarCache(None), tickers=[TICKER])
+
+
+@pytest.fixture(params=[StubBackend, StubBulkBackend], ids=["ticker", "bulk"])
+def backend_cls(request):
+    return request.param
+
+
+def test_first_fetch_then_overlap_merge(backend_cls):
+    now = pd.Timestamp.now(tz="UTC")
+    src = _minutes(now - pd.Timedelta(hours=3), now - pd.Timedelta(minutes=10))
+    backend = backend_cls(src)
+    feed = _feed(backend)
+
+    _assert_bars(feed.fetch_intraday()[TICKER], src)
+    assert backend.calls == [("1m", "5d", None)]
+
+    # the refetch revises the last two bars, drops the one before and adds three
+    last = src.index[-1]
+    revised = src.drop(src.index[-3]).copy()
+    revised.loc[revised.index[-2:], "Close"] += 7.5
+    new = _minutes(last + pd.Timedelta(minutes=1), last + pd.Timedelta(minutes=3), seed=1)
+    backend.bars[TICKER] = pd.concat([revised, new])
+
+    _assert_bars(feed.fetch_intraday()[TICKER], backend.bars[TICKER])
+    _, period, start = backend.calls[-1]
+    assert period is None
+    assert pd.Timestamp(start) == last - pd.Timedelta(minutes=INTRADAY_OVERLAP_MIN)
+
+
+def test_empty_refetch_keeps_held_bars(backend_cls):
+    now = pd.Timestamp.now(tz="UTC")
+    src = _minutes(now - pd.Timedelta(hours=1), now - pd.Timedelta(minutes=30))
+    backend = backend_cls(src)
+    feed = _feed(backend)
+    feed.fetch_intraday()
+    backend.bars[TICKER] = src.iloc[:0]
+    _assert_bars(feed.fetch_intraday()[TICKER], src)
+
+
+def test_rolling_window_trim(backend_cls):
+    now = pd.Timestamp.now(tz="UTC")
+    window = pd.Timedelta(days=INTRADAY_WINDOW_DAYS)
+    src = _minutes(now - window - pd.Timedelta(days=1), now - pd.Timedelta(hours=1), freq="5min")
+    backend = backend_cls(src)
+    feed = _feed(backend)
+
+    _assert_bars(feed.fetch_intraday()[TICKER], src[src.index >= src.index[-1] - window])
+
+    last = src.index[-1]
+    backend.bars[TICKER] = pd.concat([src, _minutes(last + pd.Timedelta(minutes=5), last + pd.Timedelta(hours=2),
+                                                    freq="5min", seed=1)])
+    grown = backend.bars[TICKER]
+    _assert_bars(feed.fetch_intraday()[TICKER], grown[grown.index >= grown.index[-1] - window])
+
+
+def test_stale_buffer_falls_back_to_first_fetch(backend_cls):
+    now = pd.Timestamp.now(tz="UTC")
+    old = _minutes(now - pd.Timedelta(days=INTRADAY_WINDOW_DAYS + 2), now - pd.Timedelta(days=INTRADAY_WINDOW_DAYS + 1))
+    backend = backend_cls(old)
+    feed = _feed(backend)
+    feed.fetch_intraday()
+
+    current = _minutes(now - pd.Timedelta(hours=2), now - pd.Timedelta(minutes=1), seed=2)
+    backend.bars[TICKER] = current
+    _assert_bars(feed.fetch_intraday()[TICKER], current)
+    assert backend.calls[-1] == ("1m", "5d", None)
+
+
+def test_cached_bars_are_topped_up(tmp_path, backend_cls):
+    now = pd.Timestamp.now(tz="UTC")
+    src = _minutes(now - pd.Timedelta(hours=2), now - pd.Timedelta(minutes=20))
+    cache = BarCache(tmp_path)
+    feed = _feed(backend_cls(src), cache)
+    feed.fetch_intraday()
+    feed.save()
+
+    last = src.index[-1]
+    grown = pd.concat([src, _minutes(last + pd.Timedelta(minutes=1), last + pd.Timedelta(minutes=10), seed=3)])
+    backend = backend_cls(grown)
+    _assert_bars(_feed(backend, cache).fetch_intraday()[TICKER], grown)
+    assert backend.calls == [("1m", None, last - pd.Timedelta(minutes=INTRADAY_OVERLAP_MIN))]
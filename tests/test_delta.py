@@ -0,0 +1,123 @@
+"""Delta protocol: patches rebuild the next snapshot, and a version gap gets a full one."""
+
+import copy
+import math
+import random
+
+import pytest
+
+import delta
+from fanout import ClientConnection
+from serialization import loads
+from snapshot import SnapshotStore
+
+_SCALARS = [None, True, False, 0, 1, -2.5, 21034.25, float("nan"), "", "ACTIVE", "upcoming"]
+
+
+def _same(a, b) -> bool:
+    """Deep equality where NaN equals NaN."""
+    if isinstance(a, float) and isinstance(b, float) and math.isnan(a) and math.isnan(b):
+        return True
+    if type(a) is not type(b):
+        return False
+    if type(a) is dict:
+        return a.keys() == b.keys() and all(_same(a[k], b[k]) for k in a)
+    if type(a) is list:
+        return len(a) == len(b) and all(_same(x, y) for x, y in zip(a, b))
+    return a == b
+
+
+def _doc(rng: random.Random, depth: int = 0):
+    roll = rng.random()
+    if depth >= 3 or roll < 0.4:
+        return rng.choice(_SCALARS)
+    if roll < 0.7:
+        return [_doc(rng, depth + 1) for _ in range(rng.randint(0, 4))]
+    return {f"k{rng.randint(0, 6)}": _doc(rng, depth + 1) for _ in range(rng.randint(0, 5))}
+
+
+def _mutate(rng: random.Random, doc, depth: int = 0):
+    """A changed copy of *doc*: edited scalars, added and removed keys, resized lists."""
+    if type(doc) is dict:
+        kept = {k: v for k, v in doc.items() if rng.random() > 0.15}
+        out = {k: _mutate(rng, v, depth + 1) if rng.random() < 0.7 else v for k, v in kept.items()}
+        if rng.random() < 0.3:
+            out[f"n{rng.randint(0, 3)}"] = _doc(rng, depth + 1)
+        return out
+    if type(doc) is list:
+        out = [_mutate(rng, v, depth + 1) for v in doc]
+        if rng.random() < 0.25:
+            out.append(_doc(rng, depth + 1))
+        elif out and rng.random() < 0.25:
+            out.pop(rng.randrange(len(out)))
+        return out
+    return rng.choice(_SCALARS) if rng.random() < 0.4 else doc
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_patch_round_trip(seed):
+    rng = random.Random(seed)
+    a = {"tickers": _doc(rng), "meta": _doc(rng)}
+    b = a
+    for _ in range(3):      # a chain of snapshots, each patched onto the last
+        a, b = b, _mutate(rng, b)
+        a_before = copy.deepcopy(a)
+        got = delta.apply(copy.deepcopy(a), delta.diff(a, b))
+        assert _same(got, b), (a, b)
+        assert _same(a, a_before)       # diff leaves its inputs alone
+
+
+@pytest.mark.parametrize("a, b", [
+    ({"x": 1}, {}),                                       # removed key
+    ({"x": [1, 2]}, {"x": [1, 2, 3]}),                    # list grew
+    ({"x": [{"v": 1}, {"v": None}]}, {"x": [{"v": None}, {"v": 1.5}]}),
+    ({"x": float("nan")}, {"x": None}),
+    ({"x": None}, {"x": float("nan")}),
+    ({"x": 1}, {"x": 1.0}),                               # same value, new type
+    ([1], {"x": 1}),                                      # root replaced
+])
+def test_patch_edge_cases(a, b):
+    assert _same(delta.apply(copy.deepcopy(a), delta.diff(a, b)), b)
+
+
+def _metrics(i: int) -> dict:
+    return {
+        "tickers": {"NQ=F": {"price": 21000.0 + i, "levels": {"pdh": {"value": 21050.0 if i % 2 else None}}}},
+        "stale": False,
+        **({"note": "odd"} if i % 2 else {}),
+    }
+
+
+def _client_state(client: ClientConnection, snaps) -> None:
+    """Replay what *client* is sent for *snaps* the way static/app.js applies it."""
+    state, version = None, 0
+    for snap in snaps:
+        msg = loads(client.message(snap))
+        if msg["type"] == "snapshot":
+            state = msg["data"]
+        else:
+            assert msg["base"] == version
+            state = delta.apply(state, msg["ops"])
+        version = msg["version"]
+        assert state == snap.metrics
+
+
+def test_client_follows_patches():
+    store = SnapshotStore(compute=None)
+    snaps = [store.publish(_metrics(i)) for i in range(6)]
+    client = ClientConnection(None, delta=True)
+    kinds = [loads(client.message(s))["type"] for s in snaps[:2]]
+    assert kinds == ["snapshot", "patch"]
+    _client_state(ClientConnection(None, delta=True), snaps)
+
+
+def test_version_gap_forces_full_snapshot():
+    store = SnapshotStore(compute=None)
+    snaps = [store.publish(_metrics(i)) for i in range(4)]
+    client = ClientConnection(None, delta=True)
+    _client_state(client, snaps[:2])
+    # snaps[2] was dropped from the client's queue: a patch against 2 would not apply
+    msg = loads(client.message(snaps[3]))
+    assert msg["type"] == "snapshot" and msg["version"] == 4 and msg["data"] == snaps[3].metrics
+    assert client.message(snaps[3]) is None                 # already has it
+    assert loads(client.message(snaps[3], resync=True))["type"] == "snapshot"
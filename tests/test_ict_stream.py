@@ -0,0 +1,98 @@
+"""StreamingICTEngine against the batch ICTEngine on replayed and revised bars."""
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from bar_buffer import Bars
+from benchmarks.synthetic import intraday_bars, periodic_bars
+from ict_engine import ET, ICTEngine
+from ict_stream import _UNDO_BARS, StreamingICTEngine
+
+TICKER = "NQ=F"
+SECTIONS = ("liquidity", "key_opens", "po3")
+
+
+@pytest.fixture(scope="module")
+def frames():
+    df = intraday_bars(3)
+    return Bars.from_frame(df), {TICKER: periodic_bars(df, "1d")}, {TICKER: periodic_bars(df, "1w")}
+
+
+def _compute(engine, bars: Bars, daily, weekly) -> dict:
+    now = datetime.fromtimestamp(int(bars.ts[-1]) / 1e9, ET)
+    data = {"intraday": {TICKER: bars}, "daily": daily, "weekly": weekly}
+    return engine.compute(data, now, sections=SECTIONS)["tickers"][TICKER]
+
+
+def _head(bars: Bars, end: int) -> Bars:
+    return Bars(*(a[:end] for a in bars))
+
+
+def _at(bars: Bars, hour: int, minute: int) -> int:
+    """Position of the last day's bar at *hour*:*minute* ET."""
+    idx = pd.to_datetime(bars.ts, utc=True).tz_convert(ET)
+    return int(np.flatnonzero((idx.hour == hour) & (idx.minute == minute))[-1])
+
+
+def test_replayed_day_matches_batch(frames):
+    bars, daily, weekly = frames
+    batch, stream = ICTEngine([TICKER]), StreamingICTEngine([TICKER])
+    for end in range(_at(bars, 18, 0), len(bars) + 1):     # the last session, bar by bar
+        head = _head(bars, end)
+        assert _compute(stream, head, daily, weekly) == _compute(batch, head, daily, weekly), end
+
+
+def _revised(bars: Bars, end: int, back: int, kind: str) -> Bars:
+    """The first *end* bars with the one *back* bars before the newest revised, dropped or re-inserted."""
+    cols = [a[:end].copy() for a in bars]
+    i = end - 1 - back
+    if kind == "revise":
+        cols[2][i] += 400.0     # high
+        cols[4][i] += 390.0     # close
+    elif kind == "drop":
+        cols = [np.delete(a, i) for a in cols]
+    return Bars(*cols)
+
+
+@pytest.mark.parametrize("back", range(_UNDO_BARS))
+@pytest.mark.parametrize("kind", ["revise", "drop"])
+def test_revised_overlap_bar(frames, back, kind):
+    bars, daily, weekly = frames
+    end = _at(bars, 10, 15)
+    stream = StreamingICTEngine([TICKER])
+    _compute(stream, _head(bars, end), daily, weekly)
+
+    revised = _revised(bars, end, back, kind)
+    expected = _compute(ICTEngine([TICKER]), revised, daily, weekly)
+    assert _compute(stream, revised, daily, weekly) == expected
+    if kind == "revise" and back:
+        assert expected != _compute(ICTEngine([TICKER]), _head(bars, end), daily, weekly)
+
+    # a gap refilled, and then a new bar, fold in the same way
+    for later in (_head(bars, end), _head(bars, end + 1)):
+        assert _compute(stream, later, daily, weekly) == _compute(ICTEngine([TICKER]), later, daily, weekly)
+
+
+def test_update_bar_revises_recent_bar(frames):
+    bars, _, _ = frames
+    end = _at(bars, 10, 15)
+    idx = pd.to_datetime(bars.ts[:end], utc=True).tz_convert(ET)
+    rows = list(zip(idx, *(a[:end].tolist() for a in bars[1:5])))
+
+    by_frame, by_bar = StreamingICTEngine([TICKER]), StreamingICTEngine([TICKER])
+    for row in rows:
+        by_bar.update_bar(TICKER, *row)
+    ts, o, h, l, c = rows[-3]
+    by_bar.update_bar(TICKER, ts, o, h + 400.0, l, c + 390.0)
+    for _ in by_frame.iter_bars(TICKER, _revised(bars, end, 2, "revise")):
+        pass
+
+    now = idx[-1].to_pydatetime()
+    assert by_bar.liquidity(TICKER, {}, now) == by_frame.liquidity(TICKER, {}, now)
+    assert by_bar.key_opens(TICKER, None, now) == by_frame.key_opens(TICKER, None, now)
+    assert by_bar.power_of_3(TICKER, now) == by_frame.power_of_3(TICKER, now)
+    with pytest.raises(ValueError):
+        by_bar.update_bar(TICKER, rows[-1 - _UNDO_BARS][0], o, h, l, c)
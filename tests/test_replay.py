@@ -0,0 +1,28 @@
+"""Replay CLI: ``--bars TICKER=PATH`` with CME tickers that contain ``=``."""
+
+import sys
+
+import pandas as pd
+import pytest
+
+import replay
+from benchmarks.synthetic import intraday_bars
+
+
+@pytest.mark.parametrize("spec, expected", [
+    ("NQ=F=nq_1m.parquet", ("NQ=F", "nq_1m.parquet")),
+    ("ES=F=/tmp/es.csv", ("ES=F", "/tmp/es.csv")),
+    ("SPY=spy.csv", ("SPY", "spy.csv")),
+])
+def test_parse_bars_spec(spec, expected):
+    assert replay.parse_bars_spec(spec) == expected
+
+
+def test_main_reads_bars_for_equals_ticker(tmp_path, monkeypatch):
+    src = tmp_path / "nq.csv"
+    intraday_bars(2, seed=0).to_csv(src)
+    out = tmp_path / "signals.csv"
+    monkeypatch.setattr(sys, "argv", ["replay", "--bars", f"NQ=F={src}", "--out", str(out)])
+    replay.main()
+    df = pd.read_csv(out)
+    assert len(df) and set(df["ticker"]) == {"NQ=F"}
@@ -0,0 +1,35 @@
+"""Every installed JSON encoder gives the same bytes, non-finite floats included."""
+
+import math
+
+import pytest
+
+from serialization import ENCODERS, envelope, loads
+
+PAYLOAD = {
+    "tickers": {"NQ=F": {"price": 21034.25, "change": float("nan"), "levels": [1.5, float("inf"), -float("inf")]}},
+    "label": "9:50–10:10",
+    "ote": ({"fib": 0.705, "price": None},),
+    "stale": False,
+}
+
+
+@pytest.mark.parametrize("name", sorted(ENCODERS["json"]))
+def test_json_encoders_agree(name):
+    got = ENCODERS["json"][name](PAYLOAD)
+    assert got == ENCODERS["json"]["json"](PAYLOAD)
+    doc = loads(got)
+    assert doc["tickers"]["NQ=F"]["change"] is None
+    assert doc["tickers"]["NQ=F"]["levels"] == [1.5, None, None]
+    assert doc["label"] == "9:50–10:10"
+
+
+def test_finite_payload_is_untouched():
+    doc = {"a": [0.1, 2, -3.5e-7], "b": {"c": math.pi}}
+    assert loads(ENCODERS["json"]["json"](doc)) == doc
+
+
+def test_envelope_embeds_encoded_body():
+    body = ENCODERS["json"]["json"](PAYLOAD)
+    msg = loads(envelope({"type": "snapshot", "version": 3}, "data", body))
+    assert msg["version"] == 3 and msg["data"] == loads(body)
@@ -0,0 +1,160 @@
+"""SessionCalendar: CME holiday and early-close fixtures, and boundaries against ET.localize."""
+
+from datetime import date, datetime, time, timedelta
+
+import pandas as pd
+import pytest
+
+from config import KEY_OPENS, KILL_ZONES, MACRO_TIMES
+from session_calendar import CALENDAR, ET, cme_schedule
+
+
+def _dates(*ymd: str) -> set[date]:
+    return {date.fromisoformat(d) for d in ymd}
+
+
+# (closed, 13:00 holiday halt, 13:15 early close) — from the CME holiday calendars
+SCHEDULES = {
+    2022: (
+        _dates("2022-04-15", "2022-12-26"),
+        _dates("2022-01-17", "2022-02-21", "2022-05-30", "2022-06-20", "2022-07-04", "2022-09-05", "2022-11-24"),
+        _dates("2022-11-25"),
+    ),
+    2023: (
+        _dates("2023-01-02", "2023-04-07", "2023-12-25"),
+        _dates("2023-01-16", "2023-02-20", "2023-05-29", "2023-06-19", "2023-07-04", "2023-09-04", "2023-11-23"),
+        _dates("2023-11-24"),
+    ),
+    2024: (
+        _dates("2024-01-01", "2024-03-29", "2024-12-25"),
+        _dates("2024-01-15", "2024-02-19", "2024-05-27", "2024-06-19", "2024-07-04", "2024-09-02", "2024-11-28"),
+        _dates("2024-11-29", "2024-12-24"),
+    ),
+    2025: (
+        _dates("2025-01-01", "2025-04-18", "2025-12-25"),
+        _dates("2025-01-20", "2025-02-17", "2025-05-26", "2025-06-19", "2025-07-04", "2025-09-01", "2025-11-27"),
+        _dates("2025-11-28", "2025-12-24"),
+    ),
+    2026: (
+        _dates("2026-01-01", "2026-04-03", "2026-12-25"),
+        _dates("2026-01-19", "2026-02-16", "2026-05-25", "2026-06-19", "2026-07-03", "2026-09-07", "2026-11-26"),
+        _dates("2026-11-27", "2026-12-24"),
+    ),
+}
+
+
+def _ns(d: date, hm: tuple[int, int]) -> int:
+    return pd.Timestamp(ET.localize(datetime.combine(d, time(*hm)))).value
+
+
+@pytest.mark.parametrize("year", sorted(SCHEDULES))
+def test_cme_schedule(year):
+    closed, halted, early = cme_schedule(year)
+    # a Saturday New Year is observed on the Friday before, in the previous year
+    assert ({d for d in closed if d.year == year}, halted, early) == SCHEDULES[year]
+
+
+@pytest.mark.parametrize("year", sorted(SCHEDULES))
+def test_trade_dates_and_closes(year):
+    closed, halted, early = SCHEDULES[year]
+    d = date(year, 1, 1)
+    while d.year == year:
+        day = CALENDAR.day(d)
+        assert day.trading == (d.weekday() < 5 and d not in closed | halted), d
+        assert day.early_close == (d in early), d
+        close = (13, 0) if d in halted else (13, 15) if d in early else (17, 0)
+        assert day.close == _ns(d, close), d
+        d += timedelta(days=1)
+
+
+def test_saturday_new_year_leaves_friday_open():
+    assert CALENDAR.day(date(2021, 12, 31)).trading
+    assert CALENDAR.day(date(2022, 1, 3)).trading
+
+
+@pytest.mark.parametrize("when, trade_date", [
+    ("2024-01-12 16:59", "2024-01-12"),
+    ("2024-01-14 18:00", "2024-01-16"),     # Sunday evening before MLK Day counts toward Tuesday
+    ("2024-01-15 12:59", "2024-01-16"),
+    ("2024-01-15 18:00", "2024-01-16"),
+    ("2024-11-29 13:14", "2024-11-29"),
+    ("2024-11-29 13:15", "2024-12-02"),     # after the early close
+    ("2024-12-24 18:00", "2024-12-26"),
+    ("2024-03-28 18:00", "2024-04-01"),     # Good Friday closure
+])
+def test_trade_date_at(when, trade_date):
+    ts = pd.Timestamp(when, tz=ET).value
+    assert CALENDAR.trade_date_at(ts) == date.fromisoformat(trade_date)
+
+
+def test_trading_day_navigation():
+    assert CALENDAR.previous_trading_day(date(2024, 1, 16)) == date(2024, 1, 12)
+    assert CALENDAR.previous_trading_day(date(2024, 4, 1)) == date(2024, 3, 28)
+    assert CALENDAR.trading_days(date(2024, 12, 23), date(2024, 12, 31)) == [
+        date(2024, 12, d) for d in (23, 24, 26, 27, 30, 31)
+    ]
+
+
+@pytest.mark.parametrize("d", [date(2024, 3, 10), date(2024, 3, 11), date(2024, 11, 3), date(2024, 11, 4)])
+def test_day_at_midnight(d):
+    assert CALENDAR.day_at(_ns(d, (0, 0))).date == d
+    assert CALENDAR.day_at(_ns(d, (0, 0)) - 1).date == d - timedelta(days=1)
+
+
+@pytest.mark.parametrize("year", [2024, 2025])
+def test_boundaries_match_localize(year):
+    """Every boundary of every date, DST switch days included."""
+    d = date(year, 1, 1)
+    while d.year == year:
+        day = CALENDAR.day(d)
+        eve = d - timedelta(days=1)
+        assert day.midnight == _ns(d, (0, 0))
+        assert day.globex_open == _ns(d, (18, 0))
+        assert day.asia == (_ns(eve, (19, 0)), _ns(d, (0, 0)))
+        assert day.london == (_ns(d, (2, 0)), _ns(d, (5, 0)))
+        assert day.ny_open == _ns(d, (9, 30))
+        assert day.accum_end == _ns(d, (10, 0))
+        for kz in KILL_ZONES:
+            start = eve if kz.get("crosses_midnight") else d
+            assert day.kill_zones[kz["name"]] == (_ns(start, kz["start"]), _ns(d, kz["end"])), (d, kz["name"])
+        for m in MACRO_TIMES:
+            assert day.macros[m["label"]] == (_ns(d, m["start"]), _ns(d, m["end"]))
+        for ko in KEY_OPENS:
+            assert day.opens[(ko["hour"], ko["minute"])] == _ns(d, (ko["hour"], ko["minute"]))
+        d += timedelta(days=1)
+
+
+def utc(ns: int) -> str:
+    return pd.Timestamp(ns, tz="UTC").strftime("%H:%M")
+
+
+def test_dst_offsets():
+    assert utc(CALENDAR.day(date(2024, 3, 8)).ny_open) == "14:30"     # EST
+    assert utc(CALENDAR.day(date(2024, 3, 11)).ny_open) == "13:30"    # EDT
+    assert utc(CALENDAR.day(date(2024, 3, 10)).globex_open) == "22:00"
+    assert utc(CALENDAR.day(date(2024, 11, 3)).globex_open) == "23:00"
+    assert utc(CALENDAR.day(date(2024, 11, 4)).asia[0]) == "00:00"    # 19:00 EST on Sunday
+
+
+@pytest.mark.parametrize("when, active", [
+    ("2025-04-17 10:00", {"NY AM", "9:50–10:10"}),
+    ("2025-04-18 10:00", set()),                        # Good Friday closure
+    ("2025-12-25 10:00", set()),                        # Christmas
+    ("2025-12-24 13:05", {"NY PM"}),                    # early close at 13:15 ...
+    ("2025-12-24 13:55", set()),                        # ... ends NY PM and the 1:50 macro
+    ("2025-11-27 09:55", set()),                        # Thanksgiving halt: not a trade date
+    ("2025-04-17 20:00", set()),                        # no Asia session into Good Friday
+    ("2025-04-20 20:00", {"Asia"}),                     # Sunday evening into Monday
+    ("2025-03-07 20:00", set()),                        # Friday evening
+])
+def test_kill_zones_and_macros_follow_calendar(when, active):
+    from ict_engine import ICTEngine
+    from replay import kill_zone_labels
+
+    engine = ICTEngine()
+    now = ET.localize(datetime.fromisoformat(when))
+    shown = {kz["name"] for kz in engine._kill_zones(now) if kz["active"]}
+    shown |= {m["label"] for m in engine._macros(now) if m["active"]}
+    assert shown == active
+    label = kill_zone_labels(pd.Series([pd.Timestamp(now)]))[0]
+    assert label == next((n for n in ("Asia", "London", "NY AM", "NY Lunch", "NY PM") if n in active), "")
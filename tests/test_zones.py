@@ -0,0 +1,72 @@
+"""ZoneTracker against a brute-force per-bar scan of the same higher-timeframe bars."""
+
+import numpy as np
+import pytest
+
+from bar_buffer import BarBuffer, Bars
+from benchmarks.synthetic import intraday_bars
+from config import PROXIMITY_PCT, ZONE_TIMEFRAMES
+from timeframes import TimeframeBars
+from zones import _OB_LOOKBACK, Zone, ZoneTracker
+
+
+def brute_force(bars: Bars, tf: str) -> set[Zone]:
+    """Every zone confirmed by a closed bar and not traded through by any later bar, one bar at a time."""
+    ts, o, h, l, c = bars.ts, bars.open, bars.high, bars.low, bars.close
+    out, obs = set(), set()
+    for i in range(2, len(bars) - 1):       # the last bar is still forming
+        found = []
+        if l[i] > h[i - 2]:
+            found.append(Zone("fvg", "bullish", tf, float(h[i - 2]), float(l[i]), int(ts[i - 1]), int(ts[i])))
+        if h[i] < l[i - 2]:
+            found.append(Zone("fvg", "bearish", tf, float(h[i]), float(l[i - 2]), int(ts[i - 1]), int(ts[i])))
+        for fvg in list(found):
+            for j in range(i - 2, max(-1, i - 3 - _OB_LOOKBACK), -1):
+                if (c[j] < o[j]) if fvg.direction == "bullish" else (c[j] > o[j]):
+                    if (fvg.direction, j) not in obs:
+                        obs.add((fvg.direction, j))
+                        found.append(Zone("ob", fvg.direction, tf, float(l[j]), float(h[j]), int(ts[j]), int(ts[i])))
+                    break
+        for z in found:
+            if z.direction == "bullish" and (l[i + 1:] < z.bottom).any():
+                continue
+            if z.direction == "bearish" and (h[i + 1:] > z.top).any():
+                continue
+            out.add(z)
+    return out
+
+
+@pytest.mark.parametrize("seed", [3, 7])
+def test_tracker_matches_brute_force(seed):
+    bars = Bars.from_frame(intraday_bars(5, seed=seed))
+    days = 2      # shorter than the feed, so bars and zones leave the window
+    buf, everything = BarBuffer(days * 1440), BarBuffer(len(bars))
+    tf_bars, all_tf_bars = TimeframeBars(days=days), TimeframeBars(days=5)
+    trackers = {tf: ZoneTracker(tf) for tf in ZONE_TIMEFRAMES}
+    rng = np.random.default_rng(seed)
+    i = checks = 0
+    while i < len(bars):
+        j = min(len(bars), i + int(rng.integers(1, 40)))
+        # like a refetch: re-send a few bars before the new ones, with the last one revised
+        k = max(0, i - int(rng.integers(0, 4)))
+        chunk = [a[k:j].copy() for a in bars]
+        if i and k < i:
+            chunk[2][i - k - 1] += 0.25
+        buf.extend(Bars(*chunk))
+        everything.extend(Bars(*chunk))
+        i = j
+        buf.drop_before(buf.last_ts - days * 1440 * 60 * 10**9)
+        tf_bars.update(buf.view())
+        all_tf_bars.update(everything.view())
+        for tf, tracker in trackers.items():
+            tracker.update(tf_bars[tf])
+            # zones found before their first candles left the window stay until their origin does
+            head = int(tf_bars[tf].ts[0])
+            expected = {z for z in brute_force(all_tf_bars[tf], tf) if z.origin >= head}
+            assert set(tracker.zones) == expected, (tf, i)
+            price = float(buf.view().close[-1])
+            tol = abs(price) * PROXIMITY_PCT
+            near = {z for z in expected if z.bottom <= price + tol and z.top >= price - tol}
+            assert set(tracker.near(price)) == near, (tf, i)
+            checks += 1
+    assert checks > 300 and any(len(t) for t in trackers.values())
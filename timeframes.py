@@ -0,0 +1,113 @@
+"""Higher-timeframe bars maintained incrementally from 1-min bars.
+
+``TimeframeBars`` keeps one ``BarBuffer`` per entry in ``TIMEFRAMES``.
+Buckets are counted from the 18:00 ET futures open, so 4h bars start at
+18:00, 22:00, 02:00, … across DST changes. An ``update`` re-aggregates only
+the forming bucket of each timeframe plus the bars that arrived since — the
+last ``INTRADAY_OVERLAP_MIN`` minutes are re-read so revised 1-min bars are
+picked up — rather than resampling the whole window.
+"""
+
+import numpy as np
+
+from bar_buffer import EMPTY, BarBuffer, Bars
+from config import INTRADAY_OVERLAP_MIN, INTRADAY_WINDOW_DAYS, TIMEFRAMES
+from session_calendar import CALENDAR
+
+_MINUTE_NS = 60 * 10**9
+
+
+def bucket_starts(ts: np.ndarray, minutes: int, anchor: np.ndarray | None = None) -> np.ndarray:
+    """Start of the *minutes*-wide bucket holding each epoch-ns timestamp.
+
+    *anchor* is ``CALENDAR.session_open(ts)`` when the caller already has it.
+    """
+    if anchor is None:
+        anchor = CALENDAR.session_open(ts)
+    width = minutes * _MINUTE_NS
+    return anchor + (ts - anchor) // width * width
+
+
+def aggregate(bars: Bars, minutes: int, anchor: np.ndarray | None = None) -> Bars:
+    """Roll 1-min *bars* up into *minutes* buckets.
+
+    Matches ``resample(...).agg(first/max/min/last/sum).dropna()``: NaN
+    values are skipped and buckets with an all-NaN OHLC column are dropped.
+    """
+    if bars.empty:
+        return EMPTY
+    starts = bucket_starts(bars.ts, minutes, anchor)
+    first = np.flatnonzero(np.r_[True, starts[1:] != starts[:-1]])
+    return rollup(bars, first, starts[first])
+
+
+def rollup(bars: Bars, first: np.ndarray, ts: np.ndarray | None = None) -> Bars:
+    """One bar per run of *bars* starting at each position in *first*.
+
+    Each bar is stamped with *ts* (default: its first row's timestamp). NaN
+    handling is as in ``aggregate``.
+    """
+    if ts is None:
+        ts = bars.ts[first]
+    pos = np.arange(len(bars))
+    n = len(bars)
+
+    o_pos = np.minimum.reduceat(np.where(np.isnan(bars.open), n, pos), first)
+    c_pos = np.maximum.reduceat(np.where(np.isnan(bars.close), -1, pos), first)
+    o = np.where(o_pos < n, bars.open[np.minimum(o_pos, n - 1)], np.nan)
+    c = np.where(c_pos >= 0, bars.close[c_pos], np.nan)
+    h = np.fmax.reduceat(bars.high, first)
+    l = np.fmin.reduceat(bars.low, first)
+    v = np.add.reduceat(np.nan_to_num(bars.volume), first)
+
+    keep = ~(np.isnan(o) | np.isnan(h) | np.isnan(l) | np.isnan(c))
+    return Bars(ts[keep], o[keep], h[keep], l[keep], c[keep], v[keep])
+
+
+class TimeframeBars:
+    """Rolling higher-timeframe bars for one symbol, kept in step with its 1-min bars.
+
+    The newest bar of each timeframe is the forming one and is revised on
+    every update until its bucket closes.
+    """
+
+    def __init__(self, timeframes: dict[str, int] = TIMEFRAMES, days: int = INTRADAY_WINDOW_DAYS):
+        self.timeframes = dict(timeframes)
+        self._buffers = {tf: BarBuffer(days * 1440 // m + 1) for tf, m in self.timeframes.items()}
+        self._last_ts: int | None = None    # newest 1-min bar folded in
+
+    def __getitem__(self, tf: str) -> Bars:
+        return self._buffers[tf].view()
+
+    def update(self, bars: Bars) -> None:
+        """Fold in the new and recently revised rows of the 1-min *bars*.
+
+        If *bars* no longer contain the last bar seen (a different or
+        rewound series) every timeframe is rebuilt from scratch.
+        """
+        ts = bars.ts
+        since = None
+        if self._last_ts is not None and len(ts):
+            pos = int(ts.searchsorted(self._last_ts))
+            if pos < len(ts) and ts[pos] == self._last_ts:
+                since = self._last_ts - INTRADAY_OVERLAP_MIN * _MINUTE_NS
+
+        # the slice to re-aggregate starts at the widest timeframe's forming bucket
+        minutes = np.array(list(self.timeframes.values()))
+        if since is None:
+            rebuild = np.full(len(minutes), np.iinfo(np.int64).min)
+        else:
+            rebuild = bucket_starts(np.full(len(minutes), since), minutes)
+        lo = int(ts.searchsorted(rebuild.min()))
+        new = Bars(*(a[lo:] for a in bars))
+        anchor = CALENDAR.session_open(new.ts)
+        head = CALENDAR.session_open(ts[:1])
+
+        for (tf, m), b0 in zip(self.timeframes.items(), rebuild.tolist()):
+            buf = self._buffers[tf]
+            buf.truncate(b0)
+            i = int(new.ts.searchsorted(b0))
+            buf.extend(aggregate(Bars(*(a[i:] for a in new)), m, anchor[i:]))
+            if len(ts):
+                buf.drop_before(int(bucket_starts(ts[:1], m, head)[0]))
+        self._last_ts = int(ts[-1]) if len(ts) else None
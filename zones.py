@@ -0,0 +1,246 @@
+"""Fair Value Gaps and order blocks, with an index of the zones still unmitigated.
+
+Detection runs on closed higher-timeframe bars with vectorized three-candle
+comparisons:
+
+* bullish FVG at bar *i*: ``low[i] > high[i-2]``, zone ``[high[i-2], low[i]]``
+* bearish FVG at bar *i*: ``high[i] < low[i-2]``, zone ``[high[i], low[i-2]]``
+* order block: the last opposite-colour candle at most ``_OB_LOOKBACK`` bars
+  before the FVG's displacement candle; its full range is the zone.
+
+A bullish zone is mitigated once a later bar trades below its bottom, a
+bearish one once a later bar trades above its top. Active zones are kept in
+lists sorted by that edge, so a new bar's mitigations are one bisect plus
+the zones it removes, and "zones near price" is a bisect bounded by the
+tallest active zone.
+"""
+
+import heapq
+from bisect import bisect_left, bisect_right
+from typing import NamedTuple
+
+import numpy as np
+
+from bar_buffer import Bars
+from config import PROXIMITY_PCT, ZONE_LIMIT, ZONE_TIMEFRAMES
+from schema import ZoneLevel, Zones
+from timeframes import TimeframeBars
+
+_OB_LOOKBACK = 3
+
+
+class Zone(NamedTuple):
+    kind: str           # "fvg" or "ob"
+    direction: str      # "bullish" or "bearish"
+    timeframe: str
+    bottom: float
+    top: float
+    origin: int         # epoch ns of the candle that defines the zone
+    formed: int         # epoch ns of the bar that confirmed it
+
+    def payload(self, price: float | None, near: bool) -> ZoneLevel:
+        return {
+            "kind": self.kind,
+            "direction": self.direction,
+            "timeframe": self.timeframe,
+            "top": round(self.top, 2),
+            "bottom": round(self.bottom, 2),
+            "inside": price is not None and self.bottom <= price <= self.top,
+            "near": near,
+        }
+
+
+def detect(bars: Bars, timeframe: str, start: int = 0) -> tuple[np.ndarray, list[Zone]]:
+    """FVGs and order blocks confirmed at bars ``start`` onwards.
+
+    Returns the confirming bar index of each zone alongside the zones.
+    """
+    n = len(bars)
+    i = np.arange(max(start, 2), n)
+    if not len(i):
+        return np.empty(0, dtype=np.int64), []
+    ts, o, h, l, c = bars.ts, bars.open, bars.high, bars.low, bars.close
+    pos = np.arange(n)
+    last_down = np.maximum.accumulate(np.where(c < o, pos, -1))
+    last_up = np.maximum.accumulate(np.where(c > o, pos, -1))
+
+    found: list[tuple[int, Zone]] = []
+    for direction, gap, last_opp in (
+        ("bullish", l[i] > h[i - 2], last_down),
+        ("bearish", h[i] < l[i - 2], last_up),
+    ):
+        at = i[gap]
+        if direction == "bullish":
+            bottoms, tops = h[at - 2], l[at]
+        else:
+            bottoms, tops = h[at], l[at - 2]
+        for k, b, t in zip(at.tolist(), bottoms.tolist(), tops.tolist()):
+            found.append((k, Zone("fvg", direction, timeframe, b, t, int(ts[k - 1]), int(ts[k]))))
+
+        ob = last_opp[at - 2]
+        ok = (ob >= 0) & (ob >= at - 2 - _OB_LOOKBACK)
+        seen = set()
+        for k, j in zip(at[ok].tolist(), ob[ok].tolist()):
+            if j not in seen:
+                seen.add(j)
+                found.append((k, Zone("ob", direction, timeframe, float(l[j]), float(h[j]), int(ts[j]), int(ts[k]))))
+
+    found.sort(key=lambda x: (x[0], x[1].kind))
+    return np.array([k for k, _ in found], dtype=np.int64), [z for _, z in found]
+
+
+class ZoneTracker:
+    """Active FVGs and order blocks on one timeframe of one symbol.
+
+    The newest bar of each update is treated as forming: it can mitigate
+    zones but does not confirm new ones until a later bar arrives.
+    """
+
+    def __init__(self, timeframe: str):
+        self.timeframe = timeframe
+        self.clear()
+
+    def clear(self) -> None:
+        self._bull_keys: list[float] = []   # bottoms, ascending
+        self._bull: list[Zone] = []
+        self._bear_keys: list[float] = []   # tops, ascending
+        self._bear: list[Zone] = []
+        self._obs: set[tuple[str, int]] = set()   # (direction, origin) of OBs already found
+        self._max_height = 0.0              # upper bound on active zone height
+        self._last_ts: int | None = None    # forming bar at the previous update
+        self._head: int | None = None
+
+    def __len__(self) -> int:
+        return len(self._bull) + len(self._bear)
+
+    @property
+    def zones(self) -> list[Zone]:
+        return self._bull + self._bear
+
+    def update(self, bars: Bars) -> None:
+        """Mitigate and confirm zones with the bars added since the previous update."""
+        if bars.empty:
+            self.clear()
+            return
+        ts = bars.ts
+        pos = 0
+        if self._last_ts is not None:
+            pos = int(ts.searchsorted(self._last_ts))
+            if pos == len(ts) or ts[pos] != self._last_ts:
+                self.clear()
+                pos = 0
+        if self._last_ts is not None:
+            self.mitigate(_min(bars.low[pos:]), _max(bars.high[pos:]))
+
+        closed = len(ts) - 1
+        lo = max(0, pos - 2 - _OB_LOOKBACK)
+        window = Bars(*(a[lo:closed] for a in bars))
+        at, found = detect(window, self.timeframe, pos - lo)
+        if found:
+            # each new zone is checked against the bars after the one that confirmed it
+            after_lo = np.fmin.accumulate(bars.low[lo:][::-1])[::-1]
+            after_hi = np.fmax.accumulate(bars.high[lo:][::-1])[::-1]
+            for k, z in zip(at.tolist(), found):
+                if z.kind == "ob":
+                    if (z.direction, z.origin) in self._obs:
+                        continue
+                    self._obs.add((z.direction, z.origin))
+                if z.direction == "bullish" and not after_lo[k + 1] < z.bottom:
+                    self._insert(z)
+                elif z.direction == "bearish" and not after_hi[k + 1] > z.top:
+                    self._insert(z)
+
+        self._last_ts = int(ts[-1])
+        if self._head != int(ts[0]):
+            self._head = int(ts[0])
+            self._expire(self._head)
+
+    def _insert(self, z: Zone) -> None:
+        if z.direction == "bullish":
+            i = bisect_right(self._bull_keys, z.bottom)
+            self._bull_keys.insert(i, z.bottom)
+            self._bull.insert(i, z)
+        else:
+            i = bisect_right(self._bear_keys, z.top)
+            self._bear_keys.insert(i, z.top)
+            self._bear.insert(i, z)
+        self._max_height = max(self._max_height, z.top - z.bottom)
+
+    def mitigate(self, low: float, high: float) -> list[Zone]:
+        """Drop the zones a bar (or run of bars) spanning *low*..*high* traded through."""
+        out = []
+        i = bisect_right(self._bull_keys, low)
+        if i < len(self._bull):
+            out += self._bull[i:]
+            del self._bull[i:], self._bull_keys[i:]
+        j = bisect_left(self._bear_keys, high)
+        if j:
+            out += self._bear[:j]
+            del self._bear[:j], self._bear_keys[:j]
+        return out
+
+    def _expire(self, before: int) -> None:
+        """Forget zones defined by candles that have left the bar window."""
+        keep = [k for k, z in enumerate(self._bull) if z.origin >= before]
+        if len(keep) < len(self._bull):
+            self._bull = [self._bull[k] for k in keep]
+            self._bull_keys = [self._bull_keys[k] for k in keep]
+        keep = [k for k, z in enumerate(self._bear) if z.origin >= before]
+        if len(keep) < len(self._bear):
+            self._bear = [self._bear[k] for k in keep]
+            self._bear_keys = [self._bear_keys[k] for k in keep]
+        self._obs = {key for key in self._obs if key[1] >= before}
+
+    def near(self, price: float, pct: float = PROXIMITY_PCT) -> list[Zone]:
+        """Active zones within *pct* of *price* (or containing it)."""
+        tol = abs(price) * pct
+        lo, hi = price - tol, price + tol
+        out = []
+        # bullish zones sorted by bottom: candidates have bottom in [lo - tallest, hi]
+        i = bisect_left(self._bull_keys, lo - self._max_height)
+        j = bisect_right(self._bull_keys, hi)
+        out += [z for z in self._bull[i:j] if z.top >= lo]
+        # bearish zones sorted by top: candidates have top in [lo, hi + tallest]
+        i = bisect_left(self._bear_keys, lo)
+        j = bisect_right(self._bear_keys, hi + self._max_height)
+        out += [z for z in self._bear[i:j] if z.bottom <= hi]
+        return out
+
+
+def _min(a: np.ndarray) -> float:
+    return float(np.fmin.reduce(a))
+
+
+def _max(a: np.ndarray) -> float:
+    return float(np.fmax.reduce(a))
+
+
+class ZoneBook:
+    """``ZoneTracker`` per timeframe in ``ZONE_TIMEFRAMES`` for one symbol."""
+
+    def __init__(self, timeframes=ZONE_TIMEFRAMES):
+        self.trackers = {tf: ZoneTracker(tf) for tf in timeframes}
+
+    def update(self, tf_bars: TimeframeBars) -> None:
+        for tf, tracker in self.trackers.items():
+            tracker.update(tf_bars[tf])
+
+    def payload(self, price: float | None, limit: int = ZONE_LIMIT) -> Zones:
+        """Zones near *price* first, then the most recently formed, up to *limit*."""
+        near = [] if price is None else [z for t in self.trackers.values() for z in t.near(price)]
+        near.sort(key=lambda z: 0.0 if z.bottom <= price <= z.top else min(abs(price - z.bottom), abs(price - z.top)))
+        flagged = set(near)
+        recent = heapq.nlargest(
+            limit, (z for t in self.trackers.values() for z in t.zones if z not in flagged), key=lambda z: z.formed
+        )
+        listed = near[:limit] + recent[: max(0, limit - len(near))]
+        return {
+            "active": {
+                tf: {
+                    "fvg": sum(z.kind == "fvg" for z in t.zones),
+                    "ob": sum(z.kind == "ob" for z in t.zones),
+                }
+                for tf, t in self.trackers.items()
+            },
+            "zones": [z.payload(price, z in flagged) for z in listed],
+        }